@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Oyun sunucusunun asyncio sürümü (python-socketio AsyncServer + aiohttp).
+
+Oyun kuralları ve durumu server.py ile aynı `QuizGame` nesnesindedir (bkz.
+quiz_game.py); bu dosya yalnızca onun istediği gönderimleri ve zamanlayıcı
+işlerini asyncio üzerinde yapar, mevcut istemciler değişmeden bağlanır.
+Farklar taşıma katmanındadır:
+
+- eventlet ve Flask kullanılmaz; tüm işleyiciler tek bir asyncio olay
+  döngüsünde eşyordam olarak çalışır.
+- Tur geçişleri oda başına asyncio görevleridir (AsyncRoundScheduler).
+- Veritabanına dokunan işler (`call` komutları: soru çekme, oyun sonu
+  skorları, skor tablosu sorguları) olay döngüsünü bekletmemek için
+  veritabanı havuzu boyutunda bir iş parçacığı havuzunda çalışır.
+- Çoklu süreç modu (cluster.py, Flask-SocketIO mesaj kuyruğu) ve işleyici
+  profil çıkarıcısı (greenlet'lere göre yazılmıştır) eventlet sürümüne
+  özgüdür.
+
+Çalıştırmak için `aiohttp` gerekir:
+
+    python async_server.py --host 127.0.0.1 --port 8080
+
+İki sürümü aynı yük altında karşılaştırmak için:
+
+    python load_test.py --variant both --rooms 50 --teams 4
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+import socketio # type: ignore
+from aiohttp import web # type: ignore
+
+from scheduler import AsyncRoundScheduler
+from coalescer import AsyncBroadcastCoalescer
+from reaper import AsyncRoomReaper
+from metrics import Metrics
+from wire import metered_packet
+from quiz_game import QuizGame, add_arguments, configure_reaper
+
+# Prometheus metrikleri (GET /metrics); adlar server.py ile aynıdır
+metrics = Metrics()
+metrics.histogram('quiz_socketio_handler_seconds', "Socket.IO olay işleyicisi süresi", labels=('event',))
+metrics.counter('quiz_emit_total', "Gönderilen olay çerçevesi (oda yayını bir kez sayılır)", labels=('event',))
+metrics.counter('quiz_emit_bytes_total', "Gönderilen olay çerçevesi boyutu (bayt)", labels=('event',))
+
+sio = socketio.AsyncServer(async_mode='aiohttp', cors_allowed_origins="*",
+                           serializer=metered_packet(metrics))
+app = web.Application()
+sio.attach(app)
+
+def on(event):
+    """`sio.on` gibi; işleyicinin süresini metriklere yazar."""
+    def decorator(handler):
+        @wraps(handler)
+        async def timed(*args):
+            started = time.perf_counter()
+            try:
+                return await handler(*args)
+            finally:
+                metrics.observe('quiz_socketio_handler_seconds', time.perf_counter() - started, (event,))
+        sio.on(event)(timed)
+        return handler
+    return decorator
+
+# Oyun kuralları ve durumu (bkz. quiz_game.py)
+game = QuizGame(metrics, 'quiz_data.db')
+
+# Tüm odaların tur geçişleri; her oda için bir asyncio görevi
+scheduler = AsyncRoundScheduler()
+
+# Oda yayınları; lobi yamaları ve sohbet isteğe bağlı olarak birleştirilir
+broadcaster = AsyncBroadcastCoalescer(sio, tick=0, codec=game.wire,
+                                      encodings=lambda room_code: game.rooms.encodings(room_code))
+
+# Veritabanı işleri için iş parçacıkları; havuzdaki bağlantı sayısı kadar
+db_executor = ThreadPoolExecutor(max_workers=game.question_pool.db.pool_size, thread_name_prefix='db')
+
+async def run_db(fn, *args):
+    """`fn(*args)` çağrısını veritabanı iş parçacıklarında çalıştırıp bekler."""
+    return await asyncio.get_running_loop().run_in_executor(db_executor, fn, *args)
+
+async def drive(steps):
+    """Oyun adımını yürütür: istediği komutları yapıp (gerekirse bekleyip)
+    sonuçlarını geri verir. Adımın dönüş değerini döndürür."""
+    result = None
+    while True:
+        try:
+            command = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result = commands[command[0]](*command[1:])
+        if inspect.isawaitable(result):
+            result = await result
+
+async def close_room(room_code, room, reason=None):
+    return await drive(game.close_room(room_code, room, reason))
+
+async def reveal_answer(room_code):
+    await drive(game.reveal_answer(room_code))
+
+async def advance_question(room_code):
+    await drive(game.advance_question(room_code))
+
+# Zamanlayıcıya verilen tur adımları; `run_now` eylemi kimliğiyle karşılaştırır
+round_steps = {'reveal': reveal_answer, 'advance': advance_question}
+
+# Süresi dolan odaları kapatan arka plan görevi
+reaper = AsyncRoomReaper(sio, game.rooms, close_room)
+
+commands = {
+    'send': lambda sid, event, payload: sio.emit(event, payload, to=sid),
+    'emit': broadcaster.emit,
+    'join': sio.enter_room,
+    'leave': sio.leave_room,
+    'close_channel': sio.close_room,
+    'discard': broadcaster.discard,
+    'schedule': lambda room_code, delay, step: scheduler.schedule(room_code, delay, round_steps[step]),
+    'run_now': lambda room_code, step: scheduler.run_now(room_code, round_steps[step]),
+    'run_if_due': scheduler.run_if_due,
+    'cancel': scheduler.cancel,
+    'deadline': scheduler.deadline,
+    'sweep': lambda: reaper.sweep(),
+    'call': run_db,
+}
+
+# Okuma anında hesaplanan metrikler (oyun durumununkiler QuizGame'de)
+metrics.collect('quiz_connected_sids', "Bağlı Socket.IO istemcisi sayısı", lambda: len(sio.eio.sockets))
+metrics.collect('quiz_rooms_evicted_total', "Temizleyicinin kapattığı odalar",
+                lambda: {(reason,): value for reason, value in reaper.stats()['evicted'].items()},
+                kind='counter', labels=('reason',))
+metrics.collect('quiz_broadcast_events_total', "Yayınlanan oda olayları", lambda: broadcaster.events, kind='counter')
+metrics.collect('quiz_broadcast_frames_total', "Gönderilen yayın çerçeveleri (birleştirme sonrası)",
+                lambda: broadcaster.frames, kind='counter')
+
+def shutdown():
+    """SIGTERM ile durdurulurken bekleyen skorları ve olayları yazıp süreci sonlandırır."""
+    game.close()
+    os._exit(0)
+
+async def stats(request):
+    """Açık oda, oturum ve bağlantı sayılarını, oda sayaçlarını döndürür."""
+    result = game.stats()
+    result.update(connections=len(sio.eio.sockets), reaper=reaper.stats())
+    return web.json_response(result)
+
+async def metrics_endpoint(request):
+    """Metrikleri Prometheus metin biçiminde döndürür."""
+    return web.Response(body=metrics.render().encode('utf-8'),
+                        headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+async def high_scores(request):
+    """Skor tablosunu döndürür; `category` ve `day` (YYYY-AA-GG) ile süzülebilir."""
+    try:
+        limit = int(request.query.get('limit', 10))
+    except ValueError:
+        limit = 10
+    try:
+        scores = await run_db(game.high_scores, limit, request.query.get('category'), request.query.get('day'))
+    except ValueError as e:
+        return web.json_response({'error': str(e)}, status=400)
+    return web.json_response(scores)
+
+app.router.add_get('/stats', stats)
+app.router.add_get('/metrics', metrics_endpoint)
+app.router.add_get('/high_scores', high_scores)
+
+@on('connect')
+async def handle_connect(sid, environ, auth=None):
+    await drive(game.connect(sid, auth))
+
+@on('disconnect')
+async def handle_disconnect(sid):
+    await drive(game.disconnect(sid))
+
+@on('create_room')
+async def handle_create_room(sid, data):
+    await drive(game.create_room(sid, data))
+    reaper.start()
+
+@on('join_room')
+async def handle_join_room(sid, data):
+    """Odaya katılma isteğini işler."""
+    await drive(game.join_room(sid, data))
+
+@on('toggle_ready')
+async def handle_toggle_ready(sid, data):
+    await drive(game.toggle_ready(sid, data))
+
+@on('clock_ping')
+async def handle_clock_ping(sid, data):
+    await drive(game.clock_ping(sid, data))
+
+@on('request_room_snapshot')
+async def handle_request_room_snapshot(sid, data):
+    await drive(game.request_room_snapshot(sid, data))
+
+@on('start_game')
+async def handle_start_game(sid, data):
+    await drive(game.start_game(sid, data))
+
+@on('request_question')
+async def handle_request_question(sid, data):
+    await drive(game.request_question(sid, data))
+
+@on('leave_room')
+async def handle_leave_room(sid, data):
+    await drive(game.leave_room(sid, data))
+
+@on('chat_message')
+async def handle_chat_message(sid, data):
+    await drive(game.chat_message(sid, data))
+
+@on('next_question')
+async def handle_next_question(sid, data=None):
+    """Eski istemciler için; soru geçişlerini zamanlayıcı yönetir."""
+    pass
+
+@on('time_up')
+async def handle_time_up(sid, data=None):
+    """İstemcide süre dolduğunda çalışır (bkz. QuizGame.time_up)."""
+    await drive(game.time_up(sid, data))
+
+@on('submit_answer')
+async def handle_submit_answer(sid, data):
+    """Cevap gönderildiğinde çalışır."""
+    await drive(game.submit_answer(sid, data))
+
+async def on_startup(app):
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, shutdown)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bilgi Yarışması oyun sunucusu (asyncio)")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    game.configure(args)
+    broadcaster.tick = args.coalesce_ms / 1000.0
+    configure_reaper(reaper, args)
+    if args.event_log:
+        game.open_event_log(args.event_log, fsync=args.fsync)
+    # Olay döngüsü başlamadan önce; burada beklemek sorun değil
+    game.load()
+    app.on_startup.append(on_startup)
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Çoklu süreç modu için Unix soketi üzerinden çalışan küçük mesaj aracısı.
+
+Her bağlantı ilk çerçevesiyle rolünü bildirir: yayıncı (`P`) ya da abone
+(`S`). Aracı yayıncılardan gelen her çerçeveyi tüm abonelere iletir.
+`UnixSocketManager` bu aracıyı Socket.IO'nun mesaj kuyruğu (client
+manager) olarak kullanır; böylece farklı süreçlerdeki sunucular birbirinin
+odalarına yayın yapabilir. Redis ya da RabbitMQ gibi harici bir servis
+gerekmez.
+
+Çalıştırma:
+    python broker.py /tmp/bilgi-broker.sock
+"""
+
+import os
+import pickle
+import socketserver
+import struct
+import sys
+import threading
+
+import socketio
+
+HEADER = struct.Struct('>I')
+ROLE_PUBLISHER = b'P'
+ROLE_SUBSCRIBER = b'S'
+
+def parse_url(url):
+    """'unix:///yol/aracı.sock' biçimindeki adresi dosya yoluna çevirir."""
+    if url.startswith('unix://'):
+        return url[len('unix://'):]
+    return url
+
+def read_frame(sock):
+    """Soketten bir çerçeve okur; bağlantı kapandıysa None döner."""
+    header = _read_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    return _read_exact(sock, HEADER.unpack(header)[0])
+
+def _read_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+def write_frame(sock, payload):
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        broker = self.server
+        try:
+            role = read_frame(self.request)
+            if role == ROLE_SUBSCRIBER:
+                # Abonelerden veri beklenmez; bağlantı kapanana kadar kayıtlı kal
+                broker.register(self.request, threading.Lock())
+                while self.request.recv(4096):
+                    pass
+            elif role == ROLE_PUBLISHER:
+                while True:
+                    payload = read_frame(self.request)
+                    if payload is None:
+                        break
+                    broker.fan_out(payload)
+        except OSError:
+            pass
+        finally:
+            broker.unregister(self.request)
+
+class MessageBroker(socketserver.ThreadingUnixStreamServer):
+    """Yayıncılardan gelen her çerçeveyi tüm abonelere iletir."""
+
+    daemon_threads = True
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, _BrokerHandler)
+        self.path = path
+        self._lock = threading.Lock()
+        self._peers = {}
+
+    def register(self, sock, send_lock):
+        with self._lock:
+            self._peers[sock] = send_lock
+
+    def unregister(self, sock):
+        with self._lock:
+            self._peers.pop(sock, None)
+
+    def fan_out(self, payload):
+        with self._lock:
+            peers = list(self._peers.items())
+        for sock, lock in peers:
+            try:
+                with lock:
+                    write_frame(sock, payload)
+            except OSError:
+                self.unregister(sock)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+class UnixSocketManager(socketio.PubSubManager):
+    """`MessageBroker` üzerinden çalışan Socket.IO istemci yöneticisi.
+
+    Sunucunun asenkron moduna uygun soket ve kilit kullanılır (eventlet
+    altında yeşil soketler), böylece dinleme görevi olay döngüsünü
+    kilitlemez.
+    """
+
+    name = 'unix'
+
+    def __init__(self, url='unix:///tmp/bilgi-broker.sock', channel='socketio',
+                 write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.path = parse_url(url)
+        self._publisher = None
+        self._publish_lock = None
+
+    def _socket_module(self):
+        if self.server.async_mode == 'eventlet':
+            from eventlet.green import socket
+        else:
+            import socket
+        return socket
+
+    def _connect(self, role):
+        socket = self._socket_module()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        write_frame(sock, role)
+        return sock
+
+    def _publish(self, data):
+        if self._publish_lock is None:
+            if self.server.async_mode == 'eventlet':
+                from eventlet.semaphore import Semaphore
+                self._publish_lock = Semaphore()
+            else:
+                self._publish_lock = threading.Lock()
+
+        payload = pickle.dumps(data)
+        with self._publish_lock:
+            # Aracı yeniden başlatıldıysa bir kez yeniden bağlanmayı dene
+            for attempt in range(2):
+                try:
+                    if self._publisher is None:
+                        self._publisher = self._connect(ROLE_PUBLISHER)
+                    write_frame(self._publisher, payload)
+                    return
+                except OSError:
+                    if self._publisher is not None:
+                        self._publisher.close()
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    def _listen(self):
+        while True:
+            try:
+                sock = self._connect(ROLE_SUBSCRIBER)
+            except OSError:
+                self.server.sleep(1)
+                continue
+            try:
+                while True:
+                    payload = read_frame(sock)
+                    if payload is None:
+                        break
+                    yield payload
+            except OSError:
+                pass
+            finally:
+                sock.close()
+            self.server.sleep(1)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = parse_url(argv[0] if argv else '/tmp/bilgi-broker.sock')
+    broker = MessageBroker(path)
+    print(f"Mesaj aracısı dinliyor: {path}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.server_close()
+
+if __name__ == '__main__':
+    main()
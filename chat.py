@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+class TokenBucket:
+    """Jeton kovası: saniyede `rate` jeton dolar, en fazla `capacity` birikir."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now):
+        """Bir jeton harcar; kova boşsa False döner."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+class ChatRoom:
+    """Bir odanın sohbeti: son mesajlar için sabit boyutlu halka tampon.
+
+    Geçmiş en fazla `history` mesaj tutar, her mesaj en fazla `max_length`
+    karakterdir. Takım başına jeton kovaları takım ayrıldıktan sonra da
+    tutulur; ayrılıp yeniden katılmak sınırı sıfırlamaz. Kova yeniden
+    dolacak kadar (`burst / rate` saniye) kullanılmazsa silinir, çünkü dolu
+    bir kova yeni açılanla aynıdır. Böylece lobi ne kadar açık kalırsa
+    kalsın odanın sohbet belleği sınırlıdır.
+    """
+
+    def __init__(self, history=50, max_length=500, rate=1.0, burst=5):
+        self.max_length = max_length
+        self.rate = rate
+        self.burst = burst
+        self._messages = deque(maxlen=history)
+        self._buckets = OrderedDict()   # takım -> kova, en eski kullanılan başta
+        self._lock = threading.Lock()
+
+    def post(self, team_name, message, now=None):
+        """Mesajı geçmişe ekler; (mesaj, None) ya da (None, ret nedeni) döndürür."""
+        if not isinstance(message, str):
+            return None, 'Geçersiz mesaj!'
+        message = message.strip()
+        if not message:
+            return None, 'Boş mesaj gönderilemez!'
+        if len(message) > self.max_length:
+            return None, f'Mesaj en fazla {self.max_length} karakter olabilir!'
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._prune(now)
+            bucket = self._buckets.get(team_name)
+            if bucket is None:
+                bucket = self._buckets[team_name] = TokenBucket(self.rate, self.burst, now)
+            else:
+                self._buckets.move_to_end(team_name)
+            if not bucket.take(now):
+                return None, 'Çok hızlı mesaj gönderiyorsunuz, lütfen bekleyin.'
+            entry = {'team_name': team_name, 'message': message, 'ts': time.time()}
+            self._messages.append(entry)
+            return entry, None
+
+    def forget(self, team_name, now=None):
+        """Takım ayrılırken çağrılır; yeniden dolmuş kovaları siler.
+
+        Ayrılan takımın kovası hemen silinmez, dolunca silinir.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._prune(now)
+
+    def _prune(self, now):
+        # Çağıran kilidi tutmalıdır. Kovalar son kullanım sırasında
+        # olduğundan baştaki kova dolmadıysa arkadakiler de dolmamıştır.
+        refill = self.burst / self.rate if self.rate > 0 else float('inf')
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket.updated < refill:
+                break
+            self._buckets.popitem(last=False)
+
+    def history(self):
+        """Geçmişteki mesajların eskiden yeniye bir kopyasını döndürür."""
+        with self._lock:
+            return list(self._messages)
+
+    def __len__(self):
+        return len(self._messages)
@@ -7,8 +7,21 @@ import json
 import os
 import sqlite3
 from datetime import datetime
+import math
 import random
 import socketio
+from engineio.payload import Payload
+from question_view import QuestionView, LETTERS
+from ui_dispatch import UIDispatcher
+from countdown import ClockSync, Countdown
+from wire import WireCodec
+
+# Yoklama yanıtındaki paket sayısı sınırı (varsayılan 16 sohbet patlamasında aşılır)
+Payload.max_decode_packets = 1024
+
+# Sunucu saatiyle eşitleme: bağlanınca yapılan ölçüm sayısı ve yenileme aralığı
+CLOCK_SYNC_SAMPLES = 5
+CLOCK_SYNC_INTERVAL_MS = 30000
 
 class BilgiYarismasi:
     def __init__(self, root):
@@ -17,7 +30,14 @@ class BilgiYarismasi:
         self.root.geometry("800x600")
         self.root.resizable(True, True)
         
-        # Socket.IO istemcisini başlat
+        # Socket.IO olayları arka plan iş parçacığında gelir; arayüze dokunan
+        # işleyiciler bu kuyruk üzerinden Tk döngüsünde çalıştırılır
+        self.ui = UIDispatcher(root)
+        self.ui.start()
+        
+        # Socket.IO istemcisini başlat; yük kodlaması bağlanırken anlaşılır
+        self.wire = WireCodec()
+        self.encoding = 'json'
         self.sio = socketio.Client()
         self.setup_socket_events()
         
@@ -27,6 +47,11 @@ class BilgiYarismasi:
         self.teams = []
         self.is_host = False
         
+        # Takım listesinin sürümü ve sırası gelmemiş yamalar
+        self.room_version = 0
+        self.pending_patches = {}
+        self.snapshot_requested = False
+        
         # Tema değişkenleri
         self.theme = {
             "bg": "#f0f0f0",
@@ -47,78 +72,219 @@ class BilgiYarismasi:
         self.timer_running = False
         self.questions = []
         
+        # Kalıcı soru ekranı (ilk soruda kurulur); süre sayacı sunucunun
+        # verdiği bitiş anına, sunucu saatiyle eşitlenmiş olarak sayar
+        self.question_view = None
+        self.clock = ClockSync()
+        self.countdown = Countdown(root, self.on_countdown_tick, self.on_countdown_expire, clock=self.clock)
+        
+        # Sonuç gösterimi sırasında önceden alınan sıradaki soru
+        self.prefetched_question = None
+        # Ekrandaki sorunun numarası; sonuçlar yalnızca o soruya işaretlenir
+        self.shown_question_number = None
+        
+        # Sunucu adresi (çoklu süreç modunda cluster.py yönlendiricisi)
+        self.server_url = 'http://192.168.1.103:8080'
+        
         try:
             # Sunucuya bağlan
-            self.sio.connect('http://192.168.1.103:8080', wait_timeout=10)
+            self.connect_server(self.server_url)
             self.connected = True
         except Exception as e:
             print(f"Bağlantı hatası: {str(e)}")
             messagebox.showerror("Bağlantı Hatası", "Sunucuya bağlanılamadı! Çevrimdışı modda devam ediliyor.")
             self.connected = False
         
+        # Saat farkını düzenli aralıklarla yeniden ölç
+        self.root.after(CLOCK_SYNC_INTERVAL_MS, self.sync_clock)
+        
         # Ana ekranı göster
         self.show_main_menu()
     
+    def connect_server(self, url):
+        """Sunucuya, desteklenen yük kodlamalarını önererek bağlanır."""
+        self.encoding = 'json'
+        self.sio.connect(url, wait_timeout=10, auth={'encodings': list(self.wire.encodings)})
+    
     def setup_socket_events(self):
-        """Socket.IO event dinleyicilerini ayarlar."""
+        """Socket.IO event dinleyicilerini ayarlar.
+        
+        `on_ui` ile kaydedilen işleyiciler socketio iş parçacığında değil,
+        arayüz kuyruğu (`self.ui`) üzerinden Tk iş parçacığında çalışır.
+        `key` verilen olaylardan kuyrukta yalnızca en yenisi çizilir. Soru
+        ekranı olayları birleştirilmez: atlanan bir tur başlangıcı, arkasından
+        gelen sonucun önceki sorunun şıklarına işaretlenmesine yol açardı.
+        """
+        def on_ui(event, key=None):
+            def register(handler):
+                def dispatch(data=None):
+                    # Yük anlaşılan kodlamadan burada (socketio iş parçacığında) çözülür
+                    self.ui.post(handler, self.wire.decode(data, self.encoding), key=key)
+                self.sio.on(event, dispatch)
+                return handler
+            return register
+        
+        @self.sio.on('wire_encoding')
+        def on_wire_encoding(data):
+            # Sunucu bağlantı kabulünden önce gönderir; sonraki tüm yükler bu kodlamadadır
+            self.encoding = data['encoding']
+        
         @self.sio.on('connect')
         def on_connect():
             print("Sunucuya bağlanıldı!")
             self.connected = True
+            # İlk saat farkı tahmini için birkaç ölçüm; en kısa gidiş-dönüş seçilir
+            for _ in range(CLOCK_SYNC_SAMPLES):
+                self.sio.emit('clock_ping', self.clock.ping_payload())
+        
+        @self.sio.on('clock_pong')
+        def on_clock_pong(data):
+            # Varış zamanı doğru ölçülsün diye arayüz kuyruğuna girmeden işlenir
+            data = self.wire.decode(data, self.encoding)
+            self.clock.add_sample(data['t0'], data['t1'], data['t2'])
         
         @self.sio.on('disconnect')
         def on_disconnect():
             print("Sunucu bağlantısı kesildi!")
             self.connected = False
         
-        @self.sio.on('error')
+        @on_ui('error')
         def on_error(data):
             messagebox.showerror("Hata", data['message'])
         
-        @self.sio.on('room_created')
+        @on_ui('room_created')
         def on_room_created(data):
             self.room_code = data['room_code']
             self.teams = data['teams']
+            self.room_version = data.get('version', 0)
+            self.pending_patches = {}
+            self.snapshot_requested = False
             self.show_lobby()
         
-        @self.sio.on('room_updated')
-        def on_room_updated(data):
-            self.teams = data['teams']
-            self.update_lobby_ui()
-        
-        @self.sio.on('game_started')
+        @on_ui('room_patch')
+        def on_room_patch(data):
+            self.apply_room_patch(data)
+        
+        @on_ui('room_snapshot')
+        def on_room_snapshot(data):
+            if data.get('room_code') != self.room_code:
+                return
+            self.snapshot_requested = False
+            if data['version'] >= self.room_version:
+                self.teams = data['teams']
+                self.room_version = data['version']
+            # Anlık görüntüden yeni yamaları uygula
+            self.apply_pending_patches()
+            self.ui.post(self.update_teams_list, key='teams')
+        
+        @on_ui('game_started')
         def on_game_started(data):
             self.show_question(data['first_question'])
         
-        @self.sio.on('show_question')
+        @on_ui('show_question')
         def on_show_question(data):
             self.show_question(data)
         
-        @self.sio.on('show_results')
+        @on_ui('prefetch_question')
+        def on_prefetch_question(data):
+            # Sonuç gösterilirken gelen sıradaki soru; tur başında çizilir
+            self.prefetched_question = data
+        
+        @on_ui('start_question')
+        def on_start_question(data):
+            self.start_question(data)
+        
+        @on_ui('show_results')
         def on_show_results(data):
             correct_answer = data['correct_answer']
             scores = data['scores']
-            self.show_results(correct_answer, scores)
+            self.show_results(correct_answer, scores, data.get('question_number'))
         
-        @self.sio.on('game_over')
+        @on_ui('game_over')
         def on_game_over(data):
             scores = data['scores']
             messagebox.showinfo("Oyun Bitti!", f"Final puanları:\n{scores}")
             self.show_main_menu()
         
-        @self.sio.on('new_chat_message')
+        @on_ui('room_closed')
+        def on_room_closed(data):
+            if data.get('room_code') != self.room_code:
+                return
+            reasons = {'idle': "uzun süre işlem yapılmadığı",
+                       'finished': "oyun bittiği",
+                       'abandoned': "oda sahibi ayrıldığı"}
+            reason = reasons.get(data.get('reason'))
+            message = f"Oda {reason} için kapatıldı." if reason else "Oda kapatıldı."
+            self.countdown.stop()
+            messagebox.showinfo("Oda Kapandı", message)
+            self.show_main_menu()
+        
+        @self.sio.on('batch')
+        def on_batch(data):
+            # Sunucunun birleştirdiği olayları sırasıyla kendi işleyicilerine dağıt
+            handlers = self.sio.handlers.get('/', {})
+            for event, payload in data['events']:
+                handler = handlers.get(event)
+                if handler is not None:
+                    handler(payload)
+        
+        @on_ui('new_chat_message')
         def on_new_chat_message(data):
             if hasattr(self, 'chat_text'):
                 self.chat_text.insert("end", f"{data['team_name']}: {data['message']}\n")
                 self.chat_text.see("end")
+
+        @on_ui('chat_history')
+        def on_chat_history(data):
+            # Odaya katılmadan önce yazılan son mesajlar
+            if hasattr(self, 'chat_text') and data.get('room_code') == self.room_code:
+                for message in data['messages']:
+                    self.chat_text.insert("end", f"{message['team_name']}: {message['message']}\n")
+                self.chat_text.see("end")
+
+        @on_ui('chat_rejected')
+        def on_chat_rejected(data):
+            if hasattr(self, 'chat_text'):
+                self.chat_text.insert("end", f"* {data['message']}\n")
+                self.chat_text.see("end")
+
+    def apply_room_patch(self, patch):
+        """Takım listesine sunucudan gelen yamayı uygular.
         
-        @self.sio.on('teams_updated')
-        def on_teams_updated(data):
-            print(f"Takımlar güncellendi: {data['teams']}")
-            self.teams = data['teams']
-            if hasattr(self, 'teams_list'):
-                self.update_teams_list()
-        
+        Yamalar sürüm sırasıyla uygulanır; arada eksik bir sürüm varsa yama
+        bekletilir ve sunucudan tam liste istenir.
+        """
+        if patch.get('room_code') != self.room_code:
+            return
+        version = patch['version']
+        if version <= self.room_version:
+            return
+        self.pending_patches[version] = patch
+        self.apply_pending_patches()
+        if self.pending_patches and not self.snapshot_requested:
+            self.snapshot_requested = True
+            self.sio.emit('request_room_snapshot', {'room_code': self.room_code})
+        # Aynı turda gelen yamalar için liste bir kez çizilir
+        self.ui.post(self.update_teams_list, key='teams')
+    
+    def apply_pending_patches(self):
+        """Bekleyen yamalardan sıradaki sürümleri uygular."""
+        for version in sorted(self.pending_patches):
+            if version <= self.room_version:
+                del self.pending_patches[version]
+        while self.room_version + 1 in self.pending_patches:
+            patch = self.pending_patches.pop(self.room_version + 1)
+            op = patch['op']
+            if op == 'add':
+                self.teams.append(patch['team'])
+            elif op == 'remove':
+                self.teams = [team for team in self.teams if team['name'] != patch['name']]
+            elif op == 'ready':
+                for team in self.teams:
+                    if team['name'] == patch['name']:
+                        team['ready'] = patch['ready']
+            self.room_version = patch['version']
+    
     def create_room(self):
         """Yeni bir oda oluşturur."""
         team_name = self.team_name.get().strip()
@@ -142,6 +308,16 @@ class BilgiYarismasi:
             messagebox.showwarning("Uyarı", "Lütfen oda kodunu girin.")
             return
         
+        # Çoklu süreç modunda yönlendiricinin odanın bulunduğu sunucuyu
+        # seçebilmesi için bağlantıyı oda koduyla yeniden kur
+        try:
+            self.sio.disconnect()
+            self.connect_server(f"{self.server_url}?room={room_code}")
+        except Exception as e:
+            print(f"Bağlantı hatası: {str(e)}")
+            messagebox.showerror("Bağlantı Hatası", "Sunucuya bağlanılamadı!")
+            return
+        
         self.sio.emit('join_room', {
             'team_name': team_name,
             'room_code': room_code
@@ -180,15 +356,6 @@ class BilgiYarismasi:
             })
             self.chat_input.delete(0, "end")
     
-    def update_lobby_ui(self):
-        """Lobi arayüzünü günceller."""
-        if hasattr(self, 'teams_list'):
-            self.teams_list.delete(*self.teams_list.get_children())
-            for team in self.teams:
-                status = "Hazır" if team["ready"] else "Bekliyor"
-                host_mark = "👑 " if team["is_host"] else ""
-                self.teams_list.insert("", "end", values=(f"{host_mark}{team['name']}", status))
-
     def apply_theme(self):
         """Tema ayarlarını uygular."""
         self.style.configure("TButton",
@@ -217,11 +384,21 @@ class BilgiYarismasi:
         
         self.root.configure(bg=self.theme["bg"])
 
+    def clear_screen(self, keep_question_view=False):
+        """Ekrandaki widget'ları yıkar; kalıcı soru ekranı yalnızca gizlenir."""
+        view = self.question_view
+        if view is not None and not keep_question_view:
+            view.hide()
+            # Soru ekranından çıkılıyor; süre sayacını durdur
+            self.countdown.stop()
+        for widget in self.root.winfo_children():
+            if view is None or widget is not view.frame:
+                widget.destroy()
+
     def show_lobby(self):
         """Lobi ekranını gösterir."""
         # Mevcut widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Ana çerçeve
         main_frame = ttk.Frame(self.root)
@@ -292,8 +469,7 @@ class BilgiYarismasi:
     def show_main_menu(self):
         """Ana menüyü gösterir."""
         # Mevcut widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Ana çerçeve
         main_frame = ttk.Frame(self.root)
@@ -335,8 +511,7 @@ class BilgiYarismasi:
     def start_game(self, category):
         """Oyunu başlatır."""
         # Mevcut widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Ana çerçeve
         main_frame = ttk.Frame(self.root)
@@ -374,31 +549,29 @@ class BilgiYarismasi:
         
         # Zamanlayıcı başlat
         self.time_left = self.question_time
-        self.update_timer()
+        self.countdown.start(duration=self.time_left)
 
-    def update_timer(self):
-        """Süre sayacını günceller."""
-        if hasattr(self, 'timer_label') and self.remaining_time > 0:
-            self.timer_label.config(text=f"Süre: {self.remaining_time}")
-            self.remaining_time -= 1
-            self.root.after(1000, self.update_timer)
-        elif self.remaining_time <= 0:
-            # Süre dolduğunda sunucuya bildir
-            self.sio.emit('time_up')
-            # Cevap seçeneklerini devre dışı bırak ve doğru cevabı yeşil yap
-            for widget in self.root.winfo_children():
-                if isinstance(widget, ttk.Frame):
-                    for child in widget.winfo_children():
-                        if isinstance(child, ttk.Frame):
-                            for grandchild in child.winfo_children():
-                                if isinstance(grandchild, ttk.Radiobutton):
-                                    grandchild.configure(state='disabled')
-                                    # Doğru cevabı yeşil yap
-                                    if grandchild['text'].startswith(self.current_correct_answer):
-                                        grandchild.configure(style='Correct.TRadiobutton')
-            
-            # 7 saniye bekle ve sonraki soruya geç
-            self.root.after(7000, self.sio.emit, 'next_question')
+    def on_countdown_tick(self, seconds):
+        """Gösterilen saniye değiştiğinde süre etiketini günceller."""
+        self.time_left = seconds
+        if self.question_view is not None:
+            self.question_view.set_timer(f"Süre: {seconds}")
+
+    def on_countdown_expire(self):
+        """Süre dolduğunda sunucuya bildirir (geçişi sunucu yönetir)."""
+        self.sio.emit('time_up', {'room_code': self.room_code})
+        # Doğru cevap sonuç açıklamasıyla gelir; şimdilik seçenekleri kapat
+        if self.question_view is not None:
+            self.question_view.disable()
+
+    def sync_clock(self):
+        """Sunucu saatiyle farkı ölçmek için ping gönderir ve bir sonrakini planlar."""
+        if self.connected:
+            try:
+                self.sio.emit('clock_ping', self.clock.ping_payload())
+            except Exception as e:
+                print(f"Saat eşitleme hatası: {e}")
+        self.root.after(CLOCK_SYNC_INTERVAL_MS, self.sync_clock)
 
     def check_answer(self, selected_answer):
         """Cevabı kontrol eder."""
@@ -422,63 +595,55 @@ class BilgiYarismasi:
             self.show_game_over()
 
     def show_question(self, question_data):
-        """Soruyu gösterir."""
-        # Mevcut widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        # Ana çerçeve
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(expand=True, fill="both", padx=20, pady=20)
-        
-        # Üst bilgi çerçevesi
-        info_frame = ttk.Frame(main_frame)
-        info_frame.pack(fill="x", pady=10)
+        """Soruyu gösterir.
+        
+        Soru ekranı ilk soruda bir kez kurulur; sonraki sorularda yalnızca
+        metinler, stiller ve seçeneklerin durumu güncellenir.
+        """
+        if self.question_view is None:
+            self.question_view = QuestionView(
+                self.root,
+                on_select=lambda index: self.submit_answer(),
+                option_kind='radio',
+                font="Helvetica"
+            )
+            # Seçenekler sonraki sorularda da aynı değişkeni paylaşır
+            self.answer_var = self.question_view.answer_var
         
-        # Soru numarası ve süre
-        self.remaining_time = question_data.get('time', 30)  # Varsayılan 30 saniye
-        self.timer_label = ttk.Label(info_frame, text=f"Süre: {self.remaining_time}", font=("Helvetica", 12))
-        self.timer_label.pack(side="right", padx=5)
+        # Soru ekranı dışındaki widget'ları temizle
+        self.clear_screen(keep_question_view=True)
         
-        question_num = ttk.Label(info_frame, text=f"Soru {question_data['question_number']}", font=("Helvetica", 12))
-        question_num.pack(side="left", padx=5)
+        self.current_options = [question_data[f'answer_{letter.lower()}'] for letter in LETTERS]
+        self.shown_question_number = question_data['question_number']
         
-        # Soru metni
-        question_frame = ttk.Frame(main_frame)
-        question_frame.pack(fill="both", expand=True, pady=10)
-        
-        question_text = tk.Text(question_frame, height=4, wrap="word", font=("Helvetica", 12))
-        question_text.insert("1.0", question_data['question'])
-        question_text.configure(state="disabled")
-        question_text.pack(fill="both", expand=True, padx=5)
-        
-        # Doğru cevabı sakla
-        self.current_correct_answer = question_data['correct_answer']
-        
-        # Cevap seçenekleri
-        answers_frame = ttk.Frame(main_frame)
-        answers_frame.pack(fill="both", expand=True, pady=10)
-        
-        self.answer_var = tk.StringVar()
-        for i, answer in enumerate(['A', 'B', 'C', 'D']):
-            answer_text = question_data[f'answer_{answer.lower()}']
-            rb = ttk.Radiobutton(
-                answers_frame,
-                text=f"{answer}) {answer_text}",
-                value=answer,
-                variable=self.answer_var,
-                command=self.submit_answer
-            )
-            rb.pack(anchor="w", pady=5)
+        question_time = question_data.get('time', 30)  # Varsayılan 30 saniye
+        self.question_view.render(
+            f"Soru {question_data['question_number']}",
+            question_data['question'],
+            self.current_options,
+            timer=f"Süre: {math.ceil(question_time)}"
+        )
         
-        # Süre sayacını başlat
-        self.update_timer()
+        # Süre sayacını sunucunun bitiş anına göre başlat (önceki sayacın yerine geçer)
+        self.countdown.start(deadline=question_data.get('deadline'), duration=question_time)
+
+    def start_question(self, signal):
+        """`start_question` sinyaliyle önceden alınan soruyu ekrana getirir."""
+        question = self.prefetched_question
+        if question is None or question['question_number'] != signal['question_number']:
+            # Ön yükleme kaçırıldıysa soruyu sunucudan iste
+            self.sio.emit('request_question', {'room_code': self.room_code})
+            return
+        self.prefetched_question = None
+        question = dict(question, time=signal['time'], deadline=signal.get('deadline'))
+        self.show_question(question)
 
     def submit_answer(self):
         """Cevabı gönderir."""
         answer = self.answer_var.get()
         if answer:
             self.sio.emit('submit_answer', {
+                'room_code': self.room_code,
                 'answer': answer,
                 'team_name': self.team_name.get()
             })
@@ -486,8 +651,7 @@ class BilgiYarismasi:
     def show_game_over(self):
         """Oyun sonu ekranını gösterir."""
         # Mevcut widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Ana çerçeve
         main_frame = ttk.Frame(self.root)
@@ -518,8 +682,17 @@ class BilgiYarismasi:
                 host_mark = "👑 " if team.get('is_host', False) else ""
                 self.teams_list.insert("", "end", values=(f"{host_mark}{team['name']}", status))
 
-    def show_results(self, correct_answer, scores):
+    def show_results(self, correct_answer, scores, question_number=None):
         """Sonuçları gösterir."""
+        # Süreyi durdur, seçenekleri kapat ve doğru cevabı yeşil yap; ekranda
+        # başka bir soru varsa şıklar işaretlenmez
+        if self.question_view is not None and question_number in (None, self.shown_question_number):
+            self.countdown.stop()
+            self.question_view.disable()
+            for index, letter in enumerate(LETTERS):
+                if correct_answer in (letter, self.current_options[index]):
+                    self.question_view.mark(index, 'Correct.TRadiobutton')
+        
         # Sonuç penceresi
         result_window = tk.Toplevel(self.root)
         result_window.title("Sonuçlar")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Oyun sunucusunu birden fazla süreçte çalıştırır.
+
+Bir mesaj aracısı (broker.py), N adet server.py süreci ve önlerinde tek
+bir yönlendirici başlatılır. Yönlendirici gelen her bağlantının ilk HTTP
+isteğine bakarak hedef süreci seçer:
+
+- Engine.IO oturum kimliği (`sid`) varsa, kimliğin başındaki süreç
+  etiketine göre (`w3.` -> 3 numaralı süreç),
+- `room` sorgu parametresi varsa oda kodunun tutarlı özetleme (consistent
+  hashing) halkasındaki sahibine,
+- hiçbiri yoksa en az bağlantısı olan sürece.
+
+Her süreç yalnızca halkada kendisine düşen oda kodlarını üretir; böylece
+bir odanın tüm takımları aynı süreçte buluşur. Süreçler arası yayınlar
+mesaj aracısı üzerinden iletilir.
+
+Çalıştırma:
+    python cluster.py --workers 4 --host 0.0.0.0 --port 8080 [server.py argümanları]
+"""
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+class HashRing:
+    """Sanal düğümlü tutarlı özetleme halkası."""
+
+    def __init__(self, nodes, replicas=100):
+        points = []
+        for node in nodes:
+            for replica in range(replicas):
+                points.append((self._hash(f"{node}#{replica}"), node))
+        points.sort()
+        self._keys = [key for key, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(value):
+        return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+    def node_for(self, key):
+        """Anahtarın sahibi olan düğümü döndürür."""
+        index = bisect.bisect(self._keys, self._hash(str(key))) % len(self._keys)
+        return self._nodes[index]
+
+def tag_session_ids(eio_server, worker_index):
+    """Engine.IO oturum kimliklerinin başına süreç etiketini ekler."""
+    generate_id = eio_server.generate_id
+    eio_server.generate_id = lambda: f"w{worker_index}.{generate_id()}"
+
+def worker_from_sid(sid):
+    """Etiketli oturum kimliğinden süreç numarasını çıkarır."""
+    if sid.startswith('w') and '.' in sid:
+        try:
+            return int(sid[1:sid.index('.')])
+        except ValueError:
+            return None
+    return None
+
+class Router:
+    """Bağlantıları ilk isteğe göre uygun sürece aktaran TCP yönlendiricisi."""
+
+    def __init__(self, backends, max_header=65536):
+        self.backends = backends
+        self.ring = HashRing(range(len(backends)))
+        self.connections = [0] * len(backends)
+        self.max_header = max_header
+
+    def pick(self, query):
+        """Sorgu parametrelerine göre hedef sürecin sırasını döndürür."""
+        sid = query.get('sid')
+        if sid:
+            worker = worker_from_sid(sid[0])
+            if worker is not None and worker < len(self.backends):
+                return worker
+        room = query.get('room')
+        if room:
+            return self.ring.node_for(room[0])
+        return min(range(len(self.backends)), key=self.connections.__getitem__)
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        request_line = head.split(b'\r\n', 1)[0].decode('latin-1')
+        parts = request_line.split(' ')
+        query = parse_qs(urlsplit(parts[1]).query) if len(parts) > 1 else {}
+        worker = self.pick(query)
+        host, port = self.backends[worker]
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(host, port)
+        except OSError:
+            writer.close()
+            return
+
+        self.connections[worker] += 1
+        try:
+            upstream_writer.write(head)
+            await asyncio.gather(
+                self._pipe(reader, upstream_writer),
+                self._pipe(upstream_reader, writer)
+            )
+        finally:
+            self.connections[worker] -= 1
+
+    async def _pipe(self, reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port, limit=self.max_header)
+        async with server:
+            await server.serve_forever()
+
+def wait_for_port(host, port, timeout):
+    import socket
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def start_processes(workers, base_port, broker_path, backend_host='127.0.0.1', server_args=()):
+    """Mesaj aracısını ve sunucu süreçlerini başlatır.
+
+    `server_args` her server.py sürecine olduğu gibi iletilir.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    processes = [subprocess.Popen([sys.executable, os.path.join(here, 'broker.py'), broker_path], cwd=here)]
+
+    deadline = time.monotonic() + 10
+    while not os.path.exists(broker_path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    backends = []
+    for index in range(workers):
+        port = base_port + index
+        env = dict(os.environ,
+                   QUIZ_MESSAGE_QUEUE=f"unix://{broker_path}",
+                   QUIZ_WORKER_INDEX=str(index),
+                   QUIZ_WORKER_COUNT=str(workers))
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.join(here, 'server.py'),
+             '--host', backend_host, '--port', str(port), '--no-debug', *server_args],
+            cwd=here, env=env))
+        backends.append((backend_host, port))
+
+    for host, port in backends:
+        if not wait_for_port(host, port, 15):
+            raise RuntimeError(f"Sunucu süreci başlatılamadı: {host}:{port}")
+    return processes, backends
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bilgi Yarışması sunucusunu çoklu süreçte çalıştırır")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="sunucu süreci sayısı")
+    parser.add_argument('--host', default='192.168.1.103', help="yönlendiricinin dinleyeceği adres")
+    parser.add_argument('--port', type=int, default=8080, help="yönlendiricinin dinleyeceği port")
+    parser.add_argument('--base-port', type=int, default=9100, help="ilk sunucu sürecinin portu")
+    parser.add_argument('--broker', help="mesaj aracısının Unix soket yolu")
+    # Tanınmayan argümanlar (ör. --question-time) sunucu süreçlerine iletilir
+    args, server_args = parser.parse_known_args(argv)
+
+    broker_path = args.broker or os.path.join(tempfile.gettempdir(), f"bilgi-broker-{os.getpid()}.sock")
+    processes, backends = start_processes(args.workers, args.base_port, broker_path, server_args=server_args)
+    print(f"{args.workers} sunucu süreci hazır, yönlendirici {args.host}:{args.port} adresinde")
+    # SIGTERM ile durdurulduğunda da alt süreçleri kapat
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        asyncio.run(Router(backends).serve(args.host, args.port))
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(10)
+
+if __name__ == '__main__':
+    main()
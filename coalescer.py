@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+
+class BroadcastCoalescer:
+    """Oda yayınlarını kısa bir pencere içinde toplayıp tek çerçevede gönderir.
+
+    `tick` saniye içinde aynı odaya giden birleştirilebilir olaylar (lobi
+    yamaları, sohbet) biriktirilir ve pencere sonunda tek bir `batch`
+    olayı olarak gönderilir; tek olay birikmişse olduğu gibi gönderilir.
+    İstemci `batch` içindeki olayları sırasıyla kendi işleyicilerine
+    dağıtır.
+
+    Birleştirilmeyen olaylar (`coalesce=False`) hemen gönderilir, ancak
+    önce odanın bekleyen olayları boşaltılır; böylece odadaki olay sırası
+    korunur. `tick` 0 ise tüm olaylar doğrudan gönderilir.
+
+    `codec` verilirse (bkz. wire.py) her olay odadaki bağlantıların
+    kullandığı her kodlama için bir kez kodlanır ve o kodlamanın kanalına
+    gönderilir; `encodings(oda)` odada kullanılan kodlamaları döndürür.
+    `batch` çerçevesinde olayların yükleri ayrı ayrı kodlanır.
+    """
+
+    def __init__(self, socketio, tick=0.05, codec=None, encodings=None):
+        self.socketio = socketio
+        self.tick = tick
+        self.codec = codec
+        self.encodings = encodings
+        self._pending = {}   # room_code -> [[event, data], ...]
+        self._lock = threading.Lock()
+        self._started = False
+        self.events = 0
+        self.frames = 0
+
+    def start(self):
+        """Boşaltma görevini (henüz çalışmıyorsa) başlatır."""
+        with self._lock:
+            if self._started or self.tick <= 0:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def emit(self, event, data, room_code, coalesce=True, skip_sid=None):
+        """Olayı odaya yayınlar; `coalesce` ise bir sonraki pencereye bırakır.
+
+        `skip_sid` yalnızca doğrudan gönderimde uygulanır; birleştirilmiş
+        çerçeve odadaki herkese gider.
+        """
+        if self._defer(event, data, room_code, coalesce):
+            return
+        self.flush(room_code)
+        for name, payload, room in self._frames(event, data, room_code):
+            self.socketio.emit(name, payload, room=room, skip_sid=skip_sid)
+
+    def _defer(self, event, data, room_code, coalesce):
+        # Olayı pencereye bırakırsa True; değilse doğrudan gönderim olarak sayar
+        if coalesce and self.tick > 0:
+            self.start()
+            with self._lock:
+                self.events += 1
+                self._pending.setdefault(room_code, []).append([event, data])
+            return True
+        with self._lock:
+            self.events += 1
+            self.frames += 1
+        return False
+
+    def _frames(self, event, data, room_code, batch=False):
+        # (olay, yük, socketio odası) üçlüleri; codec varsa kodlama başına bir tane
+        if self.codec is None:
+            return [(event, {'events': data} if batch else data, room_code)]
+        frames = []
+        for encoding in self.encodings(room_code):
+            if batch:
+                payload = {'events': [[name, self.codec.encode(item, encoding)] for name, item in data]}
+            else:
+                payload = self.codec.encode(data, encoding)
+            frames.append((event, payload, self.codec.channel(room_code, encoding)))
+        return frames
+
+    def _take(self, room_code=None):
+        # Bir odanın (ya da tüm odaların) bekleyen olaylarını çerçevelere çevirir
+        with self._lock:
+            if room_code is None:
+                pending, self._pending = self._pending, {}
+            else:
+                events = self._pending.pop(room_code, None)
+                pending = {room_code: events} if events else {}
+            self.frames += len(pending)
+        frames = []
+        for code, events in pending.items():
+            if len(events) == 1:
+                frames.extend(self._frames(events[0][0], events[0][1], code))
+            else:
+                frames.extend(self._frames('batch', events, code, batch=True))
+        return frames
+
+    def flush(self, room_code=None):
+        """Bir odanın (ya da tüm odaların) bekleyen olaylarını hemen gönderir."""
+        for event, payload, room in self._take(room_code):
+            self.socketio.emit(event, payload, room=room)
+
+    def discard(self, room_code):
+        """Silinen odanın bekleyen olaylarını atar."""
+        with self._lock:
+            self._pending.pop(room_code, None)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.tick)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Yayın birleştirme hatası: {e}")
+
+class AsyncBroadcastCoalescer(BroadcastCoalescer):
+    """socketio.AsyncServer için BroadcastCoalescer; `emit` ve `flush` eşyordamdır."""
+
+    async def emit(self, event, data, room_code, coalesce=True, skip_sid=None):
+        if self._defer(event, data, room_code, coalesce):
+            return
+        await self.flush(room_code)
+        await asyncio.gather(*[self.socketio.emit(name, payload, room=room, skip_sid=skip_sid)
+                               for name, payload, room in self._frames(event, data, room_code)])
+
+    async def flush(self, room_code=None):
+        # Her gönderim alıcıların görevlerini bekler; çerçeveler sırayla
+        # gönderilseydi son oda, yoğun bir döngüde oda sayısı kadar tur beklerdi
+        await asyncio.gather(*[self.socketio.emit(event, payload, room=room)
+                               for event, payload, room in self._take(room_code)])
+
+    async def _run(self):
+        while True:
+            await self.socketio.sleep(self.tick)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Yayın birleştirme hatası: {e}")
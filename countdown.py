@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Sunucu saatine eşitlenmiş, kaymayan geri sayım.
+
+`ClockSync`, NTP'deki gibi dört zaman damgasıyla (istemci gönderim,
+sunucu alış, sunucu gönderim, istemci alış) sunucu saatiyle yerel saat
+arasındaki farkı tahmin eder. Gidiş-dönüş süresi en kısa olan örnek en
+güvenilir kabul edilir.
+
+`Countdown`, sunucunun verdiği mutlak bitiş anını yerel monotonic saate
+çevirir ve kalan süreyi her seferinde bu andan hesaplar; `after`
+gecikmeleri birikmez. Ekran yalnızca gösterilen saniye değiştiğinde
+güncellenir ve bir sonraki çağrı tam o ana planlanır.
+"""
+
+import math
+import threading
+import time
+
+class ClockSync:
+    """Sunucu saatiyle yerel saat arasındaki farkın tahmini."""
+
+    def __init__(self, samples=8):
+        self.samples = samples
+        self._samples = []   # (gidiş-dönüş, fark)
+        self._lock = threading.Lock()
+        self.offset = 0.0
+        self.delay = None
+
+    def ping_payload(self):
+        """Sunucuya gönderilecek `clock_ping` verisi."""
+        return {'t0': time.time()}
+
+    def add_sample(self, t0, t1, t2, t3=None):
+        """Bir `clock_pong` yanıtını ekler ve güncel farkı döndürür.
+
+        t0: istemci gönderim, t1: sunucu alış, t2: sunucu gönderim,
+        t3: istemci alış zamanı (saniye, epoch).
+        """
+        t3 = time.time() if t3 is None else t3
+        delay = (t3 - t0) - (t2 - t1)
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        with self._lock:
+            self._samples.append((delay, offset))
+            del self._samples[:-self.samples]
+            self.delay, self.offset = min(self._samples)
+        return self.offset
+
+    def synced(self):
+        return self.delay is not None
+
+    def server_time(self):
+        """Sunucu saatine göre şimdiki zaman (epoch)."""
+        return time.time() + self.offset
+
+class Countdown:
+    """Tk üzerinde, mutlak bitiş anına göre çalışan geri sayım.
+
+    `on_tick(saniye)` gösterilen saniye her değiştiğinde, `on_expire()`
+    süre dolduğunda bir kez çağrılır. `clock` verilirse bitiş anı sunucu
+    saatine göre yorumlanır.
+    """
+
+    def __init__(self, root, on_tick, on_expire=None, clock=None):
+        self.root = root
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.clock = clock
+        self._deadline = None   # yerel monotonic bitiş anı
+        self._shown = None
+        self._job = None
+
+    def start(self, deadline=None, duration=None):
+        """Geri sayımı başlatır.
+
+        `deadline` sunucu saatine göre mutlak bitiş anıdır (epoch); yoksa
+        `duration` saniye sonrası kullanılır.
+        """
+        self.stop()
+        if deadline is not None:
+            now = self.clock.server_time() if self.clock is not None else time.time()
+            duration = deadline - now
+        self._deadline = time.monotonic() + max(0.0, duration or 0.0)
+        self._shown = None
+        self._tick()
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self._deadline = None
+
+    @property
+    def running(self):
+        return self._deadline is not None
+
+    def remaining(self):
+        """Kalan süre (saniye, kesirli); çalışmıyorsa 0."""
+        if self._deadline is None:
+            return 0.0
+        return max(0.0, self._deadline - time.monotonic())
+
+    def _tick(self):
+        self._job = None
+        if self._deadline is None:
+            return
+        remaining = self._deadline - time.monotonic()
+        seconds = max(0, math.ceil(remaining))
+        if seconds != self._shown:
+            self._shown = seconds
+            self.on_tick(seconds)
+            if self._deadline is None:
+                # on_tick geri sayımı durdurdu
+                return
+        if seconds <= 0:
+            self._deadline = None
+            if self.on_expire is not None:
+                self.on_expire()
+            return
+        # Gösterilen saniyenin değişeceği ana kadar bekle
+        delay = remaining - (seconds - 1)
+        self._job = self.root.after(max(1, math.ceil(delay * 1000)), self._tick)
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Masaüstü uygulaması ve oyun sunucusu için ortak SQLite erişim katmanı.
+
+Bağlantılar bir havuzda tutulur ve tekrar kullanılır; her bağlantı
+açılırken WAL günlüğü ve ayarlı pragmalar bir kez uygulanır. WAL modunda
+okuyucular (skor tablosu, soru çekme) yazıcıları (skor kaydı, soru ekleme)
+beklemez. Sorgular sabit metinli olduğundan sqlite3'ün bağlantı başına
+ifade önbelleği sayesinde her çağrıda yeniden derlenmez.
+
+Şema sürümü `PRAGMA user_version` içinde tutulur. `migrate()` mevcut
+veritabanını `MIGRATIONS` listesindeki bekleyen adımlarla yerinde
+günceller; yeni bir veritabanı da aynı adımlarla sıfırdan kurulur.
+"""
+
+import datetime
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+
+DB_PATH = "quiz_data.db"
+
+QuestionRow = namedtuple("QuestionRow", [
+    "id", "category", "difficulty", "question", "correct_answer",
+    "option1", "option2", "option3", "option4"
+])
+HighScore = namedtuple("HighScore", ["player_name", "score", "date"])
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA busy_timeout=5000",
+)
+
+def content_hash(category, difficulty, question, correct_answer, options):
+    """Sorunun içeriğinden kararlı bir özet üretir."""
+    key = json.dumps([category, difficulty, question, correct_answer, list(options)], ensure_ascii=False)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def normalize_name(name):
+    """Takım adını karşılaştırma için normalleştirir.
+
+    Baştaki/sondaki ve yinelenen boşluklar atılır; Türkçe I/İ harfleri
+    doğru küçültülür ("IŞIK" ve "ışık" aynı ada karşılık gelir).
+    """
+    name = " ".join(str(name).split())
+    return name.replace("I", "ı").replace("İ", "i").casefold()
+
+# Şema geçişleri: (sürüm, fonksiyon). Yeni geçişler listenin sonuna eklenir,
+# mevcut geçişler değiştirilmez.
+
+def _migration_base_tables(conn):
+    # Sorular tablosu
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY,
+        category TEXT,
+        difficulty TEXT,
+        question TEXT,
+        correct_answer TEXT,
+        option1 TEXT,
+        option2 TEXT,
+        option3 TEXT,
+        option4 TEXT
+    )
+    ''')
+
+    # Yüksek skorlar tablosu
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS high_scores (
+        id INTEGER PRIMARY KEY,
+        player_name TEXT,
+        score INTEGER,
+        date TEXT
+    )
+    ''')
+
+def _migration_content_hash(conn):
+    # Toplu içe aktarmada tekrarları ayıklamak için içerik özeti ve ilerleme tablosu
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(questions)")]
+    if "content_hash" not in columns:
+        conn.execute("ALTER TABLE questions ADD COLUMN content_hash TEXT")
+
+    seen = set()
+    rows = conn.execute(
+        "SELECT id, category, difficulty, question, correct_answer, option1, option2, option3, option4 "
+        "FROM questions WHERE content_hash IS NULL ORDER BY id"
+    ).fetchall()
+    for row in rows:
+        digest = content_hash(row[1], row[2], row[3], row[4], row[5:9])
+        if digest in seen:
+            # Aynı sorunun eski kopyası; benzersiz dizini bozmasın diye kimliğe bağla
+            digest = f"{digest}:{row[0]}"
+        seen.add(digest)
+        conn.execute("UPDATE questions SET content_hash = ? WHERE id = ?", (digest, row[0]))
+
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash ON questions(content_hash)")
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS import_progress (
+        path TEXT PRIMARY KEY,
+        file_size INTEGER,
+        byte_offset INTEGER,
+        records INTEGER
+    )
+    ''')
+
+def _migration_indexes(conn):
+    # Filtreli soru çekme ve skor tablosu sorguları için dizinler
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_category_difficulty ON questions(category, difficulty)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_high_scores_score ON high_scores(score DESC)")
+
+def _migration_player_key(conn):
+    # Takım adlarının normalleştirilmiş hali
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(high_scores)")]
+    if "player_key" not in columns:
+        conn.execute("ALTER TABLE high_scores ADD COLUMN player_key TEXT")
+    rows = conn.execute("SELECT id, player_name FROM high_scores").fetchall()
+    conn.executemany(
+        "UPDATE high_scores SET player_key = ? WHERE id = ?",
+        [(normalize_name(name or ""), row_id) for row_id, name in rows]
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_high_scores_player_key ON high_scores(player_key, score DESC)")
+
+def _migration_score_boards(conn):
+    # Kategori ve gün bazlı skor tabloları için
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(high_scores)")]
+    if "category" not in columns:
+        conn.execute("ALTER TABLE high_scores ADD COLUMN category TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_high_scores_category_score ON high_scores(category, score DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_high_scores_date ON high_scores(date)")
+
+MIGRATIONS = (
+    (1, _migration_base_tables),
+    (2, _migration_content_hash),
+    (3, _migration_indexes),
+    (4, _migration_player_key),
+    (5, _migration_score_boards),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def _timed(method):
+    # Gözlemci atanmışsa sorgunun süresini metot adıyla bildirir
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        observer = self.observer
+        if observer is None:
+            return method(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            observer(name, time.perf_counter() - started)
+    return wrapper
+
+class Database:
+    """Havuzlanmış bağlantılarla çalışan SQLite erişim nesnesi.
+
+    `observer(sorgu, saniye)` atanırsa sorgu metotlarının ve işlemlerin
+    (commit dahil) süreleri bu fonksiyona bildirilir.
+    """
+
+    def __init__(self, path=DB_PATH, pool_size=4):
+        self.path = path
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self.observer = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, cached_statements=128)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Havuzdan bir bağlantı ödünç verir; havuz boşsa yenisini açar."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Başarılıysa işlenen, hata olursa geri alınan bir işlem açar."""
+        started = time.perf_counter()
+        try:
+            with self.connection() as conn:
+                with conn:
+                    yield conn
+        finally:
+            if self.observer is not None:
+                self.observer('transaction', time.perf_counter() - started)
+
+    def close(self):
+        """Havuzdaki tüm bağlantıları kapatır."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def schema_version(self):
+        """Veritabanının kayıtlı şema sürümünü döndürür."""
+        with self.connection() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self):
+        """Bekleyen şema geçişlerini sırayla uygular ve son sürümü döndürür.
+
+        Her geçiş kendi işleminde çalışır; sürüm numarası (`user_version`)
+        geçişle birlikte yazılır. Yarıda kalan bir geçiş geri alınır ve bir
+        sonraki açılışta yeniden denenir.
+        """
+        with self.connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, migration in MIGRATIONS:
+                if target <= version:
+                    continue
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Başka bir süreç aynı geçişi bu arada uygulamış olabilir
+                    if conn.execute("PRAGMA user_version").fetchone()[0] < target:
+                        migration(conn)
+                        conn.execute(f"PRAGMA user_version = {target}")
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                version = target
+            return version
+
+    @_timed
+    def fetch_questions(self, category=None, difficulty=None):
+        """Soruları `QuestionRow` listesi olarak döndürür.
+
+        Kategori ve zorluk filtreleri (category, difficulty) dizinini kullanır.
+        """
+        query = ("SELECT id, category, difficulty, question, correct_answer, "
+                 "option1, option2, option3, option4 FROM questions")
+        conditions = []
+        params = []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if difficulty is not None:
+            conditions.append("difficulty = ?")
+            params.append(difficulty)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self.connection() as conn:
+            return [QuestionRow(*row) for row in conn.execute(query, params).fetchall()]
+
+    @_timed
+    def question_count(self):
+        """Soru sayısını döndürür."""
+        with self.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    @contextmanager
+    def _writer(self, conn):
+        # Verilen bağlantıyı (çağıranın işlemi) ya da yeni bir işlemi kullan
+        if conn is not None:
+            yield conn
+        else:
+            with self.transaction() as conn:
+                yield conn
+
+    @_timed
+    def insert_question(self, category, difficulty, question, correct_answer, options, conn=None):
+        """Yeni bir soru ekler ve kimliğini döndürür."""
+        with self._writer(conn) as conn:
+            cur = conn.execute(
+                "INSERT INTO questions (category, difficulty, question, correct_answer, option1, option2, option3, option4, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (category, difficulty, question, correct_answer, options[0], options[1], options[2], options[3],
+                 content_hash(category, difficulty, question, correct_answer, options))
+            )
+            return cur.lastrowid
+
+    def insert_score(self, player_name, score, date, category=None):
+        """Bir skoru kaydeder."""
+        self.insert_scores([(player_name, score, date, category)])
+
+    @_timed
+    def insert_scores(self, scores, conn=None):
+        """(isim, skor, tarih, kategori) dörtlülerini tek işlemde kaydeder.
+
+        `conn` verilirse yazma çağıranın açtığı işlemin içinde yapılır.
+        """
+        with self._writer(conn) as conn:
+            conn.executemany(
+                "INSERT INTO high_scores (player_name, player_key, score, date, category) VALUES (?, ?, ?, ?, ?)",
+                [(name, normalize_name(name), score, date, category) for name, score, date, category in scores]
+            )
+
+    @staticmethod
+    def _score_filter(category, day):
+        # Gün filtresi tarih dizinini kullanabilmesi için aralık olarak yazılır
+        conditions = []
+        params = []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if day is not None:
+            next_day = (datetime.date.fromisoformat(day) + datetime.timedelta(days=1)).isoformat()
+            conditions.append("date >= ? AND date < ?")
+            params.extend((day, next_day))
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    @_timed
+    def top_scores(self, limit=10, category=None, day=None):
+        """En yüksek skorları `HighScore` listesi olarak döndürür."""
+        where, params = self._score_filter(category, day)
+        with self.connection() as conn:
+            cur = conn.execute(
+                f"SELECT player_name, score, date FROM high_scores{where} ORDER BY score DESC LIMIT ?",
+                params + [limit]
+            )
+            return [HighScore(*row) for row in cur.fetchall()]
+
+    @_timed
+    def best_scores(self, category=None, day=None):
+        """Her takımın (normalleştirilmiş ad) en iyi skorunu döndürür."""
+        where, params = self._score_filter(category, day)
+        with self.connection() as conn:
+            return conn.execute(
+                f"SELECT player_key, MAX(score) FROM high_scores{where} GROUP BY player_key", params
+            ).fetchall()
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+def get_database(path=DB_PATH):
+    """Verilen dosya için paylaşılan `Database` nesnesini döndürür."""
+    with _databases_lock:
+        db = _databases.get(path)
+        if db is None:
+            db = _databases[path] = Database(path)
+        return db
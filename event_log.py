@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Oyun olayları için yalnızca sona eklenen (append-only) günlük.
+
+Olaylar sıra numarası ve zaman damgasıyla bölüt (segment) dosyalarına
+yazılır. Her kayıt `uzunluk | crc32 | JSON` biçimindedir; çökme anında
+yarım kalan son kayıt CRC ile tanınır ve okunurken atlanır. Günlük yeniden
+açılırken son bölüt son sağlam kayda kadar kısaltılır, böylece yeni
+olaylar okunamayan baytların arkasına yazılmaz.
+
+Yazma işi ayrı bir iş parçacığında yapılır: `append` yalnızca kuyruğa
+ekler. Yazıcı kuyrukta biriken olayları tek bir `write` ile yazar ve grup
+başına bir kez `fsync` çağırır; yük arttıkça gruplar büyür. Bölüt
+belirlenen boyutu aşınca yeni bir dosyaya geçilir. Dosya adı bölütün ilk
+sıra numarasını içerir (`events-000000000042.log`), böylece adlara göre
+sıralamak olay sırasını verir.
+"""
+
+import atexit
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+HEADER = struct.Struct('>II')
+SEGMENT_PREFIX = 'events-'
+SEGMENT_SUFFIX = '.log'
+
+_STOP = object()
+
+def segment_name(first_seq):
+    return f"{SEGMENT_PREFIX}{first_seq:012d}{SEGMENT_SUFFIX}"
+
+def list_segments(directory):
+    """Dizindeki (ve alt dizinlerindeki) bölüt dosyalarını sıralı döndürür."""
+    segments = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        names = sorted(name for name in files
+                       if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+        segments.extend(os.path.join(root, name) for name in names)
+    return segments
+
+def encode_event(event):
+    payload = json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def scan_segment(path):
+    """Bölütteki (olay, kaydın bittiği konum) çiftlerini sırayla üretir;
+    bozuk ya da yarım kayıtta durur."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    view = memoryview(data)
+    offset = 0
+    end = len(data)
+    while offset + HEADER.size <= end:
+        length, crc = HEADER.unpack_from(view, offset)
+        start = offset + HEADER.size
+        payload = view[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        offset = start + length
+        yield json.loads(bytes(payload)), offset
+
+def read_segment(path):
+    """Bölütteki olayları sırayla üretir; bozuk ya da yarım kayıtta durur."""
+    for event, _ in scan_segment(path):
+        yield event
+
+def read_events(directory):
+    """Dizindeki tüm bölütlerin olaylarını sırayla üretir."""
+    for path in list_segments(directory):
+        yield from read_segment(path)
+
+class EventLog:
+    """Bölüt dosyalarına gruplanmış ve fsync'lenmiş olay yazıcısı."""
+
+    def __init__(self, directory, segment_bytes=64 << 20, max_batch=4096, fsync=True):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_batch = max_batch
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._seq = self._last_seq() + 1
+        self._queue = queue.Queue()
+        self._file = None
+        self._size = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _last_seq(self):
+        segments = list_segments(self.directory)
+        if not segments:
+            return 0
+        path = segments[-1]
+        last = 0
+        good = 0
+        for event, good in scan_segment(path):
+            last = event['seq']
+        if os.path.getsize(path) > good:
+            # Çökmede yarım kalan kaydı at; yoksa bu bölüte eklenecek olaylar
+            # okuyucunun durduğu yerin arkasında kalır
+            print(f"Olay günlüğü: {path} son sağlam kayda ({good} bayt) kısaltıldı")
+            with open(path, 'r+b') as file:
+                file.truncate(good)
+        if not last:
+            # Son bölüt boşsa adındaki sıra numarasından devam et
+            name = os.path.basename(segments[-1])
+            last = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) - 1
+        return last
+
+    def append(self, event_type, room_code=None, ts=None, **fields):
+        """Olayı kuyruğa ekler ve sıra numarasını döndürür."""
+        if self._closed:
+            return None
+        with self._lock:
+            seq = self._seq
+            self._seq += 1
+            event = {'seq': seq, 'ts': ts or time.time(), 'type': event_type, 'room': room_code}
+            event.update(fields)
+            # Sıra numarasıyla kuyruk sırası aynı kalsın diye kilit altında ekle
+            self._queue.put(event)
+        return seq
+
+    def flush(self, timeout=None):
+        """Şu ana kadar eklenen olaylar diske yazılana kadar bekler."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10):
+        """Bekleyen olayları yazar ve yazıcıyı durdurur."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _open_segment(self, first_seq):
+        path = os.path.join(self.directory, segment_name(first_seq))
+        self._file = open(path, 'ab')
+        self._size = self._file.tell()
+        if self.fsync:
+            # Yeni dosyanın dizin kaydı da kalıcı olsun
+            fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = []
+            waiters = []
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    events.append(item)
+
+            if events:
+                try:
+                    self._write(events)
+                except OSError as e:
+                    print(f"Olay günlüğü yazılamadı: {e}")
+                    # Yarım yazılmış olabilecek bölüte devam etme; sonraki grup yeni dosyaya
+                    self._close_segment()
+            for waiter in waiters:
+                waiter.set()
+
+        self._close_segment()
+
+    def _close_segment(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _write(self, events):
+        if self._file is None:
+            self._open_segment(events[0]['seq'])
+        data = b''.join(encode_event(event) for event in events)
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+        if self._size >= self.segment_bytes:
+            # Bölüt doldu; sonraki grup yeni dosyaya yazılır
+            self._file.close()
+            self._file = None
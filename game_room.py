@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Bir odanın oyun durumu (takımlar, hazır durumları, skorlar, cevaplar).
+
+Takımlar odaya girdikleri sırayla tamsayı kimlik alır; isim yalnızca
+kimliğe çevrilirken kullanılır. Hazır durumları bayt dizisinde, skorlar
+kimlik sırasıyla bir listede tutulur; hazır takım sayısı bir sayaçla
+izlenir.
+
+Her soru bir "tur" açar: henüz cevap vermemiş takımların isim -> kimlik
+sözlüğü, doğru cevap ve soru numarası. Cevap veren takım sözlükten çıkar;
+"herkes cevap verdi mi" sözlüğün boş olmasıdır. Sonuç açıklanınca tur
+kapanır ve sonraki soruda yenisi açılır.
+
+Ayrılan takımın kimliği ve skoru saklanır; aynı isimle geri dönen takım
+skoruyla birlikte aynı kimliği kullanır.
+
+Dosya doğrudan çalıştırılırsa eski sözlük tabanlı gösterimle bellek ve
+cevap başına işlem süresini karşılaştıran küçük bir ölçüm yapar:
+
+    python game_room.py --teams 5000
+"""
+
+import threading
+import time
+
+# Cevap penceresi kapalıyken kullanılan tur; bekleyen takımı yoktur
+_CLOSED_TURN = ({}, None, None)
+
+class GameRoom:
+    """Bir odanın oyun durumu.
+
+    Tüm durum değişiklikleri `self.lock` altında yapılır; yayınlanacak veriler
+    kilit altında kopyalanıp kilit dışında gönderilir. Tek istisna cevap
+    yoludur (`submit_answer`, `all_teams_answered`): turu bir kez okur ve
+    takımı tek bir `dict.pop` ile bekleyenlerden çıkarır, bu yüzden kilit
+    almadan da bir takımın cevabı bir turda en fazla bir kez sayılır.
+
+    Takım listesi sürümlüdür: her üyelik değişikliği (`add`, `remove`,
+    `ready`) sürümü bir artırır ve yalnızca değişikliği taşıyan küçük bir
+    yama (`room_patch`) üretir. İstemci sürümde boşluk görürse tam listeyi
+    (`room_snapshot`) ister.
+    """
+
+    __slots__ = ('lock', 'room_code', 'chat', 'version', 'started', 'current_question',
+                 'questions', 'question_time', 'host_id', 'names', 'ids', 'alive',
+                 'ready', 'scores', 'turn', 'away', 'team_count', 'ready_count',
+                 'last_active', 'finished_at')
+
+    def __init__(self, room_code, host_name, chat=None):
+        self.lock = threading.RLock()
+        self.room_code = room_code
+        self.chat = chat
+        self.version = 0
+        self.started = False
+        self.current_question = 0
+        self.questions = []
+        self.question_time = None
+
+        self.names = []                  # kimlik -> takım adı
+        self.ids = {}                    # takım adı -> kimlik
+        self.alive = bytearray()         # takım odada mı
+        self.ready = bytearray()         # hazır mı
+        self.scores = []                 # skor
+        self.turn = _CLOSED_TURN         # (bekleyenler, doğru cevap, soru numarası)
+        self.away = {}                   # bu turda cevap vermeden ayrılanlar
+        self.team_count = 0
+        self.ready_count = 0
+        self.last_active = time.monotonic()
+        self.finished_at = None
+        self.host_id = self._add(host_name)
+
+    def _add(self, team_name):
+        # Çağıran kilidi tutmalıdır
+        team_id = self.ids.get(team_name)
+        if team_id is None:
+            team_id = len(self.names)
+            self.ids[team_name] = team_id
+            self.names.append(team_name)
+            self.alive.append(1)
+            self.ready.append(0)
+            self.scores.append(0)
+            if self.turn is not _CLOSED_TURN:
+                self.turn[0][team_name] = team_id
+        else:
+            self.alive[team_id] = 1
+            # Bu turda cevap vermeden ayrılmışsa yine beklenir
+            if self.away.pop(team_name, None) is not None and self.turn is not _CLOSED_TURN:
+                self.turn[0][team_name] = team_id
+        self.team_count += 1
+        return team_id
+
+    def _team(self, team_id):
+        return {'name': self.names[team_id], 'is_host': team_id == self.host_id,
+                'ready': bool(self.ready[team_id])}
+
+    def _live_id(self, team_name):
+        # Çağıran kilidi tutmalıdır
+        team_id = self.ids.get(team_name)
+        if team_id is None or not self.alive[team_id]:
+            return None
+        return team_id
+
+    def snapshot(self):
+        """Takım listesini sürümüyle birlikte döndürür."""
+        with self.lock:
+            return {
+                'room_code': self.room_code,
+                'version': self.version,
+                'teams': [self._team(team_id) for team_id in range(len(self.names))
+                          if self.alive[team_id]]
+            }
+
+    def touch(self):
+        """Odanın son etkinlik zamanını günceller (boşta kalma süresi için)."""
+        self.last_active = time.monotonic()
+
+    def expiry_reason(self, now, idle_ttl, finished_ttl, abandoned_ttl):
+        """Oda kapatılmalıysa nedenini döndürür, yoksa None.
+
+        'abandoned': ev sahibi ayrılmış (oyun başlatılamaz) ya da odada
+        kimse kalmamış; 'finished': oyun bitmiş ve yenisi başlamamış;
+        'idle': uzun süredir hiçbir etkinlik yok.
+        """
+        with self.lock:
+            idle = now - self.last_active
+            if self.started:
+                # Oyun sürerken turlar etkinlik sayılır; yalnızca takılan oyun kapanır
+                return 'idle' if idle >= idle_ttl else None
+            if (self.host_id is None or not self.team_count) and idle >= abandoned_ttl:
+                return 'abandoned'
+            if self.finished_at is not None and now - self.finished_at >= finished_ttl \
+                    and idle >= finished_ttl:
+                return 'finished'
+            if idle >= idle_ttl:
+                return 'idle'
+            return None
+
+    def _patch(self, op, **fields):
+        # Çağıran kilidi tutmalıdır
+        self.last_active = time.monotonic()
+        self.version += 1
+        patch = {'room_code': self.room_code, 'version': self.version, 'op': op}
+        patch.update(fields)
+        return patch
+
+    def scores_snapshot(self):
+        """Skorların yayınlanabilir bir kopyasını döndürür (ayrılan takımlar dahil)."""
+        with self.lock:
+            return dict(zip(self.names, self.scores))
+
+    def add_team(self, team_name):
+        """Takımı odaya ekler ve yamayı döndürür; isim kullanılıyorsa None döner."""
+        with self.lock:
+            if self._live_id(team_name) is not None:
+                return None
+            team_id = self._add(team_name)
+            return self._patch('add', team=self._team(team_id))
+
+    def remove_team(self, team_name):
+        """Takımı odadan çıkarır; (kalan takım sayısı, yama) döndürür."""
+        with self.lock:
+            team_id = self._live_id(team_name)
+            if team_id is None:
+                return self.team_count, None
+            self.alive[team_id] = 0
+            self.team_count -= 1
+            if self.ready[team_id]:
+                self.ready[team_id] = 0
+                self.ready_count -= 1
+            if self.turn[0].pop(team_name, None) is not None:
+                self.away[team_name] = team_id
+            if team_id == self.host_id:
+                self.host_id = None
+            if self.chat is not None:
+                self.chat.forget(team_name)
+            return self.team_count, self._patch('remove', name=team_name)
+
+    def has_team(self, team_name):
+        """Takım odada mı kontrol eder."""
+        with self.lock:
+            return self._live_id(team_name) is not None
+
+    def toggle_ready(self, team_name):
+        """Ev sahibi olmayan takımın hazır durumunu değiştirir ve yamayı döndürür."""
+        with self.lock:
+            team_id = self._live_id(team_name)
+            if team_id is None or team_id == self.host_id:
+                return None
+            ready = not self.ready[team_id]
+            self.ready[team_id] = ready
+            self.ready_count += 1 if ready else -1
+            return self._patch('ready', name=team_name, ready=ready)
+
+    def _all_ready(self):
+        # Ev sahibi hazır sayılır
+        host_present = self.host_id is not None and self.alive[self.host_id]
+        return self.ready_count >= self.team_count - host_present
+
+    def start(self, questions, question_time):
+        """Herkes hazırsa oyunu verilen sorularla başlatır."""
+        with self.lock:
+            if self.started or not questions or not self._all_ready():
+                return False
+            self.started = True
+            self.current_question = 0
+            self.questions = questions
+            self.question_time = question_time
+            self.finished_at = None
+            self.touch()
+            self._open_turn()
+            return True
+
+    def all_ready(self):
+        """Ev sahibi dışındaki tüm takımlar hazır mı kontrol eder."""
+        with self.lock:
+            return self._all_ready()
+
+    def _open_turn(self):
+        # Çağıran kilidi tutmalıdır; mevcut soru için odadaki takımları bekler
+        self.away = {}
+        waiting = {name: team_id for team_id, name in enumerate(self.names) if self.alive[team_id]}
+        self.turn = (waiting, self.questions[self.current_question]['correct_answer'],
+                     self.current_question + 1)
+
+    def reset_answers(self):
+        """Tüm takımların cevaplarını sıfırlar ve cevap penceresini açar."""
+        with self.lock:
+            self._open_turn()
+
+    def submit_answer(self, team_name, answer):
+        """Takımın cevabını kaydeder ve doğruysa puan verir.
+
+        Cevabın sayıldığı sorunun numarasını döndürür; cevap penceresi
+        kapalıysa, takım odada değilse ya da bu turda cevap verdiyse None döner.
+        """
+        waiting, correct_answer, number = self.turn
+        team_id = waiting.pop(team_name, None)
+        if team_id is None:
+            return None
+        if answer == correct_answer:
+            self.scores[team_id] += 10
+        return number
+
+    def all_teams_answered(self):
+        """Tüm takımlar cevap verdi mi kontrol eder."""
+        return not self.turn[0]
+
+    def current_results(self):
+        """Mevcut sorunun doğru cevabını ve skorları döndürür."""
+        with self.lock:
+            if not self.started:
+                return None
+            return {
+                'correct_answer': self.questions[self.current_question]['correct_answer'],
+                'question_number': self.current_question + 1,
+                'scores': dict(zip(self.names, self.scores))
+            }
+
+    def close_answers(self):
+        """Cevap penceresini kapatır ve sonuçları döndürür (bkz. `current_results`).
+
+        Sonuç açıklandıktan sonra gelen cevaplar doğru cevabı gördükten sonra
+        verilmiş olabileceğinden sayılmaz; pencere sonraki soruda açılır.
+        """
+        with self.lock:
+            waiting = self.turn[0]
+            self.turn = _CLOSED_TURN
+            # Turu kapanmadan önce okumuş bir cevap da artık kabul edilmez
+            waiting.clear()
+            return self.current_results()
+
+    def question_payload(self, index=None):
+        """Sorunun istemcilere gönderilecek halini döndürür (varsayılan: mevcut soru).
+
+        Doğru cevap gönderilmez; istemciler onu yalnızca sonuç açıklamasında
+        (`show_results`) öğrenir.
+        """
+        with self.lock:
+            if index is None:
+                index = self.current_question
+            question = self.questions[index]
+            return {
+                'question': question['question'],
+                'answer_a': question['options'][0],
+                'answer_b': question['options'][1],
+                'answer_c': question['options'][2],
+                'answer_d': question['options'][3],
+                'question_number': index + 1,
+                'time': self.question_time
+            }
+
+    def next_question_payload(self):
+        """Sıradaki sorunun yükünü döndürür; son sorudaysa None döner."""
+        with self.lock:
+            if not self.started or self.current_question + 1 >= len(self.questions):
+                return None
+            return self.question_payload(self.current_question + 1)
+
+    def get_next_question(self):
+        """Bir sonraki soruyu döndürür."""
+        with self.lock:
+            self.touch()
+            self.current_question += 1
+            if self.current_question < len(self.questions):
+                self._open_turn()
+                return self.question_payload()
+            self.turn = _CLOSED_TURN
+            self.started = False
+            self.finished_at = self.last_active
+            return None
+
+class _DictRoom:
+    # Karşılaştırma için ilk sürümdeki gösterim ve cevap yolu, birebir:
+    # takımlar sözlük listesi, skorlar ve cevaplar isimle anahtarlanmış sözlükler
+    def __init__(self, host_name):
+        self.teams = [{"name": host_name, "is_host": True, "ready": False}]
+        self.scores = {host_name: 0}
+        self.answers = {}
+        self.questions = []
+        self.current_question = 0
+
+    def submit_answer(self, team_name, answer):
+        if team_name not in self.answers:
+            self.answers[team_name] = answer
+            if answer == self.questions[self.current_question]['correct_answer']:
+                self.scores[team_name] = self.scores.get(team_name, 0) + 10
+            return True
+        return False
+
+    def all_teams_answered(self):
+        return len(self.answers) == len(self.teams)
+
+def main(argv=None):
+    import argparse
+    import json
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(description="GameRoom bellek ve cevap işleme ölçümü")
+    parser.add_argument('--teams', type=int, default=5000, help="odadaki takım sayısı")
+    parser.add_argument('--repeat', type=int, default=5, help="süre ölçümü tekrar sayısı (en iyisi alınır)")
+    args = parser.parse_args(argv)
+
+    names = [f"takim-{i}" for i in range(args.teams)]
+    questions = [{'question': 'Soru', 'options': ['A', 'B', 'C', 'D'], 'correct_answer': 'B'}]
+
+    def build_compact():
+        room = GameRoom('000000', names[0])
+        for name in names[1:]:
+            room._add(name)  # lobi yamaları ölçüme katılmasın
+        room.ready_count = room.team_count - 1
+        room.start(questions, 30)
+        return room
+
+    def build_dict():
+        room = _DictRoom(names[0])
+        # Eski add_team her eklemede listeyi taradığı için O(n^2); doğrudan kur
+        for name in names[1:]:
+            room.teams.append({'name': name, 'is_host': False, 'ready': True})
+            room.scores[name] = 0
+        room.questions = questions
+        return room
+
+    def measure(build, reset):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        room = build()
+        reset(room)
+        for name in names:
+            room.submit_answer(name, 'B')
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        # Cevap başına süre: her cevapta "herkes cevap verdi mi" de sorulur
+        elapsed = float('inf')
+        for _ in range(max(1, args.repeat)):
+            reset(room)
+            started = time.perf_counter()
+            for name in names:
+                room.submit_answer(name, 'B')
+                room.all_teams_answered()
+            elapsed = min(elapsed, time.perf_counter() - started)
+        return {'bytes_per_team': round(memory / len(names), 1),
+                'us_per_answer': round(elapsed / len(names) * 1e6, 3)}
+
+    result = {
+        'teams': args.teams,
+        'dict': measure(build_dict, lambda room: room.answers.clear()),
+        'compact': measure(build_compact, GameRoom.reset_answers),
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Soru bankasını JSON ya da NDJSON dosyasından veritabanına aktarır.
+
+Dosya parça parça okunur; bellekte aynı anda yalnızca bir okuma parçası ve
+bir kayıt tutulur. Kayıtlar büyük `executemany` gruplarıyla eklenir,
+belirli aralıklarla ilerleme kaydıyla birlikte aynı işlemde kalıcı hale
+getirilir. Her sorunun içerik özeti (hash) benzersiz olduğundan aynı soru
+ikinci kez eklenmez. Yarıda kalan bir aktarım aynı komutla kaldığı yerden
+sürer.
+
+Kullanım:
+    python import_questions.py sorular.ndjson --db quiz_data.db
+"""
+
+import argparse
+import codecs
+import json
+import os
+import sys
+import time
+
+from database import DB_PATH, content_hash, get_database
+
+CHUNK_SIZE = 1 << 16
+MAX_RECORD_SIZE = 16 << 20
+
+INSERT_SQL = (
+    "INSERT OR IGNORE INTO questions (category, difficulty, question, correct_answer, "
+    "option1, option2, option3, option4, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+def detect_format(path):
+    """Dosyanın ilk anlamlı karakterine bakarak 'json' ya da 'ndjson' döndürür."""
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(4096)
+            if not chunk:
+                return 'ndjson'
+            stripped = chunk.lstrip(b'\xef\xbb\xbf \t\r\n')
+            if stripped:
+                return 'json' if stripped[:1] == b'[' else 'ndjson'
+
+def iter_ndjson(file, offset=0):
+    """Satır başına bir kayıt içeren dosyadan (kayıt, bitiş konumu) üretir."""
+    file.seek(offset)
+    position = offset
+    for line in file:
+        position += len(line)
+        line = line.strip()
+        if line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8):]
+        if line:
+            yield json.loads(line), position
+
+def iter_json_array(file, offset=0, chunk_size=CHUNK_SIZE):
+    """Tek bir JSON dizisindeki nesnelerden (kayıt, bitiş konumu) üretir.
+
+    `offset` sıfırdan farklıysa bir kaydın hemen sonrasından (virgül ya da
+    kapanış köşeli parantezi beklenerek) devam edilir.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    file.seek(offset)
+    position = offset
+    buffer = ''
+    eof = False
+    state = 'separator' if offset else 'start'
+
+    while True:
+        # JSON boşluklarını atla
+        stripped = buffer.lstrip(' \t\r\n')
+        if len(stripped) != len(buffer):
+            position += len(buffer[:len(buffer) - len(stripped)].encode('utf-8'))
+            buffer = stripped
+
+        if state == 'value' and buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                if len(buffer) > MAX_RECORD_SIZE:
+                    raise ValueError(f"Kayıt {MAX_RECORD_SIZE} bayttan büyük (konum {position})")
+                record = None
+            if record is not None:
+                position += len(buffer[:end].encode('utf-8'))
+                buffer = buffer[end:]
+                state = 'separator'
+                yield record, position
+                continue
+        elif buffer:
+            char = buffer[0]
+            if state == 'start' and char == '\ufeff':
+                pass  # UTF-8 BOM
+            elif state == 'start':
+                if char != '[':
+                    raise ValueError("JSON dosyası bir dizi ile başlamalı")
+                state = 'first'
+            elif char == ']' and state in ('first', 'separator'):
+                return
+            elif char == ',' and state == 'separator':
+                state = 'value'
+            elif state == 'first':
+                state = 'value'
+                continue
+            else:
+                raise ValueError(f"Beklenmeyen karakter {char!r} (konum {position})")
+            position += len(char.encode('utf-8'))
+            buffer = buffer[1:]
+            continue
+
+        if eof:
+            raise ValueError("JSON dizisi beklenmedik şekilde bitti")
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            buffer += text_decoder.decode(b'', final=True)
+        else:
+            buffer += text_decoder.decode(chunk)
+
+def to_row(record):
+    """Kaydı ekleme parametrelerine çevirir; geçersizse None döner."""
+    try:
+        options = record["options"]
+        if len(options) != 4:
+            return None
+        category = str(record["category"]).strip()
+        difficulty = str(record["difficulty"]).strip()
+        question = str(record["question"]).strip()
+        correct_answer = str(record["correct_answer"]).strip()
+        options = [str(option).strip() for option in options]
+    except (KeyError, TypeError):
+        return None
+    if not question or correct_answer not in options:
+        return None
+    return (category, difficulty, question, correct_answer,
+            options[0], options[1], options[2], options[3],
+            content_hash(category, difficulty, question, correct_answer, options))
+
+def import_file(db, path, file_format='auto', batch_size=5000, commit_rows=50000,
+                restart=False, progress=None):
+    """Dosyayı veritabanına aktarır ve istatistik sözlüğü döndürür.
+
+    `progress` verilirse ara istatistiklerle periyodik olarak çağrılır.
+    `commit_rows` 0 ise tüm aktarım tek işlemde yapılır.
+    """
+    db.migrate()
+
+    key = os.path.abspath(path)
+    file_size = os.path.getsize(path)
+    if file_format == 'auto':
+        file_format = detect_format(path)
+
+    stats = {'read': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0, 'resumed_from': 0}
+    started = time.perf_counter()
+    last_report = started
+
+    with db.connection() as conn:
+        offset = 0
+        if not restart:
+            row = conn.execute(
+                "SELECT file_size, byte_offset FROM import_progress WHERE path = ?", (key,)
+            ).fetchone()
+            if row and row[0] == file_size:
+                offset = row[1]
+                stats['resumed_from'] = offset
+
+        if offset >= file_size:
+            # Dosya daha önce tamamen aktarılmış
+            stats['elapsed'] = 0.0
+            stats['rows_per_s'] = 0.0
+            return stats
+
+        def flush(batch, end_offset):
+            before = conn.total_changes
+            conn.executemany(INSERT_SQL, batch)
+            inserted = conn.total_changes - before
+            stats['inserted'] += inserted
+            stats['duplicates'] += len(batch) - inserted
+            conn.execute(
+                "INSERT OR REPLACE INTO import_progress (path, file_size, byte_offset, records) "
+                "VALUES (?, ?, ?, COALESCE((SELECT records FROM import_progress WHERE path = ?), 0) + ?)",
+                (key, file_size, end_offset, key, len(batch))
+            )
+
+        try:
+            with open(path, "rb") as file:
+                records = iter_json_array(file, offset) if file_format == 'json' else iter_ndjson(file, offset)
+                batch = []
+                uncommitted = 0
+                for record, end_offset in records:
+                    stats['read'] += 1
+                    row = to_row(record) if isinstance(record, dict) else None
+                    if row is None:
+                        stats['invalid'] += 1
+                        continue
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        flush(batch, end_offset)
+                        uncommitted += len(batch)
+                        batch = []
+                        if commit_rows and uncommitted >= commit_rows:
+                            conn.commit()
+                            uncommitted = 0
+                        now = time.perf_counter()
+                        if progress and now - last_report >= 1:
+                            last_report = now
+                            progress(dict(stats, elapsed=now - started))
+                flush(batch, file_size)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed'] = elapsed
+    stats['rows_per_s'] = stats['read'] / elapsed if elapsed else 0.0
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soru bankasını veritabanına aktarır")
+    parser.add_argument('path', help="JSON dizisi ya da NDJSON dosyası")
+    parser.add_argument('--db', default=DB_PATH, help="veritabanı dosyası")
+    parser.add_argument('--format', choices=['auto', 'json', 'ndjson'], default='auto')
+    parser.add_argument('--batch-size', type=int, default=5000, help="executemany grup büyüklüğü")
+    parser.add_argument('--commit-rows', type=int, default=50000,
+                        help="kaç satırda bir işlenip ilerleme kaydedileceği (0: tek işlem)")
+    parser.add_argument('--restart', action='store_true', help="kayıtlı ilerlemeyi yok sayıp baştan başla")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.db)
+
+    def report(stats):
+        rate = stats['read'] / stats['elapsed'] if stats['elapsed'] else 0
+        print(f"{stats['read']} kayıt okundu, {stats['inserted']} eklendi ({rate:.0f} satır/sn)", file=sys.stderr)
+
+    stats = import_file(db, args.path, args.format, args.batch_size, args.commit_rows,
+                        args.restart, progress=report)
+    print(json.dumps({k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}, ensure_ascii=False))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bisect
+import itertools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from database import HighScore, normalize_name
+from write_behind import WriteBehindQueue
+
+class FenwickTree:
+    """Skor değerleri üzerinde sıra istatistiği tutan Fenwick (BIT) ağacı.
+
+    Her skor değerinden kaç adet olduğunu saklar; bir skordan büyük kaç
+    skor olduğu ve k'ıncı en büyük skor O(log n) sürede bulunur. Aralık
+    dışına çıkan bir skor geldiğinde kapasite iki katına çıkarılır.
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self._size = size
+        self._tree = [0] * (size + 1)
+        self.total = 0
+
+    def _grow(self, value):
+        size = self._size
+        while size <= value:
+            size *= 2
+        counts = [self.count_between(i, i) for i in range(self._size)]
+        self._size = size
+        self._tree = [0] * (size + 1)
+        self.total = 0
+        for score, count in enumerate(counts):
+            if count:
+                self.add(score, count)
+
+    def add(self, score, count=1):
+        """`score` değerinden `count` adet ekler (negatifse çıkarır)."""
+        score = max(int(score), 0)
+        if score >= self._size:
+            self._grow(score)
+        self.total += count
+        i = score + 1
+        while i <= self._size:
+            self._tree[i] += count
+            i += i & -i
+
+    def count_at_most(self, score):
+        """`score` ve altındaki skorların sayısı."""
+        if score < 0:
+            return 0
+        i = min(int(score), self._size - 1) + 1
+        result = 0
+        while i:
+            result += self._tree[i]
+            i -= i & -i
+        return result
+
+    def count_between(self, low, high):
+        return self.count_at_most(high) - self.count_at_most(low - 1)
+
+    def count_above(self, score):
+        """`score` değerinden büyük skorların sayısı."""
+        return self.total - self.count_at_most(score)
+
+    def kth_largest(self, k):
+        """k'ıncı en büyük skoru döndürür (1'den başlar)."""
+        if k < 1 or k > self.total:
+            return None
+        # k'ıncı en büyük, (total - k + 1)'inci en küçüktür
+        remaining = self.total - k + 1
+        position = 0
+        step = self._size
+        while step:
+            nxt = position + step
+            if nxt <= self._size and self._tree[nxt] < remaining:
+                position = nxt
+                remaining -= self._tree[nxt]
+            step //= 2
+        return position
+
+class ScoreBoard:
+    """Tek bir skor tablosu: sınırlı ilk-K listesi ve sıra dizini.
+
+    İlk-K listesi tek tek oyun kayıtlarını tutar. Sıra dizininde ise her
+    takım yalnızca en iyi skoruyla bir kez bulunur; çok oyun oynayan bir
+    takım diğer takımları sıralamada aşağı itmez.
+    """
+
+    def __init__(self, top_k=100):
+        self.top_k = top_k
+        self._top = []    # (-skor, tarih, sıra, isim) sıralı
+        self._best = {}   # normalleştirilmiş ad -> en iyi skor
+        self._index = FenwickTree()   # takımların en iyi skorları
+        self._seq = 0
+
+    def load(self, top_scores, best_scores):
+        for player_key, score in best_scores:
+            self._best[player_key] = score or 0
+            self._index.add(score or 0)
+        for name, score, date in top_scores:
+            self._insert_top(name, score or 0, date)
+
+    def add(self, name, score, date, player_key=None):
+        player_key = player_key or normalize_name(name)
+        best = self._best.get(player_key)
+        if best is None or score > best:
+            if best is not None:
+                self._index.add(best, -1)
+            self._index.add(score)
+            self._best[player_key] = score
+        self._insert_top(name, score, date)
+
+    def merge(self, name, score, date):
+        """`add` gibi; kayıt tabloda zaten varsa (aynı isim, skor ve tarih)
+        ikinci kez eklemez. Veritabanından yüklenmiş olabilecek kayıtlar için."""
+        negative, date = -score, date or ""
+        i = bisect.bisect_left(self._top, (negative, date))
+        while i < len(self._top) and self._top[i][:2] == (negative, date):
+            if self._top[i][3] == name:
+                return
+            i += 1
+        self.add(name, score, date)
+
+    def _insert_top(self, name, score, date):
+        self._seq += 1
+        entry = (-score, date or "", self._seq, name)
+        if len(self._top) >= self.top_k and entry >= self._top[-1]:
+            return
+        bisect.insort(self._top, entry)
+        if len(self._top) > self.top_k:
+            self._top.pop()
+
+    def top(self, limit):
+        return [HighScore(name, -negative, date) for negative, date, _, name in self._top[:limit]]
+
+    def rank_of_score(self, score):
+        """Skorun takımların en iyi skorları arasındaki sırası (eşit skorlar
+        aynı sırayı paylaşır)."""
+        return self._index.count_above(score) + 1
+
+    def rank_of(self, name):
+        """Takımın en iyi skorunun sırası; takım tabloda yoksa None."""
+        best = self._best.get(normalize_name(name))
+        if best is None:
+            return None
+        return self.rank_of_score(best)
+
+    def __len__(self):
+        """Tablodaki takım sayısı."""
+        return self._index.total
+
+class Leaderboard:
+    """Genel, kategori ve gün bazlı skor tablolarını bellekte tutar.
+
+    Tablolar ilk istendiklerinde veritabanından bir kez yüklenir (takım
+    başına en iyi skor ve ilk K kayıt), sonra gelen her skorla artımlı
+    olarak güncellenir; okuma için veritabanına gidilmez.
+    Yeni skorlar yazma kuyruğuna (`WriteBehindQueue`) verilir ve arka
+    planda toplu halde yazılır; yazılana kadar bellekte bekleyen kayıtlar
+    arasında tutulur, böylece kaydeden taraf kendi skorunu hemen görür.
+
+    `_lock` yalnızca bellek yapılarını korur; tablolar kilitsiz yüklenir,
+    yazma kuyruğu meşgul veritabanını yeniden denerken okumalar beklemez.
+    Yükleme sürerken yazılan kayıtlar bir kenarda tutulur. Yükleme bitince
+    bekleyen ve bu sırada yazılan kayıtlar tabloya `ScoreBoard.merge` ile
+    eklenir; veritabanından zaten gelmiş bir kayıt iki kez sayılmaz.
+    Denemeleri tükenip yazılamayan skorlar kaybolmaz: günlüğe yazılır ve
+    süreç boyunca tablolarda kalır.
+    """
+
+    def __init__(self, db, writer=None, top_k=100, max_boards=64):
+        self.db = db
+        self.writer = writer or WriteBehindQueue(db)
+        self.top_k = top_k
+        self.max_boards = max_boards
+        self._boards = OrderedDict()   # (kategori, gün) -> ScoreBoard
+        self._pending = {}             # sıra -> (isim, skor, tarih, kategori)
+        self._failed = {}              # yazılamayan kayıtlar (aynı biçim)
+        self._settled = {}             # tablo yüklenirken yazılan kayıtlar
+        self._loading = 0              # süren yükleme sayısı
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _board_keys(category, date):
+        day = date[:10] if date else None
+        keys = [(None, None)]
+        if category is not None:
+            keys.append((category, None))
+        if day is not None:
+            keys.append((None, day))
+        if category is not None and day is not None:
+            keys.append((category, day))
+        return keys
+
+    def _board(self, category=None, day=None):
+        key = (category, day)
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None:
+                self._boards.move_to_end(key)
+                return board
+
+            self._loading += 1
+        try:
+            board = ScoreBoard(self.top_k)
+            board.load(
+                self.db.top_scores(self.top_k, category, day),
+                self.db.best_scores(category, day)
+            )
+            with self._lock:
+                loaded = self._boards.get(key)
+                if loaded is not None:
+                    return loaded
+                # Henüz yazılmamış, yükleme sırasında yazılmış ve yazılamamış skorlar
+                for rows in (self._pending, self._settled, self._failed):
+                    for name, score, date, score_category in rows.values():
+                        if key in self._board_keys(score_category, date):
+                            board.merge(name, score, date)
+                self._boards[key] = board
+                # En uzun süredir kullanılmayan tabloyu bırak (genel tablo hariç)
+                while len(self._boards) > self.max_boards:
+                    for old_key in self._boards:
+                        if old_key != (None, None):
+                            del self._boards[old_key]
+                            break
+                return board
+        finally:
+            with self._lock:
+                self._loading -= 1
+                if not self._loading:
+                    self._settled.clear()
+
+    def record(self, player_name, score, date=None, category=None):
+        """Skoru tablolara ekler ve takımın genel sıralamadaki yerini
+        (en iyi skoruyla) döndürür."""
+        date = date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        score = int(score)
+        self._board()  # genel tablo her zaman yüklü olsun
+        player_key = normalize_name(player_name)
+        row = (player_name, score, date, category)
+        with self._lock:
+            token = next(self._tokens)
+            self._pending[token] = row
+            for key in self._board_keys(category, date):
+                board = self._boards.get(key)
+                if board is not None:
+                    board.add(player_name, score, date, player_key)
+            rank = self._boards[(None, None)].rank_of(player_name)
+
+        future = self.writer.submit(lambda conn: self.db.insert_scores([row], conn))
+        future.add_done_callback(lambda done: self._written(token, done))
+        return rank
+
+    def _written(self, token, future):
+        # Yazma kuyruğunun iş parçacığında çalışır
+        error = future.exception()
+        with self._lock:
+            row = self._pending.pop(token, None)
+            if row is None:
+                return
+            if error is not None:
+                self._failed[token] = row
+            elif self._loading:
+                # Süren yükleme bu kaydı veritabanında görmemiş olabilir
+                self._settled[token] = row
+        if error is not None:
+            print(f"Skor kaydedilemedi ({error}); yalnızca bellekte tutuluyor: {row[0]} {row[1]} {row[2]}")
+
+    def top(self, limit=10, category=None, day=None):
+        """En yüksek `limit` skoru `HighScore` listesi olarak döndürür."""
+        board = self._board(category, day)
+        with self._lock:
+            return board.top(limit)
+
+    def rank(self, player_name, category=None, day=None):
+        """Takımın en iyi skoruyla sırasını döndürür; kaydı yoksa None."""
+        board = self._board(category, day)
+        with self._lock:
+            return board.rank_of(player_name)
+
+    def rank_of_score(self, score, category=None, day=None):
+        """Verilen skorun tablodaki sırasını döndürür."""
+        board = self._board(category, day)
+        with self._lock:
+            return board.rank_of_score(score)
+
+    def count(self, category=None, day=None):
+        board = self._board(category, day)
+        with self._lock:
+            return len(board)
+
+    def flush(self, timeout=None):
+        """Bekleyen skorlar veritabanına yazılana kadar bekler."""
+        return self.writer.flush(timeout)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
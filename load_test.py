@@ -0,0 +1,565 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Socket.IO oyun sunucusu için yük testi aracı.
+
+Sunucuyu yerelde başlatır, her oda için bir ev sahibi ve birkaç misafir
+takımı simüle eder ve oda oluşturma, katılma, hazır olma, sohbet, oyun
+başlatma ve cevap gönderme akışını uçtan uca çalıştırır. Gönderilen her
+olayın ilgili yayına (game_started, show_results, prefetch_question,
+start_question, game_over, ...) ulaşma süresi ölçülür ve sonuçlar JSON olarak raporlanır.
+Test süresince sunucunun /stats uç noktası okunarak en yüksek oda, oturum
+ve bağlantı sayıları da rapora eklenir.
+
+`--variant` ile eventlet sunucusu (server.py), asyncio sunucusu
+(async_server.py) ya da ikisi sırayla aynı yük altında çalıştırılabilir;
+ikisi birden çalıştırılırsa rapor, sürümleri oda, bağlantı ve kuyruk
+gecikmesi açısından yan yana koyan bir `comparison` bölümü içerir.
+
+Örnek:
+    python load_test.py --rooms 20 --teams 4 --output rapor.json
+    python load_test.py --variant both --rooms 50 --teams 4
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+
+import socketio
+from engineio.payload import Payload
+
+from countdown import ClockSync
+from wire import WireCodec
+
+# Uzun yoklama (polling) yanıtı bir sohbet patlamasında 16 paketten fazlasını
+# taşıyabilir; varsayılan sınır aşılınca istemci bağlantıyı koparır
+Payload.max_decode_packets = 1024
+
+def percentile(sorted_values, p):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik değeri döndürür."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+class LatencyRecorder:
+    """Olay başına gecikme örneklerini ve sayaçlarını toplar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.received = {}
+        self.sent = {}
+        self.errors = []
+
+    def record(self, event, seconds):
+        with self._lock:
+            self.latencies.setdefault(event, []).append(seconds)
+
+    def count_received(self, event):
+        with self._lock:
+            self.received[event] = self.received.get(event, 0) + 1
+
+    def count_sent(self, event):
+        with self._lock:
+            self.sent[event] = self.sent.get(event, 0) + 1
+
+    def error(self, message):
+        with self._lock:
+            self.errors.append(message)
+
+    def summary(self):
+        """Olay başına p50/p95/p99 gecikmeleri (ms) döndürür."""
+        result = {}
+        with self._lock:
+            for event, values in self.latencies.items():
+                values = sorted(values)
+                result[event] = {
+                    'count': len(values),
+                    'mean_ms': round(sum(values) / len(values) * 1000, 3),
+                    'p50_ms': round(percentile(values, 50) * 1000, 3),
+                    'p95_ms': round(percentile(values, 95) * 1000, 3),
+                    'p99_ms': round(percentile(values, 99) * 1000, 3),
+                    'max_ms': round(values[-1] * 1000, 3)
+                }
+        return result
+
+class SimulatedTeam:
+    """Tek bir takımı temsil eden Socket.IO istemcisi."""
+
+    def __init__(self, url, name, room, recorder):
+        self.url = url
+        self.name = name
+        self.room = room
+        self.recorder = recorder
+        self.room_code = None
+        self.cond = threading.Condition()
+        self.counts = {}
+        self.sio = socketio.Client(reconnection=False)
+        self.wire = WireCodec()
+        self.encoding = 'json'
+        self.sio.on('wire_encoding', self._on_wire_encoding)
+
+        for event in ('room_created', 'room_patch', 'room_snapshot', 'game_started',
+                      'show_question', 'prefetch_question', 'start_question',
+                      'show_results', 'game_over', 'new_chat_message',
+                      'chat_history', 'chat_rejected', 'room_closed', 'error'):
+            self.sio.on(event, self._make_handler(event))
+        self.sio.on('batch', self._on_batch)
+        self.clock = ClockSync()
+        self.sio.on('clock_pong', self._on_clock_pong)
+
+    def _on_wire_encoding(self, data):
+        self.encoding = data['encoding']
+        self.recorder.count_received('wire_encoding')
+
+    def _make_handler(self, event):
+        def handler(data=None):
+            now = time.perf_counter()
+            data = self.wire.decode(data, self.encoding)
+            self.recorder.count_received(event)
+            self.room.on_event(self, event, data, now)
+            with self.cond:
+                self.counts[event] = self.counts.get(event, 0) + 1
+                self.cond.notify_all()
+        return handler
+
+    def _on_batch(self, data):
+        # Birleştirilmiş çerçevedeki olayları sırasıyla işleyicilerine dağıt
+        self.recorder.count_received('batch')
+        handlers = self.sio.handlers.get('/', {})
+        for event, payload in data['events']:
+            handler = handlers.get(event)
+            if handler is not None:
+                handler(payload)
+
+    def connect(self, room_code=None):
+        # Oda kodu, çoklu süreç modunda yönlendiricinin odanın sürecini seçmesini sağlar
+        url = f"{self.url}?room={room_code}" if room_code else self.url
+        self.sio.connect(url, wait_timeout=10, auth={'encodings': [self.room.args.encoding]})
+        for _ in range(self.room.args.clock_pings):
+            self.emit('clock_ping', self.clock.ping_payload())
+
+    def _on_clock_pong(self, data):
+        # Sunucu ve istemci aynı makinedeyse gerçek fark sıfırdır; tahminin
+        # büyüklüğü eşitlemenin hatasını gösterir
+        data = self.wire.decode(data, self.encoding)
+        offset = self.clock.add_sample(data['t0'], data['t1'], data['t2'])
+        self.recorder.count_received('clock_pong')
+        self.recorder.record('clock_rtt', self.clock.delay)
+        self.recorder.record('clock_offset', abs(offset))
+
+    def emit(self, event, data):
+        self.recorder.count_sent(event)
+        self.sio.emit(event, data)
+
+    def wait_for(self, event, count, timeout):
+        """`event` en az `count` kez alınana kadar bekler."""
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.counts.get(event, 0) < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def disconnect(self):
+        try:
+            self.sio.disconnect()
+        except Exception:
+            pass
+
+class SimulatedRoom:
+    """Bir odanın tüm yaşam döngüsünü sürer ve gecikmeleri ölçer."""
+
+    def __init__(self, index, args, recorder):
+        self.index = index
+        self.args = args
+        self.recorder = recorder
+        self.lock = threading.Lock()
+        self.teams = [
+            SimulatedTeam(args.url, f"oda{index}-takim{i}", self, recorder)
+            for i in range(args.teams)
+        ]
+        self.host = self.teams[0]
+        self.guests = self.teams[1:]
+        # Yayınları tetikleyen son gönderimin zamanı
+        self.join_sent = {}
+        self.last_toggle = None
+        self.start_sent = None
+        self.last_submit = None
+        self.chat_sent = {}
+
+    def on_event(self, team, event, data, now):
+        with self.lock:
+            if event == 'room_created':
+                sent = self.join_sent.get(team.name)
+                if sent is not None:
+                    self.recorder.record('join_room', now - sent)
+                team.room_code = data['room_code']
+            elif event == 'room_patch' and data.get('op') == 'ready' and self.last_toggle is not None:
+                self.recorder.record('room_patch', now - self.last_toggle)
+            elif event == 'game_started' and self.start_sent is not None:
+                self.recorder.record('game_started', now - self.start_sent)
+            elif event in ('show_results', 'prefetch_question') and self.last_submit is not None:
+                self.recorder.record(event, now - self.last_submit)
+            elif event in ('start_question', 'game_over') and self.last_submit is not None:
+                # Planlı sonuç gösterim süresini gecikmeden çıkar
+                self.recorder.record(event, now - self.last_submit - self.args.reveal_time)
+            elif event == 'new_chat_message':
+                sent = self.chat_sent.get(data.get('message'))
+                if sent is not None:
+                    self.recorder.record('new_chat_message', now - sent)
+            elif event == 'error':
+                self.recorder.error(f"{team.name}: {data}")
+
+    def _wait_all(self, event, count):
+        for team in self.teams:
+            if not team.wait_for(event, count, self.args.timeout):
+                raise TimeoutError(f"oda {self.index}: {team.name} '{event}' #{count} bekliyor")
+
+    def run(self):
+        args = self.args
+        try:
+            self.host.connect()
+
+            # Oda oluştur
+            self.host.emit('create_room', {'team_name': self.host.name})
+            if not self.host.wait_for('room_created', 1, args.timeout):
+                raise TimeoutError(f"oda {self.index}: oda oluşturulamadı")
+            room_code = self.host.room_code
+
+            # Misafirler odaya katılır
+            for team in self.guests:
+                team.connect(room_code)
+            for team in self.guests:
+                with self.lock:
+                    self.join_sent[team.name] = time.perf_counter()
+                team.emit('join_room', {'room_code': room_code, 'team_name': team.name})
+            for team in self.guests:
+                if not team.wait_for('room_created', 1, args.timeout):
+                    raise TimeoutError(f"oda {self.index}: {team.name} katılamadı")
+
+            # Misafirler hazır olur
+            for team in self.guests:
+                with self.lock:
+                    self.last_toggle = time.perf_counter()
+                team.emit('toggle_ready', {'room_code': room_code, 'team_name': team.name})
+            # Ev sahibi her katılım ve her hazır değişikliği için bir yama alır
+            if not self.host.wait_for('room_patch', 2 * len(self.guests), args.timeout):
+                raise TimeoutError(f"oda {self.index}: hazır durumları gelmedi")
+
+            # Lobi sohbeti
+            for team in self.teams:
+                for _ in range(args.chat):
+                    message = f"lt:{uuid.uuid4().hex}"
+                    with self.lock:
+                        self.chat_sent[message] = time.perf_counter()
+                    team.emit('chat_message', {'room_code': room_code, 'team_name': team.name, 'message': message})
+
+            # Oyunu başlat
+            with self.lock:
+                self.start_sent = time.perf_counter()
+            self.host.emit('start_game', {'room_code': room_code})
+            self._wait_all('game_started', 1)
+
+            # Her soruda tüm takımlar cevap verir
+            for round_number in range(1, args.questions + 1):
+                for team in self.teams:
+                    with self.lock:
+                        self.last_submit = time.perf_counter()
+                    team.emit('submit_answer', {
+                        'room_code': room_code,
+                        'team_name': team.name,
+                        'answer': random.choice('ABCD')
+                    })
+                self._wait_all('show_results', round_number)
+                if round_number < args.questions:
+                    # Sıradaki soru sonuçla birlikte önceden gelir; tur sinyali beklenir
+                    self._wait_all('prefetch_question', round_number)
+                    self._wait_all('start_question', round_number)
+                else:
+                    self._wait_all('game_over', 1)
+            return True
+        except Exception as e:
+            self.recorder.error(str(e))
+            return False
+        finally:
+            for team in self.teams:
+                team.disconnect()
+
+def wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+# Sürüm adı -> sunucu dosyası
+VARIANTS = {'eventlet': 'server.py', 'asyncio': 'async_server.py'}
+
+def start_server(args, variant='eventlet'):
+    """Sunucuyu (ya da --workers > 1 ise cluster.py'yi) alt süreç olarak başlatır."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    if args.workers > 1:
+        command = [sys.executable, os.path.join(here, 'cluster.py'), '--workers', str(args.workers),
+                   '--base-port', str(args.port + 1)]
+    elif variant == 'asyncio':
+        command = [sys.executable, os.path.join(here, VARIANTS[variant])]
+    else:
+        command = [sys.executable, os.path.join(here, VARIANTS[variant]), '--no-debug']
+    command += ['--host', args.host, '--port', str(args.port),
+                '--question-time', str(args.question_time),
+                '--reveal-time', str(args.reveal_time),
+                '--questions', str(args.questions),
+                '--coalesce-ms', str(args.coalesce_ms)]
+    process = subprocess.Popen(command, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not wait_for_port(args.host, args.port, 30):
+        process.kill()
+        raise RuntimeError("Sunucu başlatılamadı")
+    return process
+
+class ServerSampler:
+    """Test süresince sunucunun /stats uç noktasını okuyup en yüksek değerleri tutar.
+
+    `pid` verilirse sunucu sürecinin harcadığı işlemci süresi de
+    /proc üzerinden ölçülür.
+    """
+
+    FIELDS = ('rooms', 'sessions', 'connections')
+
+    def __init__(self, url, interval=0.5, pid=None):
+        self.url = url.rstrip('/') + '/stats'
+        self.interval = interval
+        self.pid = pid
+        self.peaks = dict.fromkeys(self.FIELDS, 0)
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._cpu_started = None
+
+    def _cpu_seconds(self):
+        # /proc/<pid>/stat: 14. ve 15. alanlar kullanıcı ve sistem süresidir (tık)
+        try:
+            with open(f"/proc/{self.pid}/stat") as file:
+                fields = file.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _sample(self):
+        try:
+            with urllib.request.urlopen(self.url, timeout=2) as response:
+                stats = json.loads(response.read())
+        except (OSError, ValueError):
+            return
+        self.samples += 1
+        for field in self.FIELDS:
+            value = stats.get(field)
+            if value is not None and value > self.peaks[field]:
+                self.peaks[field] = value
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if self.pid is not None:
+            self._cpu_started = self._cpu_seconds()
+        self._thread.start()
+
+    def stop(self):
+        """Örneklemeyi durdurur ve rapora eklenecek özeti döndürür."""
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        result = {f"peak_{field}": value for field, value in self.peaks.items()}
+        result['samples'] = self.samples
+        cpu = self._cpu_seconds() if self.pid is not None else None
+        if cpu is not None and self._cpu_started is not None:
+            result['cpu_s'] = round(cpu - self._cpu_started, 3)
+        return result
+
+def run_rooms(args, room_indexes):
+    """Verilen odaları bu süreçte eşzamanlı çalıştırır; ham sonuçları döndürür."""
+    recorder = LatencyRecorder()
+    rooms = [SimulatedRoom(i, args, recorder) for i in room_indexes]
+    results = [None] * len(rooms)
+
+    def worker(i):
+        results[i] = rooms[i].run()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(len(rooms))]
+    for thread in threads:
+        thread.start()
+        if args.ramp:
+            time.sleep(args.ramp)
+    for thread in threads:
+        thread.join()
+    return recorder, sum(1 for r in results if r)
+
+def _run_rooms_in_process(job):
+    args, room_indexes = job
+    recorder, completed = run_rooms(args, room_indexes)
+    return recorder.latencies, recorder.received, recorder.sent, recorder.errors, completed
+
+def run(args, variant=None):
+    """Yük testini çalıştırır ve rapor sözlüğünü döndürür.
+
+    --client-processes > 1 ise odalar istemci süreçlerine bölünür, böylece
+    ölçüm istemci tarafındaki GIL ile sınırlanmaz.
+    """
+    started = time.perf_counter()
+    if args.client_processes > 1:
+        import multiprocessing
+        jobs = [(args, range(i, args.rooms, args.client_processes)) for i in range(args.client_processes)]
+        with multiprocessing.Pool(args.client_processes) as pool:
+            parts = pool.map(_run_rooms_in_process, jobs)
+        recorder = LatencyRecorder()
+        completed = 0
+        for latencies, received, sent, errors, done in parts:
+            for event, values in latencies.items():
+                recorder.latencies.setdefault(event, []).extend(values)
+            for event, count in received.items():
+                recorder.received[event] = recorder.received.get(event, 0) + count
+            for event, count in sent.items():
+                recorder.sent[event] = recorder.sent.get(event, 0) + count
+            recorder.errors.extend(errors)
+            completed += done
+    else:
+        recorder, completed = run_rooms(args, range(args.rooms))
+    duration = time.perf_counter() - started
+
+    total_received = sum(recorder.received.values())
+    total_sent = sum(recorder.sent.values())
+    return {
+        'config': {
+            'rooms': args.rooms,
+            'teams_per_room': args.teams,
+            'questions': args.questions,
+            'chat_per_team': args.chat,
+            'question_time': args.question_time,
+            'reveal_time': args.reveal_time,
+            'coalesce_ms': args.coalesce_ms,
+            'encoding': args.encoding,
+            'variant': variant,
+            'clock_pings': args.clock_pings,
+            'workers': args.workers,
+            'client_processes': args.client_processes,
+            'url': args.url
+        },
+        'duration_s': round(duration, 3),
+        'rooms_completed': completed,
+        'events_sent': recorder.sent,
+        'events_received': recorder.received,
+        'throughput': {
+            'sent_per_s': round(total_sent / duration, 2),
+            'received_per_s': round(total_received / duration, 2)
+        },
+        'latency': recorder.summary(),
+        'errors': recorder.errors[:50],
+        'error_count': len(recorder.errors)
+    }
+
+def compare(reports):
+    """Sürümlerin raporlarını oda, bağlantı ve kuyruk gecikmesi açısından yan yana koyar."""
+    def side_by_side(fn):
+        return {variant: fn(report) for variant, report in reports.items()}
+
+    events = sorted({event for report in reports.values() for event in report['latency']} - {'clock_offset'})
+    return {
+        'rooms_completed': side_by_side(lambda r: r['rooms_completed']),
+        'peak_rooms': side_by_side(lambda r: r['server'].get('peak_rooms')),
+        'peak_connections': side_by_side(lambda r: r['server'].get('peak_connections')),
+        'server_cpu_s': side_by_side(lambda r: r['server'].get('cpu_s')),
+        'duration_s': side_by_side(lambda r: r['duration_s']),
+        'received_per_s': side_by_side(lambda r: r['throughput']['received_per_s']),
+        'error_count': side_by_side(lambda r: r['error_count']),
+        'p95_ms': {event: side_by_side(lambda r: r['latency'].get(event, {}).get('p95_ms')) for event in events},
+        'p99_ms': {event: side_by_side(lambda r: r['latency'].get(event, {}).get('p99_ms')) for event in events}
+    }
+
+def run_variant(args, variant):
+    """Sunucuyu başlatıp (--url verilmediyse) testi çalıştırır ve raporu döndürür."""
+    process = None
+    if args.url:
+        url = args.url
+    else:
+        process = start_server(args, variant)
+        url = f"http://{args.host}:{args.port}"
+    run_args = argparse.Namespace(**vars(args))
+    run_args.url = url
+    # Çoklu süreç modunda /stats yalnızca tek bir sürecin sayılarını verir
+    sampler = None
+    if args.workers == 1:
+        sampler = ServerSampler(url, pid=process.pid if process is not None else None)
+        sampler.start()
+    try:
+        report = run(run_args, None if args.url else variant)
+    finally:
+        server = sampler.stop() if sampler is not None else {}
+        if process is not None:
+            process.terminate()
+            process.wait(10)
+    report['server'] = server
+    return report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bilgi Yarışması sunucusu yük testi")
+    parser.add_argument('--rooms', type=int, default=10, help="eşzamanlı oda sayısı")
+    parser.add_argument('--teams', type=int, default=4, help="oda başına takım sayısı (ev sahibi dahil)")
+    parser.add_argument('--questions', type=int, default=10, help="oyun başına cevaplanacak soru sayısı")
+    parser.add_argument('--chat', type=int, default=2, help="takım başına sohbet mesajı")
+    parser.add_argument('--question-time', type=float, default=30, help="sunucudaki soru süresi")
+    parser.add_argument('--reveal-time', type=float, default=0.2, help="sunucudaki sonuç gösterim süresi")
+    parser.add_argument('--ramp', type=float, default=0.0, help="odalar arası başlatma aralığı (saniye)")
+    parser.add_argument('--timeout', type=float, default=60, help="tek bir olayı bekleme süresi")
+    parser.add_argument('--workers', type=int, default=1, help="sunucu süreci sayısı (>1 ise cluster.py kullanılır)")
+    parser.add_argument('--client-processes', type=int, default=1, help="simüle istemcileri çalıştıran süreç sayısı")
+    parser.add_argument('--clock-pings', type=int, default=3, help="takım başına saat eşitleme ölçümü")
+    parser.add_argument('--coalesce-ms', type=float, default=0, help="sunucudaki yayın birleştirme penceresi (ms)")
+    parser.add_argument('--encoding', default='json', choices=('json', 'compact', 'msgpack'),
+                        help="istemcilerin önerdiği yük kodlaması (bkz. wire.py)")
+    parser.add_argument('--variant', default='eventlet', choices=('eventlet', 'asyncio', 'both'),
+                        help="başlatılacak sunucu: server.py, async_server.py ya da ikisi sırayla")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', help="zaten çalışan bir sunucu adresi (verilirse sunucu başlatılmaz)")
+    parser.add_argument('--output', help="JSON raporun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+    if args.variant != 'eventlet' and args.workers > 1:
+        parser.error("asyncio sürümü çoklu süreç modunu desteklemez")
+    if args.variant == 'both' and args.url:
+        parser.error("--variant both sunucuları kendisi başlatır; --url ile kullanılamaz")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.variant == 'both':
+        reports = {variant: run_variant(args, variant) for variant in VARIANTS}
+        report = {'variants': reports, 'comparison': compare(reports),
+                  'error_count': sum(r['error_count'] for r in reports.values())}
+    else:
+        report = run_variant(args, args.variant)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+    return 0 if report['error_count'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
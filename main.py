@@ -5,10 +5,18 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import os
-import sqlite3
 from datetime import datetime
 import random
+import sqlite3
 import socketio
+from question_pool import QuestionPool
+from database import get_database
+from import_questions import import_file
+from leaderboard import Leaderboard
+from write_behind import WriteBehindQueue
+from question_view import QuestionView
+from countdown import Countdown
+from ui_dispatch import UIDispatcher
 
 class BilgiYarismasi:
     def __init__(self, root):
@@ -38,6 +46,18 @@ class BilgiYarismasi:
         # Veritabanı kontrolü ve oluşturma
         self.check_database()
         
+        # Soru bankasını belleğe yükle
+        self.question_pool = QuestionPool("quiz_data.db")
+        self.question_pool.load()
+        
+        # Yazmalar arka planda toplu yapılır; skor tabloları bellekte tutulur
+        self.writer = WriteBehindQueue(self.db)
+        self.leaderboard = Leaderboard(self.db, self.writer)
+        # Yazma sonuçları bu kuyrukla Tk iş parçacığına aktarılır
+        self.ui = UIDispatcher(self.root)
+        self.ui.start()
+        self.category = None
+        
         # Değişkenleri başlat
         self.current_question = 0
         self.score = 0
@@ -47,6 +67,10 @@ class BilgiYarismasi:
         self.questions = []
         self.language = "Türkçe"  # Varsayılan dil
         
+        # Kalıcı soru ekranı (ilk soruda kurulur) ve bitiş anına göre çalışan sayaç
+        self.question_view = None
+        self.countdown = Countdown(self.root, self.on_countdown_tick, self.on_countdown_expire)
+        
         # Ayarları yükle
         self.load_settings()
         
@@ -98,39 +122,11 @@ class BilgiYarismasi:
         self.root.configure(background=self.theme["bg"])
     
     def check_database(self):
-        """Veritabanının varlığını kontrol eder ve yoksa oluşturur."""
-        if not os.path.exists("quiz_data.db"):
-            conn = sqlite3.connect("quiz_data.db")
-            cur = conn.cursor()
-            
-            # Sorular tablosu
-            cur.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY,
-                category TEXT,
-                difficulty TEXT,
-                question TEXT,
-                correct_answer TEXT,
-                option1 TEXT,
-                option2 TEXT,
-                option3 TEXT,
-                option4 TEXT
-            )
-            ''')
-            
-            # Yüksek skorlar tablosu
-            cur.execute('''
-            CREATE TABLE IF NOT EXISTS high_scores (
-                id INTEGER PRIMARY KEY,
-                player_name TEXT,
-                score INTEGER,
-                date TEXT
-            )
-            ''')
-            
-            conn.commit()
-            conn.close()
-            
+        """Veritabanını oluşturur ya da mevcut veritabanını güncel şemaya taşır."""
+        self.db = get_database("quiz_data.db")
+        self.db.migrate()
+        
+        if self.db.question_count() == 0:
             # Örnek soruları yükle
             self.load_sample_questions()
     
@@ -138,29 +134,25 @@ class BilgiYarismasi:
         """Örnek soruları JSON dosyasından yükler."""
         try:
             if os.path.exists("questions.json"):
-                with open("questions.json", "r", encoding="utf-8") as file:
-                    questions = json.load(file)
-                    
-                    conn = sqlite3.connect("quiz_data.db")
-                    cur = conn.cursor()
-                    
-                    for q in questions:
-                        cur.execute(
-                            "INSERT INTO questions (category, difficulty, question, correct_answer, option1, option2, option3, option4) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                            (q["category"], q["difficulty"], q["question"], q["correct_answer"], 
-                             q["options"][0], q["options"][1], q["options"][2], q["options"][3])
-                        )
-                    
-                    conn.commit()
-                    conn.close()
+                import_file(self.db, "questions.json")
         except Exception as e:
             messagebox.showerror("Hata", f"Sorular yüklenirken hata oluştu: {e}")
     
+    def clear_screen(self, keep_question_view=False):
+        """Ekrandaki widget'ları yıkar; kalıcı soru ekranı yalnızca gizlenir."""
+        view = self.question_view
+        if view is not None and not keep_question_view:
+            view.hide()
+            # Soru ekranından çıkılıyor; süre sayacını durdur
+            self.countdown.stop()
+        for widget in self.root.winfo_children():
+            if view is None or widget is not view.frame:
+                widget.destroy()
+    
     def show_main_menu(self):
         """Ana menüyü gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Ana çerçeve
         main_frame = ttk.Frame(self.root)
@@ -186,8 +178,7 @@ class BilgiYarismasi:
     def show_team_name_screen(self):
         """Takım ismi girme ekranını gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Takım ismi çerçevesi
         team_frame = ttk.Frame(self.root)
@@ -308,8 +299,7 @@ class BilgiYarismasi:
     def show_lobby(self):
         """Lobi ekranını gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Lobi çerçevesi
         lobby_frame = ttk.Frame(self.root)
@@ -466,8 +456,7 @@ class BilgiYarismasi:
     def show_category_selection(self):
         """Kategori seçim ekranını gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Kategori seçim çerçevesi
         category_frame = ttk.Frame(self.root)
@@ -495,14 +484,8 @@ class BilgiYarismasi:
         btn_back.pack(pady=20)
     
     def get_categories(self):
-        """Veritabanından kategorileri getirir."""
-        conn = sqlite3.connect("quiz_data.db")
-        cur = conn.cursor()
-        
-        cur.execute("SELECT DISTINCT category FROM questions")
-        categories = [row[0] for row in cur.fetchall()]
-        
-        conn.close()
+        """Bellekteki soru bankasından kategorileri getirir."""
+        categories = self.question_pool.categories()
         
         # Eğer veritabanında kategori yoksa, varsayılan kategorileri döndür
         if not categories:
@@ -512,6 +495,8 @@ class BilgiYarismasi:
     
     def start_game(self, category):
         """Seçilen kategoride oyunu başlatır."""
+        self.category = category
+        
         # Soruları veritabanından al
         self.load_questions(category)
         
@@ -529,136 +514,70 @@ class BilgiYarismasi:
         self.show_question()
     
     def load_questions(self, category):
-        """Seçilen kategorideki soruları veritabanından yükler."""
-        conn = sqlite3.connect("quiz_data.db")
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        
+        """Seçilen kategorideki soruları bellekteki bankadan çeker."""
         # Kategori seçimi kaldırıldığı için tüm sorulardan rastgele seçim yapılacak
-        cur.execute("SELECT * FROM questions ORDER BY RANDOM() LIMIT 10")
-        
-        self.questions = []
-        for row in cur.fetchall():
-            question = dict(row)
-            options = [
-                question["option1"],
-                question["option2"],
-                question["option3"],
-                question["option4"]
-            ]
-            self.questions.append({
+        self.questions = [
+            {
                 "question": question["question"],
-                "options": options,
+                "options": question["options"],
                 "correct_answer": question["correct_answer"]
-            })
-        
-        conn.close()
+            }
+            for question in self.question_pool.draw(10)
+        ]
     
     def show_question(self):
-        """Mevcut soruyu gösterir."""
-        # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        # Soru çerçevesi
-        question_frame = ttk.Frame(self.root)
-        question_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Üst bilgi çerçevesi
-        info_frame = ttk.Frame(question_frame)
-        info_frame.pack(fill="x", pady=10)
-        
-        # Soru numarası ve skor
-        question_label = ttk.Label(
-            info_frame, 
-            text=f"Soru {self.current_question + 1}/{len(self.questions)}", 
-            font=("Arial", 12)
-        )
-        question_label.pack(side="left")
-        
-        score_label = ttk.Label(
-            info_frame, 
-            text=f"Skor: {self.score}", 
-            font=("Arial", 12)
-        )
-        score_label.pack(side="right")
-        
-        # Zaman sayacı
-        self.timer_label = ttk.Label(
-            question_frame, 
-            text=f"Süre: {self.time_left} saniye", 
-            font=("Arial", 12)
-        )
-        self.timer_label.pack(pady=10)
-        
-        # Soru metni
-        question_text = ttk.Label(
-            question_frame, 
-            text=self.questions[self.current_question]["question"], 
-            font=("Arial", 14, "bold"),
-            wraplength=700
-        )
-        question_text.pack(pady=20)
-        
-        # Cevap seçenekleri
-        options_frame = ttk.Frame(question_frame)
-        options_frame.pack(fill="both", expand=True, pady=10)
-        
-        # Butonları saklamak için bir liste oluştur
-        self.option_buttons = []
-        
-        options = self.questions[self.current_question]["options"]
-        for i, option in enumerate(options):
-            option_btn = ttk.Button(
-                options_frame,
-                text=option,
-                command=lambda opt=option, btn_idx=i: self.check_answer(opt, btn_idx),
-                width=40
+        """Mevcut soruyu gösterir.
+        
+        Soru ekranı ilk soruda bir kez kurulur; sonraki sorularda yalnızca
+        metinler, stiller ve düğme durumları güncellenir.
+        """
+        if self.question_view is None:
+            self.question_view = QuestionView(
+                self.root,
+                on_select=lambda index: self.check_answer(
+                    self.questions[self.current_question]["options"][index], index),
+                on_continue=self.next_question
             )
-            option_btn.pack(pady=5)
-            self.option_buttons.append(option_btn)
         
-        # Sonuç mesajı için etiket
-        self.result_label = ttk.Label(
-            question_frame,
-            text="",
-            font=("Arial", 14, "bold")
-        )
-        self.result_label.pack(pady=10)
+        # Soru ekranı dışındaki widget'ları temizle
+        self.clear_screen(keep_question_view=True)
         
-        # Devam butonu (başlangıçta gizli)
-        self.continue_btn = ttk.Button(
-            question_frame,
-            text="Devam Et",
-            command=self.next_question,
-            width=20
+        question = self.questions[self.current_question]
+        self.question_view.render(
+            f"Soru {self.current_question + 1}/{len(self.questions)}",
+            question["question"],
+            question["options"],
+            score=f"Skor: {self.score}",
+            timer=f"Süre: {self.time_left} saniye"
         )
         
-        # Zamanlayıcıyı başlat
+        # Zamanlayıcıyı başlat (önceki sorunun sayacı yerine geçer)
         self.timer_running = True
-        self.update_timer()
+        self.countdown.start(duration=self.time_left)
     
-    def update_timer(self):
-        """Zamanlayıcıyı günceller."""
-        if self.timer_running and self.time_left > 0:
-            self.time_left -= 1
-            self.timer_label.config(text=f"Süre: {self.time_left} saniye")
-            self.root.after(1000, self.update_timer)
-        elif self.timer_running and self.time_left == 0:
+    def on_countdown_tick(self, seconds):
+        """Gösterilen saniye değiştiğinde süre etiketini günceller."""
+        self.time_left = seconds
+        self.question_view.set_timer(f"Süre: {self.time_left} saniye")
+    
+    def on_countdown_expire(self):
+        """Süre dolduğunda doğru cevabı gösterir."""
+        if self.timer_running:
             self.timer_running = False
-            self.result_label.config(text="Süre doldu!")
+            self.question_view.disable()
+            self.question_view.set_result("Süre doldu!")
             self.show_correct_answer()
-            self.continue_btn.pack(pady=10)
+            self.question_view.show_continue()
     
     def check_answer(self, selected_option, button_index):
         """Seçilen cevabı kontrol eder."""
         self.timer_running = False
+        self.countdown.stop()
         
         correct_answer = self.questions[self.current_question]["correct_answer"]
         
         # Tüm butonları devre dışı bırak
-        for btn in self.option_buttons:
-            btn.configure(state="disabled")
+        self.question_view.disable()
         
         # Özel stil oluştur
         self.style.configure("Correct.TButton", background="green")
@@ -666,17 +585,18 @@ class BilgiYarismasi:
         
         if selected_option == correct_answer:
             # Doğru cevap - yeşil göster
-            self.option_buttons[button_index].configure(style="Correct.TButton")
+            self.question_view.mark(button_index, "Correct.TButton")
             self.score += 10 + self.time_left // 3  # Kalan zamana göre ek puan
-            self.result_label.config(text=f"Tebrikler, doğru cevap! +{10 + self.time_left // 3} puan kazandınız.")
+            self.question_view.set_score(f"Skor: {self.score}")
+            self.question_view.set_result(f"Tebrikler, doğru cevap! +{10 + self.time_left // 3} puan kazandınız.")
         else:
             # Yanlış cevap - kırmızı göster ve doğru cevabı bul
-            self.option_buttons[button_index].configure(style="Wrong.TButton")
-            self.result_label.config(text=f"Üzgünüm, yanlış cevap.")
+            self.question_view.mark(button_index, "Wrong.TButton")
+            self.question_view.set_result("Üzgünüm, yanlış cevap.")
             self.show_correct_answer()
         
         # Devam butonunu göster
-        self.continue_btn.pack(pady=10)
+        self.question_view.show_continue()
     
     def show_correct_answer(self):
         """Doğru cevabı gösterir."""
@@ -685,7 +605,7 @@ class BilgiYarismasi:
         # Doğru cevabı bul ve yeşil göster
         for i, option in enumerate(self.questions[self.current_question]["options"]):
             if option == correct_answer:
-                self.option_buttons[i].configure(style="Correct.TButton")
+                self.question_view.mark(i, "Correct.TButton")
                 break
     
     def next_question(self):
@@ -701,8 +621,7 @@ class BilgiYarismasi:
     def end_game(self):
         """Oyunu bitirir ve sonuçları gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Sonuç çerçevesi
         result_frame = ttk.Frame(self.root)
@@ -754,27 +673,18 @@ class BilgiYarismasi:
         """Takımın skorunu veritabanına kaydeder."""
         team_name = self.team_name.get().strip()
         
-        conn = sqlite3.connect("quiz_data.db")
-        cur = conn.cursor()
-        
         current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        cur.execute(
-            "INSERT INTO high_scores (player_name, score, date) VALUES (?, ?, ?)",
-            (team_name, self.score, current_date)
-        )
+        # Skor yazma kuyruğuna verilir; tablo bellekten okunduğu için hemen görünür
+        rank = self.leaderboard.record(team_name, self.score, current_date, self.category)
         
-        conn.commit()
-        conn.close()
-        
-        messagebox.showinfo("Başarılı", "Skorunuz kaydedildi!")
+        messagebox.showinfo("Başarılı", f"Skorunuz kaydedildi! Genel sıralamada {rank}. sıradasınız.")
         self.show_high_scores()
     
-    def show_high_scores(self):
+    def show_high_scores(self, board="Tüm Zamanlar"):
         """Yüksek skorlar listesini gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Yüksek skorlar çerçevesi
         scores_frame = ttk.Frame(self.root)
@@ -788,14 +698,20 @@ class BilgiYarismasi:
         )
         title_label.pack(pady=20)
         
-        # Skorları veritabanından al
-        conn = sqlite3.connect("quiz_data.db")
-        cur = conn.cursor()
-        
-        cur.execute("SELECT player_name, score, date FROM high_scores ORDER BY score DESC LIMIT 10")
-        high_scores = cur.fetchall()
-        
-        conn.close()
+        # Tablo seçimi: genel, bugün ya da kategori
+        board_names = ["Tüm Zamanlar", "Bugün"] + self.get_categories()
+        board_var = tk.StringVar(value=board)
+        board_combo = ttk.Combobox(scores_frame, textvariable=board_var, values=board_names, state="readonly", width=25)
+        board_combo.pack(pady=5)
+        board_combo.bind("<<ComboboxSelected>>", lambda e: self.show_high_scores(board_var.get()))
+        
+        # Skorları bellekteki skor tablosundan al
+        if board == "Bugün":
+            high_scores = self.leaderboard.top(10, day=datetime.now().strftime("%Y-%m-%d"))
+        elif board == "Tüm Zamanlar":
+            high_scores = self.leaderboard.top(10)
+        else:
+            high_scores = self.leaderboard.top(10, category=board)
         
         # Tablo çerçevesi
         table_frame = ttk.Frame(scores_frame)
@@ -841,8 +757,7 @@ class BilgiYarismasi:
     def show_settings(self):
         """Ayarlar ekranını gösterir."""
         # Önceki widget'ları temizle
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         # Ayarlar çerçevesi
         settings_frame = ttk.Frame(self.root)
@@ -1186,26 +1101,29 @@ class BilgiYarismasi:
         # Doğru cevabı al
         correct_answer = options[correct_index]
         
+        # Veritabanına arka planda ekle; sonuç Tk iş parçacığında bildirilir
         try:
-            # Veritabanına ekle
-            conn = sqlite3.connect("quiz_data.db")
-            cur = conn.cursor()
-            
-            cur.execute(
-                "INSERT INTO questions (category, difficulty, question, correct_answer, option1, option2, option3, option4) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (category, difficulty, question_text, correct_answer, options[0], options[1], options[2], options[3])
+            future = self.writer.submit(
+                lambda conn: self.db.insert_question(category, difficulty, question_text, correct_answer, options, conn)
             )
-            
-            conn.commit()
-            conn.close()
-            
+        except RuntimeError as e:
+            messagebox.showerror("Hata", f"Soru eklenirken hata oluştu: {e}")
+            return
+        # Geri çağrı yazma iş parçacığında çalışır; Tk'ye dokunmadan yalnızca kuyruğa ekler
+        future.add_done_callback(lambda done: self.ui.post(self.question_added, done))
+    
+    def question_added(self, future):
+        """Soru ekleme yazmasının sonucunu kullanıcıya bildirir."""
+        error = future.exception()
+        if error is None:
+            # Soru bankası önbelleğini yalnızca yazma başarılıysa yenile
+            self.question_pool.invalidate()
             messagebox.showinfo("Başarılı", "Soru başarıyla eklendi!")
-            
-            # Formu temizle
             self.clear_question_form()
-            
-        except Exception as e:
-            messagebox.showerror("Hata", f"Soru eklenirken hata oluştu: {e}")
+        elif isinstance(error, sqlite3.IntegrityError):
+            messagebox.showwarning("Uyarı", "Bu soru soru bankasında zaten var, tekrar eklenmedi.")
+        else:
+            messagebox.showerror("Hata", f"Soru eklenirken hata oluştu: {error}")
     
     def clear_question_form(self):
         """Soru formunu temizler."""
@@ -1259,4 +1177,6 @@ class BilgiYarismasi:
 if __name__ == "__main__":
     root = tk.Tk()
     app = BilgiYarismasi(root)
-    root.mainloop() 
\ No newline at end of file
+    root.mainloop()
+    # Bekleyen yazmaları bitir
+    app.writer.close() 
\ No newline at end of file
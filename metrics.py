@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Prometheus metin biçiminde sayaçlar ve süre histogramları.
+
+Kayıt sıcak yolda kilit almaz: her iş parçacığı sayaç ve histogram
+değerlerini kendi sözlüğünde tutar (eventlet yeşil iş parçacıkları aynı
+işletim sistemi iş parçacığını paylaşır ve yalnızca G/Ç'de yer değiştirir,
+bu yüzden aynı sözlüğe güvenle yazar). Kilit yalnızca bir iş parçacığı
+ilk kez kayıt yaptığında ve okuma (`render`) sırasında alınır; okuma tüm
+iş parçacıklarının değerlerini toplar.
+
+Histogramlar sabit kovalıdır; bir gözlem kovanın sayacını ve toplamı
+artırır. Anlık değerler (açık oda sayısı gibi) okuma sırasında çağrılan
+fonksiyonlarla toplanır.
+
+Dosya doğrudan çalıştırılırsa kayıt başına maliyeti ölçer:
+
+    python metrics.py --observations 1000000
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Saniye cinsinden varsayılan histogram kovaları (0.5 ms - 2.5 s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+class Metrics:
+    """Sayaç, histogram ve anlık değerlerin kaydı.
+
+    Metrikler önce `counter` / `histogram` / `collect` ile tanımlanır;
+    etiket değerleri tanımdaki etiket adlarıyla aynı sırada bir demet
+    olarak verilir.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._meta = {}        # ad -> (tür, açıklama, etiket adları, kovalar)
+        self._collectors = []  # (ad, tür, açıklama, etiket adları, fonksiyon)
+
+    def counter(self, name, description, labels=()):
+        self._meta[name] = ('counter', description, tuple(labels), None)
+
+    def histogram(self, name, description, labels=(), buckets=DEFAULT_BUCKETS):
+        self._meta[name] = ('histogram', description, tuple(labels), tuple(buckets))
+
+    def collect(self, name, description, fn, kind='gauge', labels=()):
+        """Okuma sırasında `fn()` ile hesaplanan bir metrik tanımlar.
+
+        Etiket yoksa `fn` bir sayı, varsa {etiket değerleri demeti: sayı}
+        sözlüğü döndürür.
+        """
+        self._collectors.append((name, kind, description, tuple(labels), fn))
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = ({}, {})
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def inc(self, name, values=(), amount=1):
+        """Sayacı artırır."""
+        counters = self._shard()[0]
+        key = (name, values)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, value, values=()):
+        """Histograma bir gözlem ekler."""
+        histograms = self._shard()[1]
+        key = (name, values)
+        slots = histograms.get(key)
+        if slots is None:
+            # Kova sayaçları, +Inf kovası ve toplam
+            slots = histograms[key] = [0] * (len(self._meta[name][3]) + 1) + [0.0]
+        slots[bisect_left(self._meta[name][3], value)] += 1
+        slots[-1] += value
+
+    def timer(self, name, values=()):
+        """Fonksiyonun süresini histograma yazan bir dekoratör döndürür."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started, values)
+            return wrapper
+        return decorator
+
+    def _merge(self):
+        counters = {}
+        histograms = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard_counters, shard_histograms in shards:
+            # Kopyalama tek adımda yapılır; yazan iş parçacığı sözlüğü değiştirse de güvenli
+            for key, value in shard_counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, slots in shard_histograms.copy().items():
+                slots = list(slots)
+                total = histograms.get(key)
+                histograms[key] = slots if total is None else [a + b for a, b in zip(total, slots)]
+        return counters, histograms
+
+    def render(self):
+        """Tüm metrikleri Prometheus metin biçiminde döndürür."""
+        counters, histograms = self._merge()
+        lines = []
+        for name, (kind, description, labels, buckets) in self._meta.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                for (metric, values), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels, values)} {_number(value)}")
+                continue
+            for (metric, values), slots in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), slots):
+                    cumulative += count
+                    le = f'le="{_number(float(bound))}"'
+                    lines.append(f"{name}_bucket{_labels(labels, values, le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels, values)} {_number(slots[-1])}")
+                lines.append(f"{name}_count{_labels(labels, values)} {cumulative}")
+        for name, kind, description, labels, fn in self._collectors:
+            try:
+                value = fn()
+            except Exception as e:
+                print(f"Metrik okunamadı ({name}): {e}")
+                continue
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            items = sorted(value.items()) if labels else [((), value)]
+            for values, number in items:
+                lines.append(f"{name}{_labels(labels, values)} {_number(number)}")
+        return '\n'.join(lines) + '\n'
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Metrik kaydı maliyet ölçümü")
+    parser.add_argument('--observations', type=int, default=1000000, help="kayıt sayısı")
+    args = parser.parse_args(argv)
+
+    metrics = Metrics()
+    metrics.counter('bench_total', "ölçüm sayacı", labels=('event',))
+    metrics.histogram('bench_seconds', "ölçüm histogramı", labels=('event',))
+    events = [('create_room',), ('join_room',), ('submit_answer',), ('time_up',)]
+    n = args.observations
+
+    started = time.perf_counter()
+    for i in range(n):
+        pass
+    baseline = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(n):
+        metrics.inc('bench_total', events[i & 3])
+    inc = time.perf_counter() - started - baseline
+
+    started = time.perf_counter()
+    for i in range(n):
+        metrics.observe('bench_seconds', (i % 1000) / 1e5, events[i & 3])
+    observe = time.perf_counter() - started - baseline
+
+    timed = metrics.timer('bench_seconds', ('timed',))(lambda: None)
+    started = time.perf_counter()
+    for i in range(n):
+        timed()
+    timer = time.perf_counter() - started - baseline
+
+    started = time.perf_counter()
+    text = metrics.render()
+    render = time.perf_counter() - started
+
+    print(json.dumps({
+        'inc_ns': round(inc / n * 1e9, 1),
+        'observe_ns': round(observe / n * 1e9, 1),
+        'timed_call_ns': round(timer / n * 1e9, 1),
+        'render_ms': round(render * 1000, 3),
+        'render_bytes': len(text)
+    }, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Socket.IO işleyicileri için isteğe bağlı örneklemeli profil çıkarıcı.
+
+`rate` sıfırsa (varsayılan) sarılmış işleyici doğrudan çağrılır; tek
+maliyet bir öznitelik kontrolüdür. `rate` > 0 ise işleyici çağrılarının
+bu oranı `sys.setprofile` ile izlenir: her Python ve C fonksiyonu
+çağrısında yığın güncellenir ve geçen süre o anki yığına yazılır.
+Sonuçlar olay türü başına "çağrı;yığını mikrosaniye" satırları
+(collapsed stack) olarak birikir ve `flamegraph.pl` ya da speedscope ile
+doğrudan açılabilir.
+
+Eventlet altında işleyici G/Ç beklerken başka yeşil iş parçacıkları
+çalışır. Bu sırada gelen profil olayları yok sayılır; işleyici geri
+döndüğünde aradaki süre bekleyen çağrının altına "[başka greenlet]"
+olarak yazılır. Böylece zamanın işleyicide mi yoksa sırada beklerken mi
+geçtiği ayrılabilir.
+
+Dosya doğrudan çalıştırılırsa kapalıyken eklenen maliyeti ölçer ve
+örnek bir işleyicinin profilini yazdırır:
+
+    python profiler.py --calls 200000
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from functools import wraps
+
+try:
+    from greenlet import getcurrent
+except ImportError:
+    getcurrent = threading.get_ident
+
+WAIT_FRAME = "[başka greenlet]"
+
+def _label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _c_label(function):
+    module = getattr(function, '__module__', None)
+    owner = getattr(function, '__self__', None)
+    if module is None and owner is not None and not isinstance(owner, type(sys)):
+        # Yerleşik metot (ör. sqlite3.Connection.execute)
+        module = type(owner).__module__
+    if module == 'builtins':
+        module = None
+    name = getattr(function, '__qualname__', None) or getattr(function, '__name__', '?')
+    return f"{module}.{name}" if module else name
+
+class _StackTracer:
+    # Tek bir işleyici çağrısının yığınlarını izler
+    def __init__(self, root):
+        self.owner = getcurrent()
+        self.keys = [root]
+        self.counts = {}
+        self.foreign = False
+        self.last = time.perf_counter()
+
+    def _charge(self, now):
+        key = self.keys[-1]
+        if self.foreign:
+            key += ';' + WAIT_FRAME
+            self.foreign = False
+        self.counts[key] = self.counts.get(key, 0) + (now - self.last)
+
+    def callback(self, frame, event, arg):
+        if getcurrent() is not self.owner:
+            # Başka bir yeşil iş parçacığı çalışıyor
+            self.foreign = True
+            return
+        self._charge(time.perf_counter())
+        if event == 'call':
+            self.keys.append(self.keys[-1] + ';' + _label(frame.f_code))
+        elif event == 'c_call':
+            self.keys.append(self.keys[-1] + ';' + _c_label(arg))
+        elif len(self.keys) > 1:
+            # return, c_return, c_exception
+            self.keys.pop()
+        # Profil çıkarıcının kendi süresi sayılmasın
+        self.last = time.perf_counter()
+
+    def finish(self):
+        self._charge(time.perf_counter())
+        return self.counts
+
+class HandlerProfiler:
+    """İşleyici çağrılarının bir oranını izleyip olay başına yığınları toplar."""
+
+    def __init__(self, rate=0.0, directory='profiles'):
+        self.rate = rate
+        self.directory = directory
+        self.sampled = {}   # olay -> izlenen çağrı sayısı
+        self._stacks = {}   # olay -> {yığın: saniye}
+        self._lock = threading.Lock()
+        self._active = False
+
+    def wrap(self, event, handler):
+        """İşleyiciyi, örneklenen çağrılarda profil çıkaracak şekilde sarar."""
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            if not self.rate or self._active or random.random() >= self.rate:
+                return handler(*args, **kwargs)
+            return self._profile(event, handler, args, kwargs)
+        return wrapper
+
+    def _profile(self, event, handler, args, kwargs):
+        # sys.setprofile iş parçacığı başınadır; aynı anda tek çağrı izlenir
+        self._active = True
+        tracer = _StackTracer(event)
+        sys.setprofile(tracer.callback)
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+            self._active = False
+            counts = tracer.finish()
+            with self._lock:
+                self.sampled[event] = self.sampled.get(event, 0) + 1
+                stacks = self._stacks.setdefault(event, {})
+                for key, seconds in counts.items():
+                    stacks[key] = stacks.get(key, 0.0) + seconds
+
+    def collapsed(self, event):
+        """Olayın yığınlarını "yığın mikrosaniye" satırları olarak döndürür."""
+        with self._lock:
+            stacks = dict(self._stacks.get(event, {}))
+        lines = []
+        for key, seconds in sorted(stacks.items()):
+            micros = int(round(seconds * 1e6))
+            if micros:
+                lines.append(f"{key} {micros}")
+        return lines
+
+    def dump(self, directory=None, reset=False):
+        """Her olay için `<olay>.collapsed` dosyası yazar; {olay: özet} döndürür."""
+        directory = directory or self.directory
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            events = sorted(self._stacks)
+            sampled = dict(self.sampled)
+        summary = {}
+        for event in events:
+            path = os.path.join(directory, f"{event}.collapsed")
+            lines = self.collapsed(event)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n' if lines else '')
+            summary[event] = {'sampled': sampled.get(event, 0), 'path': path, 'stacks': len(lines)}
+        if reset:
+            self.reset()
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.sampled.clear()
+
+def main(argv=None):
+    import argparse
+    import json
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description="İşleyici profil çıkarıcı ölçümü")
+    parser.add_argument('--calls', type=int, default=200000, help="kapalıyken ölçülecek çağrı sayısı")
+    parser.add_argument('--samples', type=int, default=200, help="profili çıkarılacak örnek çağrı sayısı")
+    parser.add_argument('--output', help="örnek profilin yazılacağı dizin")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE scores (name TEXT, score INTEGER)")
+    conn.executemany("INSERT INTO scores VALUES (?, ?)", [(f"takim{i}", i) for i in range(2000)])
+
+    def handler(data):
+        # Örnek işleyici: sorgu ve skor sözlüğünün JSON'a çevrilmesi
+        rows = conn.execute("SELECT name, score FROM scores ORDER BY score DESC LIMIT 200").fetchall()
+        return json.dumps({'scores': dict(rows), 'data': data})
+
+    profiler = HandlerProfiler()
+    wrapped = profiler.wrap('example', handler)
+    noop = lambda data: data
+    wrapped_noop = profiler.wrap('noop', noop)
+
+    def per_call(fn):
+        started = time.perf_counter()
+        for i in range(args.calls):
+            fn(i)
+        return (time.perf_counter() - started) / args.calls * 1e9
+
+    result = {'direct_ns': round(per_call(noop), 1), 'disabled_ns': round(per_call(wrapped_noop), 1)}
+
+    profiler.rate = 1.0
+    started = time.perf_counter()
+    for i in range(args.samples):
+        wrapped(i)
+    profiled = (time.perf_counter() - started) / args.samples
+    profiler.rate = 0.0
+    started = time.perf_counter()
+    for i in range(args.samples):
+        wrapped(i)
+    plain = (time.perf_counter() - started) / args.samples
+    result['example_us'] = round(plain * 1e6, 1)
+    result['example_profiled_us'] = round(profiled * 1e6, 1)
+
+    lines = profiler.collapsed('example')
+    top = sorted(lines, key=lambda line: int(line.rsplit(' ', 1)[1]), reverse=True)[:5]
+    result['top_stacks'] = top
+    if args.output:
+        result['dump'] = profiler.dump(args.output)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import random
+import threading
+from array import array
+
+from database import get_database
+
+class QuestionPool:
+    """Soru bankasını bellekte tutar ve hızlı rastgele deste çeker.
+
+    Sorular ilk kullanımda bir kez yüklenir; her (kategori, zorluk) çifti
+    için soru kimlikleri sıkışık bir `array` içinde saklanır. Deste çekmek
+    tablo taraması ya da sıralama gerektirmez, istenen soru sayısıyla
+    orantılı sürede tamamlanır. Veritabanına yeni soru yazıldığında
+    `invalidate` çağrılarak önbellek bir sonraki kullanımda yenilenir.
+    """
+
+    def __init__(self, db_path="quiz_data.db"):
+        self.db = get_database(db_path)
+        self._lock = threading.Lock()
+        self._questions = None
+        self._strata = {}
+
+    def load(self):
+        """Soruları (henüz yüklenmediyse) hemen belleğe yükler."""
+        with self._lock:
+            self._ensure_loaded()
+
+    def invalidate(self):
+        """Önbelleği geçersiz kılar; sonraki çağrıda sorular yeniden yüklenir."""
+        with self._lock:
+            self._questions = None
+            self._strata = {}
+
+    def _ensure_loaded(self):
+        # Çağıran kilidi tutmalıdır
+        if self._questions is not None:
+            return
+
+        questions = {}
+        strata = {}
+        for row in self.db.fetch_questions():
+            questions[row.id] = {
+                'id': row.id,
+                'category': row.category,
+                'difficulty': row.difficulty,
+                'question': row.question,
+                'correct_answer': row.correct_answer,
+                'options': [row.option1, row.option2, row.option3, row.option4]
+            }
+            strata.setdefault((row.category, row.difficulty), array('q')).append(row.id)
+
+        self._questions = questions
+        self._strata = strata
+
+    def _matching_strata(self, category=None, difficulty=None):
+        return [
+            ids for (cat, diff), ids in self._strata.items()
+            if (category is None or cat == category)
+            and (difficulty is None or diff == difficulty)
+        ]
+
+    def draw(self, count, category=None, difficulty=None):
+        """Rastgele `count` soruluk bir deste döndürür.
+
+        Deste, eşleşen (kategori, zorluk) gruplarına büyüklükleriyle orantılı
+        dağıtılır; her gruptan tekrarsız örnekleme yapılır.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            strata = self._matching_strata(category, difficulty)
+            total = sum(len(ids) for ids in strata)
+            count = min(count, total)
+            if count <= 0:
+                return []
+
+            # En büyük kalan yöntemiyle grup kotalarını belirle
+            quotas = []
+            for ids in strata:
+                exact = count * len(ids) / total
+                quotas.append([int(exact), exact - int(exact), random.random(), ids])
+            remaining = count - sum(q[0] for q in quotas)
+            for quota in sorted(quotas, key=lambda q: (q[1], q[2]), reverse=True)[:remaining]:
+                quota[0] += 1
+
+            deck = []
+            for n, _, _, ids in quotas:
+                if n:
+                    deck.extend(ids[i] for i in random.sample(range(len(ids)), n))
+            random.shuffle(deck)
+
+            # Çağıranın değiştirebileceği kopyalar döndür
+            return [dict(self._questions[qid], options=list(self._questions[qid]['options'])) for qid in deck]
+
+    def categories(self):
+        """Bankadaki kategorileri döndürür."""
+        with self._lock:
+            self._ensure_loaded()
+            seen = {}
+            for cat, _ in self._strata:
+                seen.setdefault(cat, None)
+            return list(seen)
+
+    def counts(self):
+        """(kategori, zorluk) başına soru sayılarını döndürür."""
+        with self._lock:
+            self._ensure_loaded()
+            return {key: len(ids) for key, ids in self._strata.items()}
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._questions)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Bir kez kurulan ve her soruda yerinde güncellenen soru ekranı.
+
+Soru geçişlerinde pencere yıkılıp yeniden kurulmaz; etiketlerin metni,
+seçeneklerin metni, stili ve etkinlik durumu değiştirilir. Widget'lara
+doğrudan referans tutulduğundan ağaçta arama yapılmaz.
+
+Her `render` çağrısının süresi (Tk yerleşimi dahil, boşta kalınana kadar)
+`render_times` içinde tutulur. Dosya doğrudan çalıştırılırsa eski
+yık-yeniden-kur yöntemiyle yerinde güncellemeyi karşılaştıran küçük bir
+ölçüm yapar:
+
+    python question_view.py --questions 200
+"""
+
+import time
+from collections import deque
+import tkinter as tk
+from tkinter import ttk
+
+LETTERS = ('A', 'B', 'C', 'D')
+
+class QuestionView:
+    """Soru numarası, skor, süre, soru metni, dört seçenek ve sonuç satırı.
+
+    `option_kind` 'button' ise seçenekler düğme, 'radio' ise seçim düğmesi
+    olur; seçim yapılınca `on_select(indeks)` çağrılır. `on_continue`
+    verilirse sonuç satırının altında gizli bir "Devam Et" düğmesi kurulur.
+    """
+
+    def __init__(self, root, on_select, option_kind='button', on_continue=None,
+                 font="Arial", option_style=None):
+        self.root = root
+        self.on_select = on_select
+        self.option_kind = option_kind
+        self.option_style = option_style or ('TButton' if option_kind == 'button' else 'TRadiobutton')
+        self.render_times = deque(maxlen=100)
+        self._render_started = None
+        self._visible = False
+
+        self.frame = ttk.Frame(root)
+
+        info_frame = ttk.Frame(self.frame)
+        info_frame.pack(fill="x", pady=10)
+        self.number_label = ttk.Label(info_frame, font=(font, 12))
+        self.number_label.pack(side="left", padx=5)
+        self.score_label = ttk.Label(info_frame, font=(font, 12))
+        self.score_label.pack(side="right", padx=5)
+
+        self.timer_label = ttk.Label(self.frame, font=(font, 12))
+        self.timer_label.pack(pady=10)
+
+        self.question_label = ttk.Label(self.frame, font=(font, 14, "bold"), wraplength=700)
+        self.question_label.pack(pady=20)
+
+        options_frame = ttk.Frame(self.frame)
+        options_frame.pack(fill="both", expand=True, pady=10)
+        self.answer_var = tk.StringVar()
+        self.options = []
+        for index, letter in enumerate(LETTERS):
+            if option_kind == 'radio':
+                widget = ttk.Radiobutton(options_frame, value=letter, variable=self.answer_var,
+                                         command=lambda i=index: self.on_select(i))
+                widget.pack(anchor="w", pady=5, padx=20)
+            else:
+                widget = ttk.Button(options_frame, width=40,
+                                    command=lambda i=index: self.on_select(i))
+                widget.pack(pady=5)
+            self.options.append(widget)
+
+        self.result_label = ttk.Label(self.frame, font=(font, 14, "bold"))
+        self.result_label.pack(pady=10)
+
+        self.continue_btn = None
+        if on_continue is not None:
+            self.continue_btn = ttk.Button(self.frame, text="Devam Et", command=on_continue, width=20)
+
+    def show(self):
+        """Ekranı (görünmüyorsa) pencereye yerleştirir."""
+        if not self._visible:
+            self.frame.pack(fill="both", expand=True, padx=20, pady=20)
+            self._visible = True
+
+    def hide(self):
+        """Ekranı yıkmadan pencereden kaldırır."""
+        if self._visible:
+            self.frame.pack_forget()
+            self._visible = False
+
+    def render(self, number, question, options, score=None, timer=""):
+        """Yeni soruyu mevcut widget'lara yazar ve seçenekleri sıfırlar."""
+        self._render_started = time.perf_counter()
+        self.number_label.configure(text=number)
+        self.score_label.configure(text=score or "")
+        self.timer_label.configure(text=timer)
+        self.question_label.configure(text=question)
+        self.answer_var.set("")
+        for index, widget in enumerate(self.options):
+            if index < len(options):
+                text = options[index]
+                if self.option_kind == 'radio':
+                    text = f"{LETTERS[index]}) {text}"
+                widget.configure(text=text, style=self.option_style, state="normal")
+            else:
+                widget.configure(text="", style=self.option_style, state="disabled")
+        self.result_label.configure(text="")
+        if self.continue_btn is not None:
+            self.continue_btn.pack_forget()
+        self.show()
+        # Yerleşim Tk boşta kaldığında yapılır; süreyi o ana kadar ölç
+        self.root.after_idle(self._render_done)
+
+    def _render_done(self):
+        if self._render_started is not None:
+            self.render_times.append((time.perf_counter() - self._render_started) * 1000)
+            self._render_started = None
+
+    def set_timer(self, text):
+        self.timer_label.configure(text=text)
+
+    def set_score(self, text):
+        self.score_label.configure(text=text)
+
+    def set_result(self, text):
+        self.result_label.configure(text=text)
+
+    def mark(self, index, style):
+        """Seçeneğin stilini değiştirir (ör. doğru/yanlış renkleri)."""
+        self.options[index].configure(style=style)
+
+    def disable(self):
+        """Tüm seçenekleri devre dışı bırakır."""
+        for widget in self.options:
+            widget.configure(state="disabled")
+
+    def show_continue(self):
+        if self.continue_btn is not None:
+            self.continue_btn.pack(pady=10)
+
+    def render_stats(self):
+        """Son çizimlerin ortalama ve en yüksek süresi (ms)."""
+        if not self.render_times:
+            return None
+        times = list(self.render_times)
+        return {'count': len(times), 'mean_ms': round(sum(times) / len(times), 3),
+                'max_ms': round(max(times), 3)}
+
+def _rebuild(root, question, options):
+    # Eski yöntem: her soruda pencereyi yıkıp yeniden kur
+    for widget in root.winfo_children():
+        widget.destroy()
+    frame = ttk.Frame(root)
+    frame.pack(fill="both", expand=True, padx=20, pady=20)
+    info_frame = ttk.Frame(frame)
+    info_frame.pack(fill="x", pady=10)
+    ttk.Label(info_frame, text="Soru", font=("Arial", 12)).pack(side="left")
+    ttk.Label(info_frame, text="Skor", font=("Arial", 12)).pack(side="right")
+    ttk.Label(frame, text="Süre", font=("Arial", 12)).pack(pady=10)
+    ttk.Label(frame, text=question, font=("Arial", 14, "bold"), wraplength=700).pack(pady=20)
+    options_frame = ttk.Frame(frame)
+    options_frame.pack(fill="both", expand=True, pady=10)
+    for option in options:
+        ttk.Button(options_frame, text=option, width=40).pack(pady=5)
+    ttk.Label(frame, text="", font=("Arial", 14, "bold")).pack(pady=10)
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Soru ekranı çizim süresi ölçümü")
+    parser.add_argument('--questions', type=int, default=200, help="ölçülecek soru geçişi sayısı")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.geometry("800x600")
+    questions = [(f"Soru metni {i} " * 5, [f"Seçenek {i}-{j}" for j in range(4)])
+                 for i in range(args.questions)]
+
+    def measure(step):
+        times = []
+        for question, options in questions:
+            started = time.perf_counter()
+            step(question, options)
+            root.update_idletasks()
+            times.append((time.perf_counter() - started) * 1000)
+        times.sort()
+        return {'mean_ms': round(sum(times) / len(times), 3),
+                'p95_ms': round(times[int(0.95 * (len(times) - 1))], 3),
+                'max_ms': round(times[-1], 3)}
+
+    result = {'rebuild': measure(lambda q, o: _rebuild(root, q, o))}
+    for widget in root.winfo_children():
+        widget.destroy()
+    view = QuestionView(root, on_select=lambda index: None)
+    result['in_place'] = measure(lambda q, o: view.render("Soru", q, o, "Skor", "Süre"))
+    root.destroy()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
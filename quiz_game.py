@@ -0,0 +1,547 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Oyun sunucusunun taşıma katmanından bağımsız mantığı.
+
+Oda oluşturma, katılma, hazır olma, sohbet, oyun başlatma, cevaplar,
+sonuç açıklama, tur ilerletme, odadan çıkma ve oda kapatma kuralları,
+bunların tuttuğu durum (oda kaydı, oda kodları, soru bankası, skor
+tablosu, bağlantı başına yük kodlaması, sayaçlar) ve olay günlüğü
+buradadır. server.py (Flask-SocketIO, eventlet) ve async_server.py
+(python-socketio, asyncio) yalnızca bu mantığı kendi taşıma katmanlarında
+yürüten ince bağdaştırıcılardır; bir oyun kuralı tek bir yerde değişir.
+
+Socket.IO olaylarının karşılığı olan metotlar üreteçtir (generator):
+Socket.IO'ya, zamanlayıcıya ya da temizleyiciye doğrudan dokunmazlar,
+yapılacak işi bir komut olarak verirler ve bağdaştırıcı komutu kendi
+yöntemiyle (doğrudan ya da `await` ile) yapıp sonucunu üretece geri
+gönderir. Komutlar, ilk ögesi komut adı olan demetlerdir:
+
+    ('send', sid, olay, yük)             bağlantıya (kodlanmış) gönderim
+    ('emit', olay, veri, oda, birleştir, atlanan_sid)
+                                         oda yayını (BroadcastCoalescer)
+    ('join', sid, kanal) / ('leave', sid, kanal)
+    ('close_channel', kanal)             kanaldaki bağlantıları çıkarır
+    ('discard', oda)                     odanın bekleyen yayınlarını siler
+    ('schedule', oda, süre, adım)        tur geçişi planlar ('reveal', 'advance')
+    ('run_now', oda, adım) / ('run_if_due', oda) / ('cancel', oda)
+    ('deadline', oda)                    bekleyen geçişin süre sonu (sonuç döner)
+    ('sweep',)                           süresi dolan odaları kapatır
+    ('call', fn, *argümanlar)            veritabanına dokunan iş; sonucu döner
+
+`call` komutları asyncio sürümünde olay döngüsünü bekletmemek için ayrı
+iş parçacıklarında çalışır.
+"""
+
+import datetime
+import threading
+import time
+
+from chat import ChatRoom
+from event_log import EventLog
+from game_room import GameRoom
+from leaderboard import Leaderboard
+from question_pool import QuestionPool
+from room_codes import RoomCodeAllocator
+from room_registry import RoomRegistry
+from wire import WireCodec
+
+class QuizGame:
+    """Tüm odaların oyun durumu ve Socket.IO olaylarının oyun kuralları."""
+
+    # Soru ve sonuç gösterim süreleri (saniye), oyun başına soru sayısı
+    question_time = 30
+    reveal_time = 7
+    questions_per_game = 10
+
+    # Oda sohbeti: geçmişte tutulan mesaj sayısı, mesaj uzunluğu sınırı ve
+    # takım başına hız sınırı (saniyede dolan jeton, en fazla biriken jeton)
+    chat_history = 50
+    chat_max_length = 500
+    chat_rate = 1.0
+    chat_burst = 5
+
+    # Aynı anda açık olabilecek oda sayısı
+    max_rooms = 10000
+
+    def __init__(self, metrics, db_path='quiz_data.db', room_codes=None, worker_index=0):
+        self.metrics = metrics
+        self.worker_index = worker_index
+        # Oda kodları gizli anahtarlı bir permütasyondan çakışmasız dağıtılır
+        # (bkz. room_codes.py); kapanan odanın kodu geri verilir
+        self.room_codes = room_codes or RoomCodeAllocator()
+        # Aktif odaları ve bağlantı (sid) -> oda/takım eşlemesini tutan kayıt
+        self.rooms = RoomRegistry()
+        # Yük kodlaması bağlantı başına anlaşılır (bkz. wire.py); sid -> kodlama
+        self.wire = WireCodec()
+        self.client_encodings = {}
+        # Bellekteki soru bankası ve skor tablosu; oyun sonu skorları
+        # veritabanına arka plandaki yazma kuyruğuyla toplu halde yazılır
+        self.question_pool = QuestionPool(db_path)
+        self.question_pool.db.observer = lambda query, seconds: metrics.observe(
+            'quiz_sqlite_query_seconds', seconds, (query,))
+        self.leaderboard = Leaderboard(self.question_pool.db)
+        # Oda yaşam döngüsü, cevaplar ve sonuçlar için olay günlüğü (bkz.
+        # event_log.py, replay_events.py); `open_event_log` ile açılır
+        self.event_log = None
+        # Oda ve bağlantı sayaçları (/stats)
+        self.counters = {'rooms_created': 0, 'rooms_closed': 0, 'rooms_rejected': 0, 'disconnects': 0}
+        self._counters_lock = threading.Lock()
+
+        metrics.histogram('quiz_question_draw_seconds', "Oyun başında soru çekme süresi")
+        metrics.histogram('quiz_sqlite_query_seconds', "SQLite sorgu süresi", labels=('query',))
+        metrics.collect('quiz_rooms_active', "Açık oda sayısı", lambda: len(self.rooms))
+        metrics.collect('quiz_sessions', "Bir odaya kayıtlı bağlantı sayısı", self.rooms.session_count)
+        metrics.collect('quiz_lifecycle_total', "Oda ve bağlantı yaşam döngüsü sayaçları",
+                        lambda: {(name,): value for name, value in self.counters.items()},
+                        kind='counter', labels=('event',))
+        metrics.collect('quiz_score_writes_pending', "Veritabanına yazılmayı bekleyen skorlar",
+                        self.leaderboard.pending_count)
+
+    def configure(self, args):
+        """`add_arguments` seçeneklerinden oyun ayarlarını alır."""
+        self.question_time = args.question_time
+        self.reveal_time = args.reveal_time
+        self.questions_per_game = args.questions
+        self.max_rooms = args.max_rooms
+
+    def load(self):
+        """Şemayı günceller, soru bankasını ve genel skor tablosunu yükler."""
+        self.question_pool.db.migrate()
+        self.question_pool.load()
+        self.leaderboard.top()
+
+    def open_event_log(self, directory, fsync=True):
+        self.event_log = EventLog(directory, fsync=fsync)
+
+    def close(self):
+        """Bekleyen skorları ve olayları yazar."""
+        self.leaderboard.writer.close()
+        if self.event_log is not None:
+            self.event_log.close()
+
+    def log_event(self, event_type, room_code=None, **fields):
+        """Olay günlüğü açıksa olayı ekler."""
+        if self.event_log is not None:
+            self.event_log.append(event_type, room_code, **fields)
+
+    def count(self, name):
+        with self._counters_lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        """Açık oda ve oturum sayılarını, oda sayaçlarını döndürür."""
+        with self._counters_lock:
+            result = dict(self.counters)
+        result.update(rooms=len(self.rooms), sessions=self.rooms.session_count(),
+                      max_rooms=self.max_rooms, room_codes=self.room_codes.stats())
+        return result
+
+    def high_scores(self, limit=10, category=None, day=None):
+        """Skor tablosunu sözlük listesi olarak döndürür; veritabanına gidebilir.
+
+        `day` YYYY-AA-GG biçiminde değilse ValueError yükseltir; `limit`
+        0 ile tablo boyutu arasına çekilir.
+        """
+        if day is not None:
+            try:
+                day = datetime.datetime.strptime(day, '%Y-%m-%d').date().isoformat()
+            except ValueError:
+                raise ValueError("Geçersiz gün; YYYY-AA-GG biçiminde olmalı") from None
+        limit = max(0, min(limit, self.leaderboard.top_k))
+        scores = self.leaderboard.top(limit, category=category, day=day)
+        return [score._asdict() for score in scores]
+
+    def draw_questions(self):
+        """Oyunun sorularını bankadan çeker ve süreyi metriklere yazar."""
+        started = time.perf_counter()
+        questions = self.question_pool.draw(self.questions_per_game)
+        self.metrics.observe('quiz_question_draw_seconds', time.perf_counter() - started)
+        return questions
+
+    def record_scores(self, scores):
+        """Oyun sonu skorlarını kaydeder; takımların genel sıralamadaki yerlerini döndürür."""
+        return {team_name: self.leaderboard.record(team_name, score) for team_name, score in scores.items()}
+
+    # Komutlar
+
+    def encoding(self, sid):
+        return self.client_encodings.get(sid, 'json')
+
+    def reply(self, sid, event, data):
+        """Olayı bağlantıya, onun kodlamasıyla gönderen komut."""
+        return ('send', sid, event, self.wire.encode(data, self.encoding(sid)))
+
+    def broadcast(self, event, data, room_code, coalesce=True, skip_sid=None):
+        """Oda yayını komutu; `coalesce=False` olaylar beklemeden gönderilir."""
+        return ('emit', event, data, room_code, coalesce, skip_sid)
+
+    def join_channel(self, sid, room_code, team_name):
+        """Bağlantıyı oturum kaydına ekler; odanın kodlamasına ait kanala katılma komutu.
+
+        JSON kullananların kanalı oda kodunun kendisidir; diğer kodlamalar
+        ayrı kanallardadır, böylece her bağlantı yayını tek kodlamayla alır.
+        """
+        encoding = self.encoding(sid)
+        self.rooms.bind(sid, room_code, team_name, encoding)
+        return ('join', sid, self.wire.channel(room_code, encoding))
+
+    def leave_channel(self, sid, room_code):
+        """Bağlantıyı odadaki kanalından çıkarma komutu."""
+        return ('leave', sid, self.wire.channel(room_code, self.encoding(sid)))
+
+    def session_room(self, sid):
+        """Bağlantının kayıtlı olduğu oda kodunu döndürür."""
+        session = self.rooms.session(sid)
+        return session[0] if session else None
+
+    # Oda yaşam döngüsü ve tur geçişleri
+
+    def close_room(self, room_code, room, reason=None):
+        """Odayı kapatır: bekleyen geçişleri, yayınları ve oturumları temizler.
+
+        Oda kayıttan bu çağrıyla silindiyse True döner.
+        """
+        if self.rooms.remove(room_code, room) is None:
+            return False
+        self.room_codes.release(room_code)
+        yield ('cancel', room_code)
+        if reason is not None:
+            # Odada kalan bağlantılara odanın kapandığını bildir
+            yield self.broadcast('room_closed', {'room_code': room_code, 'reason': reason}, room_code,
+                                 coalesce=False)
+        yield ('discard', room_code)
+        self.rooms.unbind_room(room_code)
+        for encoding in self.wire.encodings:
+            yield ('close_channel', self.wire.channel(room_code, encoding))
+        self.count('rooms_closed')
+        self.log_event('room_closed', room_code, reason=reason)
+        return True
+
+    def remove_team(self, room_code, team_name):
+        """Takımı odadan çıkarır; oda boşaldıysa kapatır, yoksa yamayı yayınlar."""
+        room = self.rooms.get(room_code)
+        if room is None:
+            return
+        remaining, patch = room.remove_team(team_name)
+        if patch is None:
+            return
+        self.log_event('team_left', room_code, team=team_name)
+        if not remaining:
+            # Oda boşsa sil
+            yield from self.close_room(room_code, room)
+        else:
+            # Diğer oyunculara değişikliği gönder
+            yield self.broadcast('room_patch', patch, room_code)
+
+    def leave_previous_room(self, sid, room_code):
+        """Bağlantı başka bir odaya kayıtlıysa eski odadaki takımını çıkarır."""
+        session = self.rooms.session(sid)
+        if session is not None and session[0] != room_code:
+            self.rooms.unbind(sid)
+            yield self.leave_channel(sid, session[0])
+            yield from self.remove_team(*session)
+
+    def reveal_answer(self, room_code):
+        """Doğru cevabı ve skorları gösterir, ilerlemeyi planlar."""
+        room = self.rooms.get(room_code)
+        if room is None:
+            return
+
+        # Sonuçla birlikte cevap penceresi de kapanır
+        results = room.close_answers()
+        if results is None:
+            return
+
+        self.log_event('reveal', room_code, number=results['question_number'],
+                       correct_answer=results['correct_answer'], scores=results['scores'])
+
+        # Tüm istemcilere sonuçları gönder
+        yield self.broadcast('show_results', results, room_code, coalesce=False)
+
+        # Sonuç gösterilirken sıradaki soruyu önceden gönder; tur başında
+        # yalnızca küçük `start_question` sinyali gider
+        next_question = room.next_question_payload()
+        if next_question is not None:
+            yield self.broadcast('prefetch_question', next_question, room_code, coalesce=False)
+
+        # Sonuç süresi bitince sonraki soruya geç
+        yield ('schedule', room_code, self.reveal_time, 'advance')
+
+    def advance_question(self, room_code):
+        """Sonraki soruyu gönderir ya da oyunu bitirir."""
+        room = self.rooms.get(room_code)
+        if room is None:
+            return
+
+        # Yeni soruya geçilirse cevaplar sıfırlanır ve pencere açılır
+        next_question = room.get_next_question()
+        if next_question:
+            yield ('schedule', room_code, self.question_time, 'reveal')
+            yield self.broadcast('start_question', {
+                'room_code': room_code,
+                'question_number': next_question['question_number'],
+                'time': self.question_time,
+                'deadline': time.time() + self.question_time
+            }, room_code, coalesce=False)
+            self.log_event('question_shown', room_code, number=next_question['question_number'])
+        else:
+            # Oyun bitti; skorları kaydet ve genel sıralamadaki yerleri de gönder
+            scores = room.scores_snapshot()
+            ranks = yield ('call', self.record_scores, scores)
+            self.log_event('game_over', room_code, scores=scores)
+            yield self.broadcast('game_over', {'scores': scores, 'ranks': ranks}, room_code, coalesce=False)
+
+    # Socket.IO olayları
+
+    def connect(self, sid, auth=None):
+        print(f"Client connected: {sid}")
+        # İstemcinin önerdiği kodlamalardan ilk desteklenen seçilir; eski istemciler JSON alır
+        offered = auth.get('encodings') if isinstance(auth, dict) else None
+        encoding = self.wire.negotiate(offered)
+        if encoding != 'json':
+            self.client_encodings[sid] = encoding
+            yield ('send', sid, 'wire_encoding', {'encoding': encoding})
+
+    def disconnect(self, sid):
+        print(f"Client disconnected: {sid}")
+        self.count('disconnects')
+        # Bağlantının takımını odadan çıkar
+        session = self.rooms.unbind(sid)
+        if session is not None:
+            yield from self.remove_team(*session)
+        self.client_encodings.pop(sid, None)
+
+    def create_room(self, sid, data):
+        team_name = data.get('team_name')
+
+        # Oda sınırı doluysa önce süresi dolanları kapat
+        if len(self.rooms) >= self.max_rooms:
+            yield ('sweep',)
+        if len(self.rooms) >= self.max_rooms:
+            self.count('rooms_rejected')
+            yield self.reply(sid, 'error', {'message': 'Sunucu dolu, lütfen daha sonra tekrar deneyin!'})
+            return
+
+        # Yeni oda oluştur; dağıtıcı kullanımdaki bir kodu vermez
+        room_code = self.room_codes.allocate()
+        if room_code is None:
+            self.count('rooms_rejected')
+            yield self.reply(sid, 'error', {'message': 'Sunucu dolu, lütfen daha sonra tekrar deneyin!'})
+            return
+        room = GameRoom(room_code, team_name,
+                        chat=ChatRoom(self.chat_history, self.chat_max_length, self.chat_rate, self.chat_burst))
+        if not self.rooms.add(room_code, room):
+            # Kod başka bir odaya kayıtlıysa oda açılmamış sayılır
+            self.room_codes.release(room_code)
+            self.count('rooms_rejected')
+            yield self.reply(sid, 'error', {'message': 'Oda oluşturulamadı, lütfen tekrar deneyin!'})
+            return
+        self.count('rooms_created')
+        self.log_event('room_created', room_code, host=team_name, worker=self.worker_index)
+
+        # Başka bir odadaysa oradan çıkar
+        yield from self.leave_previous_room(sid, room_code)
+
+        # Odaya katıl ve ev sahibinin bağlantısını kaydet
+        yield self.join_channel(sid, room_code, team_name)
+
+        yield self.reply(sid, 'room_created', room.snapshot())
+
+    def join_room(self, sid, data):
+        """Odaya katılma isteğini işler."""
+        room_code = data['room_code']
+        team_name = data['team_name']
+        print(f"Katılma isteği: {team_name} - Oda: {room_code}")
+
+        room = self.rooms.get(room_code)
+        if room is None:
+            yield self.reply(sid, 'error', {'message': 'Oda bulunamadı!'})
+            return
+
+        # Takımı odaya ekle
+        patch = room.add_team(team_name)
+        if patch is None:
+            yield self.reply(sid, 'error', {'message': 'Bu takım ismi odada zaten kullanılıyor!'})
+            return
+
+        self.log_event('team_joined', room_code, team=team_name)
+
+        # Başka bir odadaysa oradan çıkar
+        yield from self.leave_previous_room(sid, room_code)
+
+        # Odaya katıl ve takım bilgilerini kaydet
+        yield self.join_channel(sid, room_code, team_name)
+
+        # Katılan takıma tam listeyi, diğerlerine yalnızca yamayı gönder
+        yield self.reply(sid, 'room_created', room.snapshot())
+        yield self.broadcast('room_patch', patch, room_code, skip_sid=sid)
+
+        # Sohbet geçmişini katılan takıma tek çerçevede gönder
+        history = room.chat.history()
+        if history:
+            yield self.reply(sid, 'chat_history', {'room_code': room_code, 'messages': history})
+
+    def toggle_ready(self, sid, data):
+        room_code = data.get('room_code')
+        team_name = data.get('team_name')
+
+        room = self.rooms.get(room_code)
+        if room is not None:
+            patch = room.toggle_ready(team_name)
+            if patch is not None:
+                self.log_event('ready_toggled', room_code, team=team_name)
+                yield self.broadcast('room_patch', patch, room_code)
+
+    def clock_ping(self, sid, data):
+        """İstemcinin saat farkını tahmin etmesi için alış ve gönderim zamanını döndürür."""
+        received = time.time()
+        yield self.reply(sid, 'clock_pong', {'t0': data.get('t0'), 't1': received, 't2': time.time()})
+
+    def request_room_snapshot(self, sid, data):
+        """Sürüm boşluğu gören istemciye tam takım listesini gönderir."""
+        room = self.rooms.get(data.get('room_code'))
+        if room is not None:
+            yield self.reply(sid, 'room_snapshot', room.snapshot())
+
+    def start_game(self, sid, data):
+        room_code = data.get('room_code')
+
+        room = self.rooms.get(room_code)
+        if room is None:
+            return
+
+        # Tüm oyuncular hazır mı kontrol et
+        if not room.all_ready():
+            return
+
+        # Soruları bellekteki bankadan çek
+        questions = yield ('call', self.draw_questions)
+        if not questions:
+            yield self.reply(sid, 'error', {'message': 'Soru bulunamadı!'})
+            return
+
+        # Oyun zaten başlamışsa ya da bu arada biri hazırdan çıktıysa başlatma
+        if not room.start(questions, self.question_time):
+            return
+
+        self.log_event('game_started', room_code, question_time=self.question_time, questions=[
+            {'id': q.get('id'), 'category': q['category'], 'correct_answer': q['correct_answer']}
+            for q in questions
+        ])
+
+        # İlk soruyu hazırla
+        first_question = room.question_payload()
+        first_question['deadline'] = time.time() + self.question_time
+
+        # Soru süresi bitince sonuçları göster
+        yield ('schedule', room_code, self.question_time, 'reveal')
+
+        yield self.broadcast('game_started', {
+            'first_question': first_question
+        }, room_code, coalesce=False)
+        self.log_event('question_shown', room_code, number=first_question['question_number'])
+
+    def request_question(self, sid, data):
+        """Önceden gönderilen soruyu almamış istemciye mevcut soruyu gönderir."""
+        room = self.rooms.get(data.get('room_code'))
+        if room is None:
+            return
+        deadline = yield ('deadline', room.room_code)
+        with room.lock:
+            if not room.started or deadline is None:
+                return
+            question = room.question_payload()
+        question['deadline'] = time.time() + max(0.0, deadline - time.monotonic())
+        yield self.reply(sid, 'show_question', question)
+
+    def leave_room(self, sid, data):
+        room_code = data.get('room_code')
+        team_name = data.get('team_name')
+
+        if room_code in self.rooms:
+            yield self.leave_channel(sid, room_code)
+            self.rooms.unbind(sid)
+            yield from self.remove_team(room_code, team_name)
+
+    def chat_message(self, sid, data):
+        # Gönderen takım bağlantının oturumundan alınır; başka bir takım adına
+        # yazılamaz, isim değiştirerek hız sınırı da aşılamaz
+        session = self.rooms.session(sid)
+        if session is None:
+            return
+        room_code, team_name = session
+        if data.get('room_code', room_code) != room_code or data.get('team_name', team_name) != team_name:
+            return
+        message = data.get('message')
+
+        room = self.rooms.get(room_code)
+        if room is None or not room.has_team(team_name):
+            return
+
+        # Boyut ve hız sınırını aşan mesaj yalnızca gönderene bildirilir
+        entry, reason = room.chat.post(team_name, message)
+        if entry is None:
+            yield self.reply(sid, 'chat_rejected', {'message': reason})
+            return
+        room.touch()
+        yield self.broadcast('new_chat_message', entry, room_code)
+
+    def time_up(self, sid, data=None):
+        """İstemcide süre dolduğunda çalışır.
+
+        Süreyi sunucu tuttuğundan bu yalnızca bir ipucudur: odanın süresi
+        gerçekten dolmuşsa sonuçlar hemen gösterilir, aynı turda gelen diğer
+        time_up mesajları yok sayılır.
+        """
+        room_code = (data or {}).get('room_code') or self.session_room(sid)
+        if room_code in self.rooms:
+            yield ('run_if_due', room_code)
+
+    def submit_answer(self, sid, data):
+        """Cevap gönderildiğinde çalışır."""
+        received = time.time()
+        room_code = data.get('room_code') or self.session_room(sid)
+        team_name = data.get('team_name')
+        answer = data.get('answer')
+
+        room = self.rooms.get(room_code)
+        if room is not None:
+            # Takımın cevabını kaydet
+            # Kabul edilirse cevabın sayıldığı soru numarası döner
+            number = room.submit_answer(team_name, answer)
+            accepted = number is not None
+            deadline = yield ('deadline', room_code)
+            self.log_event('answer', room_code, ts=received, team=team_name, answer=answer,
+                           number=number, accepted=accepted,
+                           remaining=round(deadline - time.monotonic(), 4) if deadline else None)
+            # Tüm takımlar cevap verdiyse süreyi beklemeden sonuçları göster
+            if accepted and room.all_teams_answered():
+                yield ('run_now', room_code, 'reveal')
+
+def add_arguments(parser):
+    """İki sunucuda ortak olan komut satırı seçeneklerini ekler."""
+    parser.add_argument('--host', default='192.168.1.103')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--question-time', type=float, default=QuizGame.question_time, help="soru süresi (saniye)")
+    parser.add_argument('--reveal-time', type=float, default=QuizGame.reveal_time,
+                        help="sonuç gösterim süresi (saniye)")
+    parser.add_argument('--questions', type=int, default=QuizGame.questions_per_game, help="oyun başına soru sayısı")
+    parser.add_argument('--coalesce-ms', type=float, default=0,
+                        help="lobi ve sohbet yayınlarını birleştirme penceresi (ms, 0: kapalı)")
+    parser.add_argument('--max-rooms', type=int, default=QuizGame.max_rooms,
+                        help="aynı anda açık olabilecek oda sayısı")
+    parser.add_argument('--idle-ttl', type=float, default=1800,
+                        help="etkinliği olmayan odanın kapatılma süresi (saniye)")
+    parser.add_argument('--finished-ttl', type=float, default=600,
+                        help="oyunu biten odanın kapatılma süresi (saniye)")
+    parser.add_argument('--abandoned-ttl', type=float, default=60,
+                        help="ev sahibi ayrılan ya da boşalan odanın kapatılma süresi (saniye)")
+    parser.add_argument('--event-log', default='event_log', help="olay günlüğü dizini (boş: kapalı)")
+    parser.add_argument('--no-fsync', dest='fsync', action='store_false', help="olay günlüğünde fsync yapma")
+
+def configure_reaper(reaper, args):
+    """Oda ömrü seçeneklerini temizleyiciye uygular."""
+    reaper.idle_ttl = args.idle_ttl
+    reaper.finished_ttl = args.finished_ttl
+    reaper.abandoned_ttl = args.abandoned_ttl
+    reaper.interval = min(reaper.interval, max(1.0, args.abandoned_ttl / 2))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+class RoomReaper:
+    """Boşta kalan, biten ya da terk edilen odaları kapatan arka plan görevi.
+
+    Her `interval` saniyede kayıttaki odalar taranır; `GameRoom.expiry_reason`
+    bir neden döndüren oda `close_room(room_code, room, reason)` ile
+    kapatılır. Kapatma nedenleri sayaçlarda tutulur. Tarama oda listesinin
+    anlık bir kopyası üzerinde yapılır; kayıt kilitleri tarama boyunca
+    tutulmaz.
+    """
+
+    REASONS = ('idle', 'finished', 'abandoned')
+
+    def __init__(self, socketio, registry, close_room, interval=10,
+                 idle_ttl=1800, finished_ttl=600, abandoned_ttl=60):
+        self.socketio = socketio
+        self.registry = registry
+        self.close_room = close_room
+        self.interval = interval
+        self.idle_ttl = idle_ttl
+        self.finished_ttl = finished_ttl
+        self.abandoned_ttl = abandoned_ttl
+        self.evicted = dict.fromkeys(self.REASONS, 0)
+        self.sweeps = 0
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """Arka plan görevini (henüz çalışmıyorsa) başlatır."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def sweep(self, now=None):
+        """Süresi dolan odaları kapatır; kapatılan oda sayısını döndürür."""
+        closed = 0
+        for room, reason in self._expired(now):
+            # Oda bu arada başka bir yoldan kapatıldıysa sayma
+            if self.close_room(room.room_code, room, reason):
+                closed += 1
+                self._evict(reason)
+        self._swept()
+        return closed
+
+    def _expired(self, now):
+        now = time.monotonic() if now is None else now
+        for room in self.registry.rooms():
+            reason = room.expiry_reason(now, self.idle_ttl, self.finished_ttl, self.abandoned_ttl)
+            if reason is not None:
+                yield room, reason
+
+    def _evict(self, reason):
+        with self._lock:
+            self.evicted[reason] += 1
+
+    def _swept(self):
+        with self._lock:
+            self.sweeps += 1
+
+    def stats(self):
+        with self._lock:
+            return {'sweeps': self.sweeps, 'evicted': dict(self.evicted)}
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Oda temizliği başarısız: {e}")
+
+class AsyncRoomReaper(RoomReaper):
+    """socketio.AsyncServer için RoomReaper; `close_room` ve `sweep` eşyordamdır."""
+
+    async def sweep(self, now=None):
+        closed = 0
+        for room, reason in self._expired(now):
+            if await self.close_room(room.room_code, room, reason):
+                closed += 1
+                self._evict(reason)
+        self._swept()
+        return closed
+
+    async def _run(self):
+        while True:
+            await self.socketio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Oda temizliği başarısız: {e}")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Olay günlüğünü (bkz. event_log.py) yeniden oynatır.
+
+Çalışan sunucuya dokunmadan bölüt dosyalarını okur; odaların durumunu
+(takımlar, hazır durumları, sorular, cevaplar, skorlar) olaylardan yeniden
+kurar ya da toplu istatistik üretir. Sonuç açıklamalarındaki skorlar
+yeniden hesaplanan skorlarla karşılaştırılır; tutarsızlıklar raporlanır.
+
+Kullanım:
+    python replay_events.py event_log                  # istatistikler
+    python replay_events.py event_log --room 123456    # tek odanın durumu
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from event_log import list_segments, read_segment
+
+class RoomState:
+    """Olaylardan yeniden kurulan oda durumu (sunucudaki GameRoom'un karşılığı)."""
+
+    def __init__(self, room_code):
+        self.room_code = room_code
+        self.teams = []
+        self.scores = {}
+        self.started = False
+        self.current_question = 0
+        self.questions = []
+        self.answers = {}
+        self.question_time = None
+        self.games_finished = 0
+        self.closed = False
+        self.mismatches = 0
+
+    def apply(self, event):
+        kind = event['type']
+        if kind == 'room_created':
+            self.teams = [{'name': event['host'], 'is_host': True, 'ready': False}]
+            self.scores = {event['host']: 0}
+        elif kind == 'team_joined':
+            self.teams.append({'name': event['team'], 'is_host': False, 'ready': False})
+            self.scores.setdefault(event['team'], 0)
+        elif kind == 'team_left':
+            self.teams = [team for team in self.teams if team['name'] != event['team']]
+        elif kind == 'ready_toggled':
+            for team in self.teams:
+                if team['name'] == event['team']:
+                    team['ready'] = not team['ready']
+        elif kind == 'game_started':
+            self.started = True
+            self.current_question = 0
+            self.questions = event['questions']
+            self.question_time = event.get('question_time')
+            self.answers = {}
+        elif kind == 'question_shown':
+            self.current_question = event['number'] - 1
+            self.answers = {}
+        elif kind == 'answer':
+            if event.get('accepted'):
+                self.answers[event['team']] = event['answer']
+                if event['answer'] == self.correct_answer():
+                    self.scores[event['team']] = self.scores.get(event['team'], 0) + 10
+        elif kind == 'reveal':
+            if event.get('scores') != self.scores:
+                self.mismatches += 1
+                self.scores = dict(event['scores'])
+        elif kind == 'game_over':
+            self.started = False
+            self.games_finished += 1
+            self.scores = dict(event['scores'])
+        elif kind == 'room_closed':
+            self.closed = True
+
+    def correct_answer(self):
+        if 0 <= self.current_question < len(self.questions):
+            return self.questions[self.current_question]['correct_answer']
+        return None
+
+    def to_dict(self):
+        return {
+            'room_code': self.room_code,
+            'teams': self.teams,
+            'scores': self.scores,
+            'started': self.started,
+            'current_question': self.current_question + 1 if self.started else None,
+            'answers': self.answers,
+            'games_finished': self.games_finished,
+            'closed': self.closed,
+            'score_mismatches': self.mismatches
+        }
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+class Statistics:
+    """Olaylardan toplu istatistik çıkarır."""
+
+    def __init__(self):
+        self.rooms = {}
+        self.counts = {}
+        self.answers = 0
+        self.correct = 0
+        self.rejected = 0
+        self.answer_times = []
+        self.category = {}   # kategori -> [cevap, doğru]
+        self.first_ts = None
+        self.last_ts = None
+
+    def apply(self, event):
+        kind = event['type']
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        if self.first_ts is None:
+            self.first_ts = event['ts']
+        self.last_ts = event['ts']
+
+        room_code = event.get('room')
+        if room_code is None:
+            return
+        room = self.rooms.get(room_code)
+        if room is None:
+            room = self.rooms[room_code] = RoomState(room_code)
+
+        if kind == 'answer':
+            if not event.get('accepted'):
+                self.rejected += 1
+            else:
+                self.answers += 1
+                correct = event['answer'] == room.correct_answer()
+                self.correct += correct
+                question_time = room.question_time
+                if question_time is not None and event.get('remaining') is not None:
+                    self.answer_times.append(question_time - event['remaining'])
+                if 0 <= room.current_question < len(room.questions):
+                    category = room.questions[room.current_question].get('category')
+                    counter = self.category.setdefault(category, [0, 0])
+                    counter[0] += 1
+                    counter[1] += correct
+        room.apply(event)
+
+    def to_dict(self):
+        times = sorted(self.answer_times)
+        return {
+            'events': self.counts,
+            'rooms': len(self.rooms),
+            'games_started': self.counts.get('game_started', 0),
+            'games_finished': self.counts.get('game_over', 0),
+            'answers': self.answers,
+            'rejected_answers': self.rejected,
+            'accuracy': round(self.correct / self.answers, 4) if self.answers else None,
+            'answer_time_s': {
+                'mean': round(sum(times) / len(times), 3) if times else None,
+                'p50': percentile(times, 0.50),
+                'p95': percentile(times, 0.95),
+            },
+            'accuracy_by_category': {
+                category: round(correct / total, 4)
+                for category, (total, correct) in self.category.items() if total
+            },
+            'score_mismatches': sum(room.mismatches for room in self.rooms.values()),
+            'span_s': round(self.last_ts - self.first_ts, 3) if self.first_ts is not None else 0,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Oyun olay günlüğünü yeniden oynatır")
+    parser.add_argument('directory', nargs='?', default='event_log', help="olay günlüğü dizini")
+    parser.add_argument('--room', help="yalnızca bu odanın son durumunu göster")
+    parser.add_argument('--until-seq', type=int, help="bu sıra numarasından sonraki olayları oynatma")
+    parser.add_argument('--output', help="sonucu JSON olarak bu dosyaya yaz")
+    args = parser.parse_args(argv)
+
+    segments = list_segments(args.directory)
+    if not segments:
+        print(f"Olay günlüğü bulunamadı: {args.directory}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    total_bytes = 0
+    events = 0
+    stats = Statistics()
+    room = RoomState(args.room) if args.room else None
+    for path in segments:
+        total_bytes += os.path.getsize(path)
+        for event in read_segment(path):
+            # Çoklu süreç modunda her sürecin sıra numaraları ayrıdır
+            if args.until_seq is not None and event['seq'] > args.until_seq:
+                continue
+            events += 1
+            if room is not None:
+                if event.get('room') == args.room:
+                    room.apply(event)
+            else:
+                stats.apply(event)
+    elapsed = time.perf_counter() - started
+
+    result = room.to_dict() if room is not None else stats.to_dict()
+    result['replay'] = {
+        'segments': len(segments),
+        'events': events,
+        'bytes': total_bytes,
+        'elapsed_s': round(elapsed, 3),
+        'events_per_s': round(events / elapsed) if elapsed else None,
+        'mb_per_s': round(total_bytes / elapsed / (1 << 20), 1) if elapsed else None,
+    }
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    print(output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
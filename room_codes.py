@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Çakışmasız ve tahmin edilemeyen oda kodu dağıtıcısı.
+
+Altı haneli kod uzayı (10^6) gizli anahtarlı bir permütasyonla gezilir:
+sayaç 0, 1, 2, ... ilerlerken kod, sayacın dört turlu bir Feistel
+şifresinden (iki yarı 0-999 aralığında, tur fonksiyonları süreç
+başında rastgele üretilen tablolar) geçirilmesiyle bulunur. Permütasyon
+birebir olduğundan sayaç ilerledikçe aynı kod iki kez çıkmaz ve yeniden
+deneme gerekmez; ardışık kodlar anahtar bilinmeden tahmin edilemez.
+
+Kapatılan odaların kodları bir bekleme kuyruğuna girer. Sayaç uzayın
+sonuna geldiğinde kodlar bu kuyruktan, en eski serbest bırakılandan
+başlanarak yeniden dağıtılır; böylece az önce kapanan bir odanın kodu
+hemen başka bir odaya verilmez. Kullanımdaki kodlar bir bayt dizisinde
+(1 MB) işaretlenir.
+
+Dosya doğrudan çalıştırılırsa rastgele dene-çakışırsa-tekrarla
+yöntemiyle karşılaştıran bir yük ölçümü yapar:
+
+    python room_codes.py --rooms 500000
+"""
+
+import random
+import threading
+from collections import deque
+
+class RoomCodeAllocator:
+    """Oda kodlarını O(1) sürede, çakışmasız dağıtır.
+
+    `accept(kod)` verilirse yalnızca True döndürdüğü kodlar dağıtılır
+    (ör. çoklu süreç modunda bu sürece düşen kodlar). Kodlar bitmişse
+    `allocate` None döndürür.
+    """
+
+    HALF = 1000
+    ROUNDS = 4
+
+    def __init__(self, digits=6, accept=None, rng=None):
+        if digits != 6:
+            raise ValueError("yalnızca altı haneli kodlar desteklenir")
+        rng = rng or random.SystemRandom()
+        self.size = self.HALF * self.HALF
+        self.accept = accept
+        self._tables = [[rng.randrange(self.HALF) for _ in range(self.HALF)]
+                        for _ in range(self.ROUNDS)]
+        self._next = 0                # sıradaki kullanılmamış sayaç değeri
+        self._released = deque()      # yeniden dağıtılmayı bekleyen kodlar
+        self._in_use = bytearray(self.size)
+        self._lock = threading.Lock()
+        self.live = 0
+
+    def _permute(self, index):
+        # Dengeli Feistel: her tur (sol, sağ) -> (sağ, sol + F(sağ)); birebirdir
+        left, right = divmod(index, self.HALF)
+        for table in self._tables:
+            left, right = right, (left + table[right]) % self.HALF
+        return left * self.HALF + right
+
+    def _format(self, number):
+        return f"{number:06d}"
+
+    def allocate(self):
+        """Kullanılmayan bir kod döndürür; kalmadıysa None."""
+        with self._lock:
+            while self._next < self.size:
+                number = self._permute(self._next)
+                self._next += 1
+                code = self._format(number)
+                if self.accept is None or self.accept(code):
+                    return self._take(number, code)
+            if self._released:
+                number = self._released.popleft()
+                return self._take(number, self._format(number))
+            return None
+
+    def _take(self, number, code):
+        # Çağıran kilidi tutmalıdır
+        self._in_use[number] = 1
+        self.live += 1
+        return code
+
+    def release(self, code):
+        """Kodu serbest bırakır; kod bu dağıtıcıdan alınmamışsa False döner."""
+        try:
+            number = int(code)
+        except (TypeError, ValueError):
+            return False
+        if not 0 <= number < self.size:
+            return False
+        with self._lock:
+            if not self._in_use[number]:
+                return False
+            self._in_use[number] = 0
+            self.live -= 1
+            self._released.append(number)
+            return True
+
+    def __contains__(self, code):
+        try:
+            number = int(code)
+        except (TypeError, ValueError):
+            return False
+        return 0 <= number < self.size and bool(self._in_use[number])
+
+    def stats(self):
+        with self._lock:
+            return {'live': self.live, 'fresh_left': self.size - self._next,
+                    'released': len(self._released)}
+
+class _RandomRetry:
+    # Eski yöntem: altı rastgele hane, kullanımdaysa tekrar dene
+    def __init__(self):
+        self.codes = set()
+        self.attempts = 0
+
+    def allocate(self):
+        while True:
+            self.attempts += 1
+            code = ''.join([str(random.randint(0, 9)) for _ in range(6)])
+            if code not in self.codes:
+                self.codes.add(code)
+                return code
+
+    def release(self, code):
+        self.codes.discard(code)
+
+def _measure(allocator, rooms, churn, checkpoints):
+    import time
+
+    live = []
+    stages = []
+    started = time.perf_counter()
+    stage_started = started
+    previous_attempts = 0
+    for count in range(1, rooms + 1):
+        live.append(allocator.allocate())
+        if count in checkpoints:
+            now = time.perf_counter()
+            done = count - (stages[-1]['live'] if stages else 0)
+            stage = {'live': count, 'us_per_alloc': round((now - stage_started) / done * 1e6, 3)}
+            if isinstance(allocator, _RandomRetry):
+                stage['attempts_per_alloc'] = round((allocator.attempts - previous_attempts) / done, 3)
+                previous_attempts = allocator.attempts
+            stages.append(stage)
+            stage_started = now
+
+    # Dolu uzayda oda kapanıp açılması
+    rng = random.Random(1)
+    churn_started = time.perf_counter()
+    for _ in range(churn):
+        index = rng.randrange(len(live))
+        allocator.release(live[index])
+        live[index] = allocator.allocate()
+    elapsed = time.perf_counter() - churn_started
+    result = {'stages': stages,
+              'churn_us_per_cycle': round(elapsed / max(churn, 1) * 1e6, 3),
+              'unique': len(set(live)) == len(live)}
+    if isinstance(allocator, _RandomRetry):
+        result['churn_attempts_per_alloc'] = round((allocator.attempts - previous_attempts) / max(churn, 1), 3)
+    return result
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Oda kodu dağıtıcısı yük ölçümü")
+    parser.add_argument('--rooms', type=int, default=500000, help="aynı anda açık oda sayısı")
+    parser.add_argument('--churn', type=int, default=100000, help="dolu uzayda kapat-aç döngüsü sayısı")
+    parser.add_argument('--skip-random', action='store_true', help="eski yöntemi ölçme")
+    args = parser.parse_args(argv)
+
+    rooms = min(args.rooms, 10 ** 6)
+    checkpoints = {max(1, rooms * step // 10) for step in range(1, 11)}
+    result = {'allocator': _measure(RoomCodeAllocator(), rooms, args.churn, checkpoints)}
+    if not args.skip_random:
+        result['random_retry'] = _measure(_RandomRetry(), rooms, args.churn, checkpoints)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+
+class RoomRegistry:
+    """Aktif odaları ve oturumları parçalı (sharded) sözlüklerde tutar.
+
+    Her parçanın kendi kilidi vardır; farklı parçalardaki odalar için
+    yapılan ekleme, silme ve arama işlemleri birbirini beklemez. Kilitler
+    yalnızca sözlük erişimini korur; oda içi durum GameRoom'un kendi
+    kilidiyle korunur.
+
+    Oturumlar iki yönlü izlenir: bağlantı (sid) -> (oda, takım) ve oda ->
+    bağlantılar (ve her bağlantının yük kodlaması, bkz. wire.py). Böylece
+    bağlantı koptuğunda takımı, oda kapandığında da odadaki tüm oturumları
+    bulmak tarama gerektirmez.
+    """
+
+    def __init__(self, shard_count=64):
+        self._shards = [({}, threading.Lock()) for _ in range(shard_count)]
+        self._sessions = [({}, threading.Lock()) for _ in range(shard_count)]
+        self._members = [({}, threading.Lock()) for _ in range(shard_count)]
+
+    def _shard(self, shards, key):
+        return shards[hash(key) % len(shards)]
+
+    def add(self, room_code, room):
+        """Odayı ekler; kod zaten kullanılıyorsa False döner."""
+        rooms, lock = self._shard(self._shards, room_code)
+        with lock:
+            if room_code in rooms:
+                return False
+            rooms[room_code] = room
+            return True
+
+    def get(self, room_code):
+        """Odayı döndürür, yoksa None."""
+        if room_code is None:
+            return None
+        rooms, lock = self._shard(self._shards, room_code)
+        with lock:
+            return rooms.get(room_code)
+
+    def remove(self, room_code, room=None):
+        """Odayı siler. `room` verilmişse yalnızca kayıtlı oda o ise silinir."""
+        rooms, lock = self._shard(self._shards, room_code)
+        with lock:
+            current = rooms.get(room_code)
+            if current is None or (room is not None and current is not room):
+                return None
+            return rooms.pop(room_code)
+
+    def __contains__(self, room_code):
+        return self.get(room_code) is not None
+
+    def __len__(self):
+        total = 0
+        for rooms, lock in self._shards:
+            with lock:
+                total += len(rooms)
+        return total
+
+    def rooms(self):
+        """Tüm odaların anlık bir listesini döndürür."""
+        result = []
+        for rooms, lock in self._shards:
+            with lock:
+                result.extend(rooms.values())
+        return result
+
+    def bind(self, sid, room_code, team_name, encoding='json'):
+        """Bağlantıyı (sid) bir oda ve takımla ilişkilendirir; önceki kaydı döndürür."""
+        sessions, lock = self._shard(self._sessions, sid)
+        with lock:
+            previous = sessions.get(sid)
+            sessions[sid] = (room_code, team_name)
+        if previous is not None and previous[0] != room_code:
+            self._discard_member(previous[0], sid)
+        members, lock = self._shard(self._members, room_code)
+        with lock:
+            members.setdefault(room_code, {})[sid] = encoding
+        return previous
+
+    def _discard_member(self, room_code, sid):
+        members, lock = self._shard(self._members, room_code)
+        with lock:
+            sids = members.get(room_code)
+            if sids is not None:
+                sids.pop(sid, None)
+                if not sids:
+                    del members[room_code]
+
+    def session(self, sid):
+        """Bağlantının (oda kodu, takım adı) bilgisini döndürür, yoksa None."""
+        sessions, lock = self._shard(self._sessions, sid)
+        with lock:
+            return sessions.get(sid)
+
+    def unbind(self, sid):
+        """Bağlantının oturum kaydını siler ve döndürür."""
+        sessions, lock = self._shard(self._sessions, sid)
+        with lock:
+            session = sessions.pop(sid, None)
+        if session is not None:
+            self._discard_member(session[0], sid)
+        return session
+
+    def unbind_room(self, room_code):
+        """Odadaki tüm oturumları siler; bağlantıların listesini döndürür."""
+        members, lock = self._shard(self._members, room_code)
+        with lock:
+            sids = members.pop(room_code, {})
+        for sid in sids:
+            sessions, lock = self._shard(self._sessions, sid)
+            with lock:
+                # Bağlantı bu arada başka bir odaya geçtiyse dokunma
+                session = sessions.get(sid)
+                if session is not None and session[0] == room_code:
+                    del sessions[sid]
+        return list(sids)
+
+    def encodings(self, room_code):
+        """Odadaki bağlantıların kullandığı yük kodlamaları."""
+        members, lock = self._shard(self._members, room_code)
+        with lock:
+            return set(members.get(room_code, {}).values())
+
+    def session_count(self):
+        """Kayıtlı oturum sayısı."""
+        total = 0
+        for sessions, lock in self._sessions:
+            with lock:
+                total += len(sessions)
+        return total
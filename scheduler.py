@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+class RoundScheduler:
+    """Tüm odaların tur geçişlerini tek bir arka plan görevinden yönetir.
+
+    Her oda için en fazla bir bekleyen geçiş (soru bitişi, sonuç gösterimi
+    sonrası ilerleme) tutulur. Süreler tek bir yığında (heap) saklanır;
+    yeni bir geçiş planlandığında ya da geçiş erkenden çalıştırıldığında
+    eski kayıt geçersiz sayılır, böylece her geçiş oda başına tam bir kez
+    çalışır. Bekleyen geçişler bir kilitle korunur; geçişin kendisi kilit
+    dışında çalıştırılır.
+    """
+
+    def __init__(self, socketio, tick=0.1):
+        self.socketio = socketio
+        self.tick = tick
+        self._heap = []
+        self._pending = {}  # room_code -> (token, deadline, action)
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """Arka plan görevini (henüz çalışmıyorsa) başlatır."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def schedule(self, room_code, delay, action):
+        """Odanın bekleyen geçişini `delay` saniye sonra çalışacak `action` ile değiştirir."""
+        self.start()
+        deadline = time.monotonic() + delay
+        with self._lock:
+            token = next(self._tokens)
+            self._pending[room_code] = (token, deadline, action)
+            heapq.heappush(self._heap, (deadline, token, room_code))
+        return deadline
+
+    def cancel(self, room_code):
+        """Odanın bekleyen geçişini iptal eder."""
+        with self._lock:
+            self._pending.pop(room_code, None)
+
+    def deadline(self, room_code):
+        """Odanın bekleyen geçişinin monotonic süre sonunu döndürür."""
+        with self._lock:
+            pending = self._pending.get(room_code)
+        return pending[1] if pending else None
+
+    def run_now(self, room_code, action=None):
+        """Bekleyen geçişi beklemeden çalıştırır.
+
+        `action` verilmişse yalnızca bekleyen geçiş bu eylemse çalışır.
+        Geçiş çalıştırıldıysa True döner.
+        """
+        with self._lock:
+            pending = self._pending.get(room_code)
+            if pending is None or (action is not None and pending[2] != action):
+                return False
+            del self._pending[room_code]
+        pending[2](room_code)
+        return True
+
+    def run_if_due(self, room_code):
+        """Süresi dolmuş bir geçiş varsa hemen çalıştırır."""
+        with self._lock:
+            pending = self._pending.get(room_code)
+            if pending is None or pending[1] > time.monotonic():
+                return False
+            del self._pending[room_code]
+        pending[2](room_code)
+        return True
+
+    def _run(self):
+        while True:
+            for room_code, action in self._pop_due(time.monotonic()):
+                try:
+                    action(room_code)
+                except Exception as e:
+                    print(f"Zamanlayıcı hatası ({room_code}): {e}")
+            self.socketio.sleep(self.tick)
+
+    def _pop_due(self, now):
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, token, room_code = heapq.heappop(self._heap)
+                pending = self._pending.get(room_code)
+                # Yeniden planlanmış ya da erken çalışmış geçişleri atla
+                if pending is None or pending[0] != token:
+                    continue
+                del self._pending[room_code]
+                due.append((room_code, pending[2]))
+        return due
+
+class AsyncRoundScheduler:
+    """RoundScheduler'ın asyncio karşılığı (bkz. async_server.py).
+
+    Arayüz aynıdır; ancak eylemler (`action(room_code)`) eşyordamdır ve
+    `run_now` / `run_if_due` beklenir. Her odanın bekleyen geçişi, süresi
+    dolunca eylemi çalıştıran bir asyncio görevidir; yeni geçiş
+    planlandığında ya da geçiş erkenden çalıştırıldığında eski görev iptal
+    edilir. Tüm çağrılar olay döngüsünden yapıldığı için kilit gerekmez.
+    """
+
+    def __init__(self):
+        self._pending = {}  # room_code -> (görev, deadline, action)
+
+    def schedule(self, room_code, delay, action):
+        """Odanın bekleyen geçişini `delay` saniye sonra çalışacak `action` ile değiştirir."""
+        self.cancel(room_code)
+        deadline = time.monotonic() + delay
+        task = asyncio.get_running_loop().create_task(self._fire(room_code, delay, action))
+        self._pending[room_code] = (task, deadline, action)
+        return deadline
+
+    def cancel(self, room_code):
+        """Odanın bekleyen geçişini iptal eder."""
+        pending = self._pending.pop(room_code, None)
+        if pending is not None:
+            pending[0].cancel()
+
+    def deadline(self, room_code):
+        """Odanın bekleyen geçişinin monotonic süre sonunu döndürür."""
+        pending = self._pending.get(room_code)
+        return pending[1] if pending else None
+
+    async def run_now(self, room_code, action=None):
+        """Bekleyen geçişi beklemeden çalıştırır; çalıştırıldıysa True döner."""
+        pending = self._pending.get(room_code)
+        if pending is None or (action is not None and pending[2] != action):
+            return False
+        self.cancel(room_code)
+        await pending[2](room_code)
+        return True
+
+    async def run_if_due(self, room_code):
+        """Süresi dolmuş bir geçiş varsa hemen çalıştırır."""
+        pending = self._pending.get(room_code)
+        if pending is None or pending[1] > time.monotonic():
+            return False
+        self.cancel(room_code)
+        await pending[2](room_code)
+        return True
+
+    async def _fire(self, room_code, delay, action):
+        await asyncio.sleep(delay)
+        # Görev iptal edilmediyse kayıt hâlâ bu görevindir; eylem aynı oda
+        # için yeni bir geçiş planlayabilsin diye önce kaydı sil
+        del self._pending[room_code]
+        try:
+            await action(room_code)
+        except Exception as e:
+            print(f"Zamanlayıcı hatası ({room_code}): {e}")
@@ -1,293 +1,268 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from flask import Flask, request, jsonify # type: ignore
-from flask_socketio import SocketIO, emit, join_room, leave_room # type: ignore
-import sqlite3
-import json
-import random
-from datetime import datetime
+from flask import Flask, Response, request, jsonify # type: ignore
+from flask_socketio import SocketIO, join_room, leave_room # type: ignore
+import os
+import argparse
+from scheduler import RoundScheduler
+from coalescer import BroadcastCoalescer
+from reaper import RoomReaper
+from room_codes import RoomCodeAllocator
+from cluster import HashRing, tag_session_ids
+from metrics import Metrics
+from profiler import HandlerProfiler
+from wire import metered_packet
+from quiz_game import QuizGame, add_arguments, configure_reaper
+import signal
+import hmac
+
+# Çoklu süreç modu (bkz. cluster.py): mesaj kuyruğu adresi ve sürecin sırası
+MESSAGE_QUEUE = os.environ.get('QUIZ_MESSAGE_QUEUE')
+WORKER_INDEX = int(os.environ.get('QUIZ_WORKER_INDEX', 0))
+WORKER_COUNT = int(os.environ.get('QUIZ_WORKER_COUNT', 1))
+
+# Prometheus metrikleri (GET /metrics); kayıt kilitsizdir, sürekli açık kalabilir
+metrics = Metrics()
+metrics.histogram('quiz_socketio_handler_seconds', "Socket.IO olay işleyicisi süresi", labels=('event',))
+metrics.counter('quiz_emit_total', "Gönderilen olay çerçevesi (oda yayını bir kez sayılır)", labels=('event',))
+metrics.counter('quiz_emit_bytes_total', "Gönderilen olay çerçevesi boyutu (bayt)", labels=('event',))
+
+# Gönderilen olayları ve boyutlarını sayan paket sınıfı
+MeteredPacket = metered_packet(metrics)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'gizli-anahtar-123'
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# Oda ve takım bilgilerini tutacak sözlükler
-rooms = {}
-sid_to_room = {}
-sid_to_team = {}
-
-# Aktif odaları tutacak sözlük
-active_rooms = {}
-
-class GameRoom:
-    def __init__(self, room_code, host_name):
-        self.room_code = room_code
-        self.teams = [{"name": host_name, "is_host": True, "ready": False}]
-        self.started = False
-        self.current_question = 0
-        self.questions = []
-        self.scores = {host_name: 0}
-        self.answers = {}
-
-    def reset_answers(self):
-        """Tüm takımların cevaplarını sıfırlar."""
-        self.answers = {}
-
-    def submit_answer(self, team_name, answer):
-        """Takımın cevabını kaydeder ve doğruysa puan verir."""
-        if team_name not in self.answers:
-            self.answers[team_name] = answer
-            
-            # İlk kez cevap veriyorsa ve doğruysa puan ver
-            if answer == self.questions[self.current_question]['correct_answer']:
-                self.scores[team_name] = self.scores.get(team_name, 0) + 10
-            
-            return True
-        return False
-
-    def all_teams_answered(self):
-        """Tüm takımlar cevap verdi mi kontrol eder."""
-        return len(self.answers) == len(self.teams)
-
-    def get_next_question(self):
-        """Bir sonraki soruyu döndürür."""
-        self.current_question += 1
-        if self.current_question < len(self.questions):
-            question = self.questions[self.current_question]
-            return {
-                'question': question['question'],
-                'answer_a': question['options'][0],
-                'answer_b': question['options'][1],
-                'answer_c': question['options'][2],
-                'answer_d': question['options'][3],
-                'question_number': self.current_question + 1,
-                'time': 30,
-                'correct_answer': question['correct_answer']
-            }
-        return None
-
-@socketio.on('connect')
-def handle_connect():
-    print(f"Client connected: {request.sid}")
-
-@socketio.on('disconnect')
+if MESSAGE_QUEUE:
+    from broker import UnixSocketManager
+    socketio = SocketIO(app, cors_allowed_origins="*", serializer=MeteredPacket,
+                        client_manager=UnixSocketManager(MESSAGE_QUEUE))
+else:
+    socketio = SocketIO(app, cors_allowed_origins="*", serializer=MeteredPacket)
+
+# İsteğe bağlı profil çıkarıcı (--profile-rate); kapalıyken maliyeti bir kontroldür
+profiler = HandlerProfiler()
+PROFILE_TOKEN = None  # --profile-token; verilmezse /profile kapalıdır
+
+def on(event):
+    """`socketio.on` gibi; işleyicinin süresini metriklere yazar ve örneklenen çağrıların profilini çıkarır."""
+    def decorator(handler):
+        socketio.on(event)(metrics.timer('quiz_socketio_handler_seconds', (event,))(
+            profiler.wrap(event, handler)))
+        return handler
+    return decorator
+
+# Oda kodları yalnızca bu sürece düşenlerden seçilir; oturum kimlikleri
+# yönlendiricinin tanıyabilmesi için süreç etiketi taşır
+room_ring = None
+if WORKER_COUNT > 1:
+    room_ring = HashRing(range(WORKER_COUNT))
+    tag_session_ids(socketio.server.eio, WORKER_INDEX)
+
+# Oyun kuralları ve durumu (bkz. quiz_game.py); bu dosya yalnızca onun
+# istediği gönderimleri ve zamanlayıcı işlerini eventlet üzerinde yapar
+game = QuizGame(metrics, 'quiz_data.db', worker_index=WORKER_INDEX, room_codes=RoomCodeAllocator(
+    accept=None if room_ring is None else lambda code: room_ring.node_for(code) == WORKER_INDEX))
+
+# Tüm odaların tur geçişlerini yöneten zamanlayıcı
+scheduler = RoundScheduler(socketio)
+
+# Oda yayınları; lobi yamaları ve sohbet isteğe bağlı olarak kısa bir
+# pencerede birleştirilir (--coalesce-ms, 0: kapalı). Her olay odada
+# kullanılan kodlamalar için ayrı kodlanıp o kodlamanın kanalına gider.
+broadcaster = BroadcastCoalescer(socketio, tick=0, codec=game.wire,
+                                 encodings=lambda room_code: game.rooms.encodings(room_code))
+
+def drive(steps):
+    """Oyun adımını yürütür: istediği komutları yapıp sonuçlarını geri verir.
+
+    Adımın dönüş değerini döndürür.
+    """
+    result = None
+    while True:
+        try:
+            command = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result = commands[command[0]](*command[1:])
+
+def close_room(room_code, room, reason=None):
+    return drive(game.close_room(room_code, room, reason))
+
+def reveal_answer(room_code):
+    drive(game.reveal_answer(room_code))
+
+def advance_question(room_code):
+    drive(game.advance_question(room_code))
+
+# Zamanlayıcıya verilen tur adımları; `run_now` eylemi kimliğiyle karşılaştırır
+round_steps = {'reveal': reveal_answer, 'advance': advance_question}
+
+# Süresi dolan odaları kapatan arka plan görevi
+reaper = RoomReaper(socketio, game.rooms, close_room)
+
+commands = {
+    'send': lambda sid, event, payload: socketio.emit(event, payload, to=sid),
+    'emit': broadcaster.emit,
+    'join': lambda sid, channel: join_room(channel, sid=sid),
+    'leave': lambda sid, channel: leave_room(channel, sid=sid),
+    'close_channel': socketio.close_room,
+    'discard': broadcaster.discard,
+    'schedule': lambda room_code, delay, step: scheduler.schedule(room_code, delay, round_steps[step]),
+    'run_now': lambda room_code, step: scheduler.run_now(room_code, round_steps[step]),
+    'run_if_due': scheduler.run_if_due,
+    'cancel': scheduler.cancel,
+    'deadline': scheduler.deadline,
+    'sweep': lambda: reaper.sweep(),
+    'call': lambda fn, *args: fn(*args),
+}
+
+# Okuma anında hesaplanan metrikler (oyun durumununkiler QuizGame'de)
+metrics.collect('quiz_connected_sids', "Bağlı Socket.IO istemcisi sayısı",
+                lambda: len(socketio.server.eio.sockets))
+metrics.collect('quiz_rooms_evicted_total', "Temizleyicinin kapattığı odalar",
+                lambda: {(reason,): value for reason, value in reaper.stats()['evicted'].items()},
+                kind='counter', labels=('reason',))
+metrics.collect('quiz_broadcast_events_total', "Yayınlanan oda olayları", lambda: broadcaster.events, kind='counter')
+metrics.collect('quiz_broadcast_frames_total', "Gönderilen yayın çerçeveleri (birleştirme sonrası)",
+                lambda: broadcaster.frames, kind='counter')
+
+def shutdown(*_):
+    """SIGTERM ile durdurulurken bekleyen skorları ve olayları yazıp süreci sonlandırır."""
+    # sys.exit burada yalnızca o an çalışan yeşil iş parçacığını sonlandırırdı
+    game.close()
+    os._exit(0)
+
+@app.route('/stats')
+def stats():
+    """Açık oda, oturum ve bağlantı sayılarını, oda sayaçlarını döndürür."""
+    result = game.stats()
+    result.update(connections=len(socketio.server.eio.sockets), reaper=reaper.stats())
+    return jsonify(result)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Metrikleri Prometheus metin biçiminde döndürür."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/profile', methods=['POST'])
+def profile_endpoint():
+    """Toplanan profilleri dosyalara yazar; `--profile-token` verilmezse kapalıdır.
+
+    İstek `X-Profile-Token` başlığında aynı anahtarı taşımalıdır. Çoklu
+    süreç modunda bağlantılar yönlendiriciden geldiği için karşı tarafın
+    adresine güvenilmez. `rate` verilirse örnekleme oranı değiştirilir,
+    `reset=1` birikmiş yığınları yazdıktan sonra siler.
+    """
+    if not PROFILE_TOKEN:
+        return jsonify({'error': 'bulunamadı'}), 404
+    token = request.headers.get('X-Profile-Token', '')
+    if not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        return jsonify({'error': 'yetkisiz'}), 403
+    rate = request.values.get('rate', type=float)
+    if rate is not None:
+        profiler.rate = min(max(rate, 0.0), 1.0)
+    summary = profiler.dump(reset=request.values.get('reset') == '1')
+    return jsonify({'rate': profiler.rate, 'directory': profiler.directory, 'events': summary})
+
+def dump_profiles(*_):
+    """SIGUSR1 ile toplanan profilleri dosyalara yazar."""
+    summary = profiler.dump()
+    print(f"Profiller yazıldı: {profiler.directory} ({len(summary)} olay)")
+
+@app.route('/high_scores')
+def high_scores():
+    """Skor tablosunu döndürür; `category` ve `day` (YYYY-AA-GG) ile süzülebilir."""
+    try:
+        scores = game.high_scores(request.args.get('limit', 10, type=int),
+                                  request.args.get('category'), request.args.get('day'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(scores)
+
+@on('connect')
+def handle_connect(auth=None):
+    drive(game.connect(request.sid, auth))
+
+@on('disconnect')
 def handle_disconnect():
-    print(f"Client disconnected: {request.sid}")
-    # Odadan çıkış işlemleri
+    drive(game.disconnect(request.sid))
 
-@socketio.on('create_room')
+@on('create_room')
 def handle_create_room(data):
-    team_name = data.get('team_name')
-    room_code = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-    
-    # Yeni oda oluştur
-    active_rooms[room_code] = GameRoom(room_code, team_name)
-    
-    # Odaya katıl
-    join_room(room_code)
-    
-    emit('room_created', {
-        'room_code': room_code,
-        'teams': active_rooms[room_code].teams
-    })
-
-@socketio.on('join_room')
+    drive(game.create_room(request.sid, data))
+    reaper.start()
+
+@on('join_room')
 def handle_join_room(data):
     """Odaya katılma isteğini işler."""
-    room_code = data['room_code']
-    team_name = data['team_name']
-    print(f"Katılma isteği: {team_name} - Oda: {room_code}")
-    
-    if room_code in active_rooms:
-        # Takımı odaya ekle
-        active_rooms[room_code].teams.append({
-            'name': team_name,
-            'is_host': False,
-            'ready': False
-        })
-        
-        # Odaya katıl
-        join_room(room_code)
-        
-        # Takım bilgilerini kaydet
-        sid_to_room[request.sid] = room_code
-        sid_to_team[request.sid] = team_name
-        
-        # Oda bilgilerini gönder
-        emit('room_created', {
-            'room_code': room_code,
-            'teams': active_rooms[room_code].teams
-        })
-        
-        # Tüm istemcilere güncel takım listesini gönder
-        emit('teams_updated', {'teams': active_rooms[room_code].teams}, room=room_code)
-    else:
-        emit('error', {'message': 'Oda bulunamadı!'})
-
-@socketio.on('toggle_ready')
+    drive(game.join_room(request.sid, data))
+
+@on('toggle_ready')
 def handle_toggle_ready(data):
-    room_code = data.get('room_code')
-    team_name = data.get('team_name')
-    
-    if room_code in active_rooms:
-        room = active_rooms[room_code]
-        for team in room.teams:
-            if team['name'] == team_name and not team['is_host']:
-                team['ready'] = not team['ready']
-                break
-        
-        emit('room_updated', {
-            'teams': room.teams
-        }, room=room_code)
-
-@socketio.on('start_game')
+    drive(game.toggle_ready(request.sid, data))
+
+@on('clock_ping')
+def handle_clock_ping(data):
+    drive(game.clock_ping(request.sid, data))
+
+@on('request_room_snapshot')
+def handle_request_room_snapshot(data):
+    drive(game.request_room_snapshot(request.sid, data))
+
+@on('start_game')
 def handle_start_game(data):
-    room_code = data.get('room_code')
-    
-    if room_code in active_rooms:
-        room = active_rooms[room_code]
-        
-        # Tüm oyuncular hazır mı kontrol et
-        if all(team['ready'] or team['is_host'] for team in room.teams):
-            room.started = True
-            # Soruları yükle
-            conn = sqlite3.connect('quiz_data.db')
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM questions ORDER BY RANDOM() LIMIT 10")
-            questions = []
-            for row in cur.fetchall():
-                questions.append({
-                    'question': row[3],
-                    'correct_answer': row[4],
-                    'options': [row[5], row[6], row[7], row[8]]
-                })
-            conn.close()
-            
-            room.questions = questions
-            # İlk soruyu hazırla
-            first_question = {
-                'question': questions[0]['question'],
-                'answer_a': questions[0]['options'][0],
-                'answer_b': questions[0]['options'][1],
-                'answer_c': questions[0]['options'][2],
-                'answer_d': questions[0]['options'][3],
-                'question_number': 1,
-                'time': 30,
-                'correct_answer': questions[0]['correct_answer']
-            }
-            
-            emit('game_started', {
-                'first_question': first_question
-            }, room=room_code)
-
-@socketio.on('leave_room')
+    drive(game.start_game(request.sid, data))
+
+@on('request_question')
+def handle_request_question(data):
+    drive(game.request_question(request.sid, data))
+
+@on('leave_room')
 def handle_leave_room(data):
-    room_code = data.get('room_code')
-    team_name = data.get('team_name')
-    
-    if room_code in active_rooms:
-        room = active_rooms[room_code]
-        room.teams = [team for team in room.teams if team['name'] != team_name]
-        leave_room(room_code)
-        
-        if not room.teams:
-            # Oda boşsa sil
-            del active_rooms[room_code]
-        else:
-            # Diğer oyunculara güncel listeyi gönder
-            emit('room_updated', {
-                'teams': room.teams
-            }, room=room_code)
-
-@socketio.on('chat_message')
+    drive(game.leave_room(request.sid, data))
+
+@on('chat_message')
 def handle_chat_message(data):
-    room_code = data.get('room_code')
-    team_name = data.get('team_name')
-    message = data.get('message')
-    
-    if room_code in active_rooms:
-        emit('new_chat_message', {
-            'team_name': team_name,
-            'message': message
-        }, room=room_code)
-
-@socketio.on('next_question')
+    drive(game.chat_message(request.sid, data))
+
+@on('next_question')
 def handle_next_question():
-    """Bir sonraki soruya geçer."""
-    room_code = sid_to_room.get(request.sid)
-    if room_code and room_code in active_rooms:
-        room = active_rooms[room_code]
-        # Tüm takımların cevaplarını sıfırla
-        room.reset_answers()
-        # Bir sonraki soruyu gönder
-        next_question = room.get_next_question()
-        if next_question:
-            emit('show_question', next_question, room=room_code)
-        else:
-            # Oyun bitti
-            emit('game_over', {'scores': room.scores}, room=room_code)
-
-@socketio.on('time_up')
-def handle_time_up(data):
-    """Süre dolduğunda çalışır."""
-    room_code = data.get('room_code')
-    if room_code in active_rooms:
-        room = active_rooms[room_code]
-        
-        # Doğru cevabı ve skorları göster
-        correct_answer = room.questions[room.current_question]['correct_answer']
-        
-        # Tüm istemcilere sonuçları gönder
-        emit('show_results', {
-            'correct_answer': correct_answer,
-            'scores': room.scores
-        }, room=room_code)
-        
-        # 7 saniye bekle ve sonraki soruya geç
-        socketio.sleep(7)
-        
-        # Sonraki soruya geç
-        next_question = room.get_next_question()
-        if next_question:
-            emit('show_question', next_question, room=room_code)
-        else:
-            # Oyun bitti
-            emit('game_over', {'scores': room.scores}, room=room_code)
-
-@socketio.on('submit_answer')
+    """Eski istemciler için; soru geçişlerini artık zamanlayıcı yönetir."""
+    pass
+
+@on('time_up')
+def handle_time_up(data=None):
+    """İstemcide süre dolduğunda çalışır (bkz. QuizGame.time_up)."""
+    drive(game.time_up(request.sid, data))
+
+@on('submit_answer')
 def handle_submit_answer(data):
     """Cevap gönderildiğinde çalışır."""
-    room_code = data.get('room_code')
-    team_name = data.get('team_name')
-    answer = data.get('answer')
-    
-    if room_code in active_rooms:
-        room = active_rooms[room_code]
-        
-        # Takımın cevabını kaydet
-        if room.submit_answer(team_name, answer):
-            # Tüm takımlar cevap verdi mi kontrol et
-            if room.all_teams_answered():
-                # Doğru cevabı ve skorları göster
-                correct_answer = room.questions[room.current_question]['correct_answer']
-                
-                # Tüm istemcilere sonuçları gönder
-                emit('show_results', {
-                    'correct_answer': correct_answer,
-                    'scores': room.scores
-                }, room=room_code)
-                
-                # 7 saniye bekle ve sonraki soruya geç
-                socketio.sleep(7)
-                
-                # Sonraki soruya geç
-                next_question = room.get_next_question()
-                if next_question:
-                    emit('show_question', next_question, room=room_code)
-                else:
-                    # Oyun bitti
-                    emit('game_over', {'scores': room.scores}, room=room_code)
+    drive(game.submit_answer(request.sid, data))
 
 if __name__ == '__main__':
-    socketio.run(app, host='192.168.1.103', port=8080, debug=True) 
+    parser = argparse.ArgumentParser(description="Bilgi Yarışması oyun sunucusu")
+    add_arguments(parser)
+    parser.add_argument('--no-debug', dest='debug', action='store_false', help="hata ayıklama modunu kapatır")
+    parser.add_argument('--profile-rate', type=float, default=0,
+                        help="profili çıkarılacak işleyici çağrısı oranı (0-1, 0: kapalı)")
+    parser.add_argument('--profile-dir', default='profiles', help="profil dosyalarının yazılacağı dizin")
+    parser.add_argument('--profile-token', default=os.environ.get('QUIZ_PROFILE_TOKEN'),
+                        help="POST /profile için anahtar (varsayılan: QUIZ_PROFILE_TOKEN; boş: uç nokta kapalı)")
+    args = parser.parse_args()
+
+    game.configure(args)
+    broadcaster.tick = args.coalesce_ms / 1000.0
+    configure_reaper(reaper, args)
+    profiler.rate = args.profile_rate
+    PROFILE_TOKEN = args.profile_token
+    profiler.directory = os.path.join(args.profile_dir, f"w{WORKER_INDEX}") if WORKER_COUNT > 1 else args.profile_dir
+    if args.event_log:
+        # Çoklu süreç modunda her süreç kendi alt dizinine yazar
+        game.open_event_log(os.path.join(args.event_log, f"w{WORKER_INDEX}") if WORKER_COUNT > 1 else args.event_log,
+                            fsync=args.fsync)
+    game.load()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGUSR1, dump_profiles)
+    socketio.run(app, host=args.host, port=args.port, debug=args.debug)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Arka plan iş parçacıklarından Tk arayüzüne güvenli olay aktarımı.
+
+Tk yalnızca kendi ana döngüsünün iş parçacığından çağrılabilir;
+python-socketio ise olay dinleyicilerini kendi arka plan iş
+parçacıklarında çalıştırır. `UIDispatcher.post` çağrıyı yalnızca bir
+kuyruğa ekler (Tk'ye dokunmaz); Tk döngüsü `root.after` ile kuyruğu kısa
+aralıklarla boşaltır.
+
+Aynı `key` ile gönderilen çağrılardan yalnızca en yenisi çalışır: yeni
+durum eskisini tümüyle geçersiz kılıyorsa (ör. art arda gelen takım
+listesi güncellemeleri) aradaki çizimler atlanır. Sonraki olayların
+dayandığı çizimler (ör. sonucun işaretlendiği soru ekranı) anahtarsız
+gönderilmelidir. Tek bir boşaltma `budget_ms` süresini aşarsa kalan
+çağrılar bir sonraki tura bırakılır, böylece bir patlama pencereyi
+dondurmaz.
+
+Dosya doğrudan çalıştırılırsa bir olay patlamasını birleştirerek ve
+birleştirmeden işleyip süreleri karşılaştıran küçük bir ölçüm yapar:
+
+    python ui_dispatch.py --events 500
+"""
+
+import threading
+import time
+from collections import deque
+
+class UIDispatcher:
+    """Tk iş parçacığında çalıştırılacak çağrılar için birleştirmeli kuyruk."""
+
+    def __init__(self, root, interval_ms=15, budget_ms=8):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        self._queue = deque()
+        self._latest = {}   # key -> en son gönderilen çağrının sıra numarası
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._job = None
+        self.posted = 0
+        self.run = 0
+        self.dropped = 0
+        self.max_wait_ms = 0.0
+        self.max_drain_ms = 0.0
+
+    def start(self):
+        """Kuyruk boşaltmayı başlatır; Tk iş parçacığından çağrılmalıdır."""
+        if self._job is None:
+            self._job = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def post(self, callback, *args, key=None):
+        """`callback(*args)` çağrısını Tk iş parçacığında çalışmak üzere kuyruğa ekler.
+
+        Her iş parçacığından çağrılabilir. `key` verilirse aynı anahtarla
+        daha sonra eklenen bir çağrı bu çağrıyı geçersiz kılar.
+        """
+        with self._lock:
+            self._seq += 1
+            self.posted += 1
+            if key is not None:
+                self._latest[key] = self._seq
+            self._queue.append((self._seq, key, callback, args, time.perf_counter()))
+
+    def pending(self):
+        with self._lock:
+            return len(self._queue)
+
+    def drain(self):
+        """Kuyruktaki çağrıları süre bütçesi içinde çalıştırır; kalan sayısını döndürür."""
+        started = time.perf_counter()
+        deadline = started + self.budget_ms / 1000.0
+        with self._lock:
+            items = list(self._queue)
+            self._queue.clear()
+
+        index = 0
+        ran = 0
+        while index < len(items):
+            seq, key, callback, args, posted = items[index]
+            if key is not None and self._latest.get(key) != seq:
+                # Daha yeni bir durum gelmiş; bu çizim atlanır
+                self.dropped += 1
+                index += 1
+                continue
+            now = time.perf_counter()
+            if ran and now > deadline:
+                break
+            index += 1
+            ran += 1
+            self.run += 1
+            self.max_wait_ms = max(self.max_wait_ms, (now - posted) * 1000)
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Arayüz olayı işlenemedi: {e}")
+        rest = items[index:]
+        if rest:
+            # Bütçe doldu; çalışmayanları sıranın başına geri koy
+            with self._lock:
+                self._queue.extendleft(reversed(rest))
+        self.max_drain_ms = max(self.max_drain_ms, (time.perf_counter() - started) * 1000)
+        return len(rest)
+
+    def _tick(self):
+        self._job = None
+        remaining = self.drain()
+        # Bütçe dolduysa bekletmeden, yoksa bir sonraki aralıkta devam et
+        self._job = self.root.after(1 if remaining else self.interval_ms, self._tick)
+
+    def stats(self):
+        return {
+            'posted': self.posted,
+            'run': self.run,
+            'dropped': self.dropped,
+            'max_wait_ms': round(self.max_wait_ms, 3),
+            'max_drain_ms': round(self.max_drain_ms, 3)
+        }
+
+def main(argv=None):
+    import argparse
+    import json
+    import tkinter as tk
+    from question_view import QuestionView
+
+    parser = argparse.ArgumentParser(description="Arayüz olay kuyruğu patlama ölçümü")
+    parser.add_argument('--events', type=int, default=500, help="patlamadaki soru olayı sayısı")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.geometry("800x600")
+    view = QuestionView(root, on_select=lambda index: None)
+    result = {}
+
+    def burst(name, key):
+        # Olayları, socketio dinleyicileri gibi arka plan iş parçacığından gönder
+        dispatcher = UIDispatcher(root)
+        started = time.perf_counter()
+
+        def producer():
+            for i in range(args.events):
+                dispatcher.post(view.render, f"Soru {i + 1}", f"Soru metni {i}",
+                                [f"Seçenek {i}-{j}" for j in range(4)], key=key)
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        thread.join()
+        dispatcher.start()
+
+        def wait():
+            if dispatcher.pending():
+                root.after(5, wait)
+                return
+            root.update_idletasks()
+            dispatcher.stop()
+            stats = dispatcher.stats()
+            stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            result[name] = stats
+            root.quit()
+
+        root.after(0, wait)
+        root.mainloop()
+
+    burst('sequential', None)
+    burst('coalesced', 'question')
+    root.destroy()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Sunucudan istemcilere giden olay yükleri için sıkıştırılmış kodlamalar.
+
+Kodlamalar:
+
+- 'json': yük olduğu gibi gönderilir (eski istemciler).
+- 'compact': sözlük anahtarları `FIELDS` şemasındaki sıraya göre tek
+  harflik kısa anahtarlara çevrilir ('question_number' -> 'm' gibi).
+  Şemada olmayan anahtarlar olduğu gibi kalır. `MAP_FIELDS` altındaki
+  sözlüklerin anahtarları veridir (takım adları) ve çevrilmez.
+- 'msgpack': 'compact' yükün MessagePack ile ikili kodlanmış hali;
+  yalnızca `msgpack` paketi kuruluysa sunulur.
+
+İstemci bağlanırken desteklediği kodlamaları tercih sırasıyla `auth`
+verisinde gönderir (`{'encodings': ['compact', 'json']}`); sunucu ilk
+desteklediğini seçer ve `wire_encoding` olayıyla bildirir. `auth`
+göndermeyen istemciler 'json' alır. İstemciden sunucuya giden yükler
+her zaman JSON'dur.
+
+Şema yalnızca sonuna ekleme yapılarak genişletilmelidir; var olan
+alanların sırası değişirse kısa anahtarlar da değişir.
+
+Sunucunun paket sınıfı (`WirePacket`) JSON'u ASCII kaçışları olmadan
+UTF-8 olarak yazar; takım adlarındaki Türkçe harfler altı baytlık
+`\\uXXXX` kaçışlarıyla değil, iki baytla gider. Her JSON ayrıştırıcısı
+bu biçimi okuyabildiğinden eski istemciler de etkilenmez.
+
+Dosya doğrudan çalıştırılırsa 100 takımlı bir oda için tur başına bayt
+ve kodlama/çözme süresini karşılaştırır:
+
+    python wire.py --teams 100
+"""
+
+import json
+import string
+
+from socketio import packet # type: ignore
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FIELDS = (
+    'room_code', 'version', 'teams', 'name', 'is_host', 'ready', 'op', 'team',
+    'question', 'answer_a', 'answer_b', 'answer_c', 'answer_d', 'question_number',
+    'time', 'deadline', 'correct_answer', 'scores', 'ranks', 'first_question',
+    'messages', 'team_name', 'message', 'ts', 'reason',
+)
+MAP_FIELDS = ('scores', 'ranks')
+
+SHORT = dict(zip(FIELDS, string.ascii_letters))
+LONG = {short: field for field, short in SHORT.items()}
+assert len(SHORT) == len(FIELDS) and not set(FIELDS) & set(LONG)
+
+def _translate(value, table, maps):
+    if isinstance(value, dict):
+        return {table.get(key, key): item if key in maps else _translate(item, table, maps)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_translate(item, table, maps) for item in value]
+    return value
+
+_PACK_MAPS = frozenset(MAP_FIELDS)
+_UNPACK_MAPS = frozenset(SHORT[field] for field in MAP_FIELDS)
+
+class _Utf8Json:
+    # socketio paketlerinin kullandığı json arayüzü; ASCII kaçışı yapmaz
+    @staticmethod
+    def dumps(*args, **kwargs):
+        return json.dumps(*args, ensure_ascii=False, **kwargs)
+
+    loads = staticmethod(json.loads)
+
+class WirePacket(packet.Packet):
+    """JSON'u UTF-8 olarak yazan Socket.IO paketi."""
+
+    json = _Utf8Json
+
+def metered_packet(metrics):
+    """Gönderilen olayları ve kodlanmış boyutlarını olay adına göre sayan paket sınıfı döndürür.
+
+    Sayaçlar (`quiz_emit_total`, `quiz_emit_bytes_total`) `metrics` içinde
+    tanımlanmış olmalıdır.
+    """
+    class MeteredPacket(WirePacket):
+        def encode(self):
+            encoded = super().encode()
+            if self.packet_type in (packet.EVENT, packet.BINARY_EVENT) and self.data:
+                size = len(encoded) if isinstance(encoded, str) else sum(len(part) for part in encoded)
+                event = (self.data[0],)
+                metrics.inc('quiz_emit_total', event)
+                metrics.inc('quiz_emit_bytes_total', event, size)
+            return encoded
+    return MeteredPacket
+
+def available_encodings():
+    """Bu süreçte kullanılabilen kodlamalar (tercih sırasıyla)."""
+    encodings = ['compact', 'json']
+    if msgpack is not None:
+        encodings.insert(0, 'msgpack')
+    return tuple(encodings)
+
+class WireCodec:
+    """Olay yüklerini anlaşılan kodlamaya çevirir ve geri çözer."""
+
+    def __init__(self, encodings=None):
+        self.encodings = tuple(encodings or available_encodings())
+
+    def negotiate(self, offered):
+        """İstemcinin önerdiği kodlamalardan ilk desteklenenini seçer."""
+        for encoding in offered or ():
+            if encoding in self.encodings:
+                return encoding
+        return 'json'
+
+    def encode(self, data, encoding):
+        if encoding == 'json' or data is None:
+            return data
+        packed = _translate(data, SHORT, _PACK_MAPS)
+        if encoding == 'msgpack':
+            return msgpack.packb(packed, use_bin_type=True)
+        return packed
+
+    def decode(self, data, encoding):
+        if encoding == 'json' or data is None:
+            return data
+        if encoding == 'msgpack':
+            data = msgpack.unpackb(data, raw=False)
+        return _translate(data, LONG, _UNPACK_MAPS)
+
+    @staticmethod
+    def channel(room_code, encoding):
+        """Odanın bu kodlamayı kullanan bağlantılarının Socket.IO odası."""
+        return room_code if encoding == 'json' else f"{room_code}#{encoding}"
+
+def main(argv=None):
+    import argparse
+    import math
+    import time
+    from game_room import GameRoom
+
+    parser = argparse.ArgumentParser(description="Kodlama karşılaştırması")
+    parser.add_argument('--teams', type=int, default=100, help="odadaki takım sayısı")
+    parser.add_argument('--rounds', type=int, default=200, help="süre ölçümünde tekrar sayısı")
+    args = parser.parse_args(argv)
+
+    room = GameRoom('482913', 'Takım 0')
+    for i in range(1, args.teams):
+        room.add_team(f"Takım {i}")
+        room.toggle_ready(f"Takım {i}")
+    questions = [{
+        'question': f"Osmanlı Devleti'nin {i}. padişahı kimdir?",
+        'options': ["Osman Gazi", "Orhan Gazi", "I. Murad", "Yıldırım Bayezid"],
+        'correct_answer': "Orhan Gazi"
+    } for i in range(10)]
+    room.start(questions, 30)
+    for team_id, name in enumerate(room.names):
+        room.submit_answer(name, "Orhan Gazi" if team_id % 3 else "I. Murad")
+    deadline = time.time() + 30
+    question = dict(room.next_question_payload(), deadline=deadline)
+
+    # Bir turda odaya giden yayınlar ve lobi listesi
+    round_events = [
+        ('show_results', room.current_results()),
+        ('prefetch_question', question),
+        ('start_question', {'room_code': room.room_code, 'question_number': 2,
+                            'time': 30, 'deadline': deadline}),
+    ]
+    lobby = ('room_created', room.snapshot())
+
+    def wire_size(encoded):
+        # (ham bayt, uzun yoklamada bayt): ikili ekler yoklamada base64 ile gider
+        if isinstance(encoded, str):
+            return len(encoded.encode('utf-8')), len(encoded.encode('utf-8'))
+        text, *attachments = encoded
+        raw = len(text.encode('utf-8')) + sum(len(part) for part in attachments)
+        polling = len(text.encode('utf-8')) + sum(1 + 4 * math.ceil(len(part) / 3) for part in attachments)
+        return raw, polling
+
+    # Eski davranış: ASCII kaçışlı JSON ('json_ascii'); diğerleri sunucunun paket sınıfıyla
+    variants = [('json_ascii', 'json', packet.Packet)]
+    variants += [(encoding, encoding, WirePacket) for encoding in reversed(available_encodings())]
+    result = {'teams': args.teams}
+    for name, encoding, packet_class in variants:
+        codec = WireCodec()
+        encoded_events = [packet_class(packet.EVENT, data=[event, codec.encode(data, encoding)]).encode()
+                          for event, data in round_events]
+        sizes = [wire_size(encoded) for encoded in encoded_events]
+        lobby_raw, _ = wire_size(packet_class(packet.EVENT, data=[lobby[0], codec.encode(lobby[1], encoding)]).encode())
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for event, data in round_events:
+                packet_class(packet.EVENT, data=[event, codec.encode(data, encoding)]).encode()
+        encode_us = (time.perf_counter() - started) / args.rounds * 1e6
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for encoded in encoded_events:
+                if isinstance(encoded, str):
+                    pkt = packet.Packet(encoded_packet=encoded)
+                else:
+                    pkt = packet.Packet(encoded_packet=encoded[0])
+                    for attachment in encoded[1:]:
+                        pkt.add_attachment(attachment)
+                codec.decode(pkt.data[1], encoding)
+        decode_us = (time.perf_counter() - started) / args.rounds * 1e6
+
+        raw = sum(size[0] for size in sizes)
+        result[name] = {
+            'bytes_per_round_per_client': raw,
+            'bytes_per_round_per_client_polling': sum(size[1] for size in sizes),
+            'bytes_per_round_room': raw * args.teams,
+            'lobby_snapshot_bytes': lobby_raw,
+            'encode_us_per_round': round(encode_us, 1),
+            'decode_us_per_round': round(decode_us, 1)
+        }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
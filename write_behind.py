@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+class WriteBehindQueue:
+    """Veritabanı yazmalarını arka planda toplu işlemlerle yapan kuyruk.
+
+    `submit` ile verilen her yazma fonksiyonu (bağlantıyı parametre alır)
+    kuyruğa eklenir ve hemen bir `Future` döner; çağıran (ör. Tk ana
+    döngüsü) diskin yavaşlığını ya da başka bir sürecin yazma kilidini
+    beklemez. Arka plan iş parçacığı kuyrukta biriken yazmaları tek bir
+    işlemde (transaction) çalıştırır.
+
+    Her grup `io_lock` altında yazılır ve `Future` sonuçları da bu kilit
+    altında tamamlanır. Kilit meşgul veritabanı yeniden denenirken de
+    tutulduğundan, kullanıcı arayüzünden yapılan okumalar onu almamalıdır
+    (bkz. `Leaderboard`).
+    """
+
+    def __init__(self, db, interval=0.2, max_batch=1000, retries=3):
+        # `retries`: kilitli ya da meşgul veritabanı için en fazla deneme sayısı
+        self.db = db
+        self.interval = interval
+        self.max_batch = max_batch
+        self.retries = retries
+        self.io_lock = threading.RLock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Arka plan iş parçacığını (henüz çalışmıyorsa) başlatır."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, write):
+        """`write(conn)` fonksiyonunu kuyruğa ekler ve bir `Future` döndürür."""
+        if self._closed:
+            raise RuntimeError("Yazma kuyruğu kapatıldı")
+        self.start()
+        future = Future()
+        self._queue.put((write, future))
+        return future
+
+    def flush(self, timeout=None):
+        """Şu ana kadar kuyruğa eklenen tüm yazmalar işlenene kadar bekler."""
+        if self._thread is None:
+            return True
+        future = self.submit(lambda conn: None)
+        try:
+            future.result(timeout)
+        except Exception:
+            return False
+        return True
+
+    def close(self, timeout=10):
+        """Bekleyen yazmaları işler ve arka plan iş parçacığını durdurur."""
+        if self._closed or self._thread is None:
+            self._closed = True
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def pending(self):
+        """Kuyrukta bekleyen yazma sayısı (yaklaşık)."""
+        return self._queue.qsize()
+
+    def _next_batch(self):
+        batch = []
+        item = self._queue.get()
+        while True:
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            if len(batch) >= self.max_batch:
+                return batch, False
+            try:
+                item = self._queue.get(timeout=self.interval if len(batch) == 1 else 0)
+            except queue.Empty:
+                return batch, False
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._write(batch)
+            if stop:
+                break
+
+    def _transact(self, writes):
+        # Yazmaları tek işlemde çalıştırır; yalnızca kilit/meşgul hatalarını
+        # en fazla `retries` kez dener, diğer hataları hemen yükseltir
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self.db.transaction() as conn:
+                    for write in writes:
+                        write(conn)
+                return
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt >= self.retries:
+                    raise
+                print(f"Veritabanı meşgul ({e}); deneme {attempt}/{self.retries} başarısız")
+                time.sleep(min(0.1 * attempt, 2.0))
+
+    def _write(self, batch):
+        try:
+            with self.io_lock:
+                self._transact([write for write, _ in batch])
+                for _, future in batch:
+                    future.set_result(True)
+            return
+        except Exception as e:
+            error = e
+
+        if len(batch) == 1 or _is_busy(error):
+            # Tek yazma ya da denemeler boyunca kilitli kalan veritabanı:
+            # tek tek denemenin faydası yok, grubu hatayla bitir
+            print(f"Yazma başarısız ({error}); {len(batch)} yazma yapılamadı")
+            with self.io_lock:
+                for _, future in batch:
+                    future.set_exception(error)
+            return
+
+        # Grup yazılamadı; hatalı yazma diğerlerini engellemesin diye tek tek dene
+        print(f"Toplu yazma başarısız ({error}); yazmalar tek tek deneniyor")
+        for write, future in batch:
+            with self.io_lock:
+                try:
+                    self._transact([write])
+                except Exception as e:
+                    print(f"Yazma başarısız: {e}")
+                    future.set_exception(e)
+                else:
+                    future.set_result(True)
+
+def _is_busy(error):
+    """Hata, başka bir bağlantının kilidinden kaynaklanıyorsa True."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message